@@ -0,0 +1,64 @@
+"""
+This file contains the functions to calculate the fingerprint of the geometry and of the shape of a borefield.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import List, Tuple
+
+import numpy as np
+import pygfunction as gt
+from scipy.spatial import cKDTree
+
+
+def borefield_fingerprint(borefield: List[gt.boreholes.Borehole]) -> str:
+    """
+    This function calculates a fingerprint of the geometry of a borefield, so two borefields can be compared
+    with a single string comparison instead of comparing every parameter of every borehole.
+    The fingerprint is the hash of the packed x, y, D, r_b, tilt and orientation of all the boreholes.
+    The depth of the boreholes is neglected and the order of the boreholes is taken into account.
+
+    Parameters
+    ----------
+    borefield : list[pygfunction.boreholes.Borehole]
+        Borefield model
+
+    Returns
+    -------
+    str
+        Hexadecimal fingerprint of the borefield geometry (empty string for an empty borefield)
+    """
+    if not borefield:
+        return ""
+    geometry = np.array([(borehole.x, borehole.y, borehole.D, borehole.r_b, borehole.tilt, borehole.orientation)
+                         for borehole in borefield], dtype=np.float64)
+    return hashlib.blake2b(geometry.tobytes(), digest_size=16).hexdigest()
+
+
+def borefield_shape_fingerprint(borefield: List[gt.boreholes.Borehole]) -> Tuple[str, float]:
+    """
+    This function calculates a fingerprint of the shape of a borefield, i.e. of the geometry of the borefield
+    independent of its size. The spacing B is the smallest distance between two boreholes and the fingerprint is the
+    hash of the positions relative to the first borehole divided by B, together with the tilt and the orientation of
+    all the boreholes. Scaled versions of a borefield (e.g. rectangular fields with the same number of boreholes but
+    another spacing) therefore have the same fingerprint.
+
+    Parameters
+    ----------
+    borefield : list[pygfunction.boreholes.Borehole]
+        Borefield model
+
+    Returns
+    -------
+    tuple(str, float)
+        Hexadecimal fingerprint of the borefield shape and the spacing B [m] (zero for a single borehole)
+    """
+    positions = np.array([(borehole.x, borehole.y) for borehole in borefield], dtype=np.float64)
+    positions -= positions[0]
+    spacing = float(cKDTree(positions).query(positions, k=2)[0][:, 1].min()) if len(borefield) > 1 else 0.
+    if spacing > 0:
+        positions /= spacing
+    angles = np.array([(borehole.tilt, borehole.orientation) for borehole in borefield], dtype=np.float64)
+    # rounded, so the float noise of scaling the borefield does not change the fingerprint
+    shape = np.round(np.hstack((positions, angles)), 8)
+    return hashlib.blake2b(shape.tobytes(), digest_size=16).hexdigest(), spacing
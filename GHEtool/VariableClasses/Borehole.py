@@ -5,9 +5,12 @@ This document contains all the information of the borehole class.
 from GHEtool.VariableClasses.BaseClass import BaseClass
 from GHEtool.VariableClasses.FluidData import FluidData
 from GHEtool.VariableClasses.PipeData import _PipeData, MultipleUTube
+import threading
 from math import pi
+from typing import Union
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pygfunction as gt
 
 
@@ -20,6 +23,9 @@ class Borehole(BaseClass):
 
     __slots__ = '_fluid_data', '_pipe_data', '_Rb', 'use_constant_Rb', 'borehole_internal_model'
 
+    MAX_RB_CACHE_SIZE: int = 1000  # number of stored Rb* values
+    _RB_CACHE_LOCK = threading.Lock()  # protects the eviction of the Rb* cache
+
     def __init__(self, fluid_data: FluidData = None, pipe_data: _PipeData = None):
         """
 
@@ -35,6 +41,10 @@ class Borehole(BaseClass):
         self._Rb: float = 0.12
         self.use_constant_Rb: bool = True
         self.borehole_internal_model: gt.pipes._BasePipe = None
+        # calculated Rb* values and Rb*(H) curve (see get_Rb), which are not part of the slots,
+        # so they are neither exported nor compared
+        self._Rb_cache: dict = {}
+        self._Rb_curve: tuple = None
         if not fluid_data is None:
             self.fluid_data = fluid_data
         if not pipe_data is None:
@@ -109,6 +119,7 @@ class Borehole(BaseClass):
         None
         """
         self._fluid_data = fluid_data
+        self.clear_Rb_cache()
         if self.pipe_data.check_values():
             self.pipe_data.calculate_resistances(self.fluid_data)
             self.use_constant_Rb = False
@@ -123,6 +134,7 @@ class Borehole(BaseClass):
         None
         """
         self._fluid_data = FluidData()
+        self.clear_Rb_cache()
         self.use_constant_Rb = True
 
     @property
@@ -153,6 +165,7 @@ class Borehole(BaseClass):
         None
         """
         self._pipe_data = pipe_data
+        self.clear_Rb_cache()
         if self.fluid_data.check_values():
             self.pipe_data.calculate_resistances(self.fluid_data)
             self.use_constant_Rb = False
@@ -167,6 +180,7 @@ class Borehole(BaseClass):
         None
         """
         self._pipe_data = MultipleUTube()
+        self.clear_Rb_cache()
         self.use_constant_Rb = True
 
     def calculate_Rb(self, H: float, D: float, r_b: float, k_s: float) -> float:
@@ -206,10 +220,115 @@ class Borehole(BaseClass):
 
         return pipe.effective_borehole_thermal_resistance(self.fluid_data.mfr, self.fluid_data.Cp)
 
+    def calculate_Rb_array(self, H: Union[float, np.ndarray], D: float, r_b: float, k_s: float,
+                           mfr: Union[float, np.ndarray] = None) -> np.ndarray:
+        """
+        This function calculates the equivalent borehole thermal resistance for arrays of borehole depths and
+        mass flow rates at once (see _PipeData.effective_borehole_thermal_resistance), which is a lot faster than
+        calling calculate_Rb for every value.
+
+        Parameters
+        ----------
+        H : float, np.ndarray
+            Borehole depth(s) [m]
+        D : float
+            Borehole burial depth [m]
+        r_b : float
+            Borehole radius [m]
+        k_s : float
+            Ground thermal conductivity [mk/W]
+        mfr : float, np.ndarray
+            Mass flow rate(s) per borehole [kg/s]. If None, the mass flow rate of the fluid data is used.
+
+        Returns
+        -------
+        np.ndarray
+            Equivalent borehole thermal resistances [mK/W] with the broadcast shape of H and mfr
+
+        Raises
+        ------
+        ValueError
+            ValueError when the pipe and/or fluid data is not set correctly.
+        """
+        # check if all data is available
+        if not self.pipe_data.check_values() or not self.fluid_data.check_values():
+            raise ValueError("Please make sure you set al the pipe and fluid data.")
+        # the burial depth has no influence on the equivalent borehole thermal resistance
+        return self.pipe_data.effective_borehole_thermal_resistance(self.fluid_data, k_s, r_b, H, mfr)
+
+    def _Rb_key(self, D: float, r_b: float, k_s: float) -> tuple:
+        """
+        This function returns the key of the Rb* cache and curve, without the borehole depth.
+        Besides D, r_b and k_s, it contains the values of all the pipe and fluid data, so the cache cannot be used
+        when these objects are changed in place.
+
+        Parameters
+        ----------
+        D : float
+            Borehole burial depth [m]
+        r_b : float
+            Borehole radius [m]
+        k_s : float
+            Ground thermal conductivity [mk/W]
+
+        Returns
+        -------
+        tuple
+            Key
+        """
+        return (D, r_b, k_s, type(self.pipe_data).__name__) + \
+            tuple(repr(getattr(data, attribute)) for data in (self.pipe_data, self.fluid_data)
+                  for attribute in data.__slots__)
+
+    def clear_Rb_cache(self) -> None:
+        """
+        This function removes the calculated Rb* values and the Rb*(H) curve.
+
+        Returns
+        -------
+        None
+        """
+        self._Rb_cache = {}
+        self._Rb_curve = None
+
+    def set_Rb_curve(self, depths: Union[list, np.ndarray], D: float, r_b: float, k_s: float) -> None:
+        """
+        This function calculates the equivalent borehole thermal resistance at the given depths.
+        Afterwards, get_Rb interpolates linearly in this Rb*(H) curve for every depth in its range (and for the same
+        D, r_b, k_s, pipe and fluid data), so Rb* is not calculated anymore during e.g. the sizing.
+
+        Parameters
+        ----------
+        depths : list, np.ndarray
+            Borehole depths [m] at which Rb* is calculated
+        D : float
+            Borehole burial depth [m]
+        r_b : float
+            Borehole radius [m]
+        k_s : float
+            Ground thermal conductivity [mk/W]
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            ValueError when the pipe and/or fluid data is not set correctly or when less than two depths are given.
+        """
+        depths = np.unique(np.asarray(depths, dtype=np.float64))
+        if depths.size < 2:
+            raise ValueError("The Rb*(H) curve needs at least two depths.")
+        Rb = self.calculate_Rb_array(depths, D, r_b, k_s)
+        self._Rb_curve = (self._Rb_key(D, r_b, k_s), depths, Rb)
+
     def get_Rb(self, H: float, D: float, r_b: float, k_s: float) -> float:
         """
         This function returns the equivalent borehole thermal resistance.
-        If use_constant_Rb is True, self._Rb is returned, otherwise the resistance is calculated.
+        If use_constant_Rb is True, self._Rb is returned, otherwise the resistance is interpolated in the Rb*(H)
+        curve (see set_Rb_curve) when the depth is within its range, or taken from the previously calculated values
+        or calculated.
 
         Parameters
         ----------
@@ -230,7 +349,24 @@ class Borehole(BaseClass):
         if self.use_constant_Rb:
             return self.Rb
 
-        return self.calculate_Rb(H, D, r_b, k_s)
+        # boreholes that are loaded with from_dict are created without __init__
+        cache = self.__dict__.setdefault("_Rb_cache", {})
+        curve = self.__dict__.get("_Rb_curve")
+        key = self._Rb_key(D, r_b, k_s)
+        if curve is not None and curve[0] == key and curve[1][0] <= H <= curve[1][-1]:
+            return float(np.interp(H, curve[1], curve[2]))
+
+        key += (H,)
+        Rb = cache.get(key)
+        if Rb is None:
+            Rb = self.calculate_Rb(H, D, r_b, k_s)
+            # the borehole can be shared between threads (e.g. in concurrent sizing)
+            with Borehole._RB_CACHE_LOCK:
+                if len(cache) >= Borehole.MAX_RB_CACHE_SIZE:
+                    # remove the oldest value
+                    cache.pop(next(iter(cache), None), None)
+                cache[key] = Rb
+        return Rb
 
     def __eq__(self, other):
         if not isinstance(other, Borehole):
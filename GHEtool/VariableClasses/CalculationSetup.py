@@ -16,14 +16,16 @@ class CalculationSetup(BaseClass):
 
     __slots__ = '_L2_sizing', '_L3_sizing', '_L4_sizing', 'quadrant_sizing', '_backup', \
                 'atol', 'rtol', 'max_nb_of_iterations', 'interpolate_gfunctions', 'H_init',\
-                'use_precalculated_dataset', 'deep_sizing', 'force_deep_sizing'
+                'use_precalculated_dataset', 'deep_sizing', 'force_deep_sizing', 'first_and_last_year_sizing', \
+                'load_aggregation', 'bracketing_sizing', 'concurrent_sizing'
 
     def __init__(self, quadrant_sizing: int = 0,
                  L2_sizing: bool = None, L3_sizing: bool = None, L4_sizing: bool = None,
                  atol: float = 0.05, rtol: float = 0.005, max_nb_of_iterations: int = 40,
                  interpolate_gfunctions: bool = None, H_init: float = 100.,
                  use_precalculated_dataset: bool = True, deep_sizing: bool = False,
-                 force_deep_sizing: bool = False):
+                 force_deep_sizing: bool = False, first_and_last_year_sizing: bool = False,
+                 load_aggregation: bool = False, bracketing_sizing: bool = False, concurrent_sizing: bool = False):
         """
 
         Parameters
@@ -61,6 +63,28 @@ class CalculationSetup(BaseClass):
             sizing is done again with this other methodology.
         force_deep_sizing : bool
             True when deep_sizing should be done always
+        first_and_last_year_sizing : bool
+            True if the L3 and L4 sizing should only calculate the temperatures in the first and the last year of the
+            simulation period. The influence of the intermediate years is aggregated in the g-values, so only 2x12
+            (L3) or 2x8760 (L4) values are convolved, independent of the simulation period. This is only possible
+            when the load is the same every year, so for multi-year load profiles the whole simulation period is
+            still calculated. Note that the results after such a sizing only contain the first and the last year.
+        load_aggregation : bool
+            True if the hourly temperatures should be calculated with the load aggregation scheme of Claesson and Javed
+            instead of a convolution over the whole simulation period. This is an approximation, but the g-function is
+            only needed at around 90 time values and the calculation time grows linearly with the simulation period,
+            which makes it suited for very long (multi-year) hourly simulations.
+        bracketing_sizing : bool
+            True if the proportional (fixed-point) update of the depth should fall back on bracketing the root of
+            the temperature residual and using Brent's method, when the update does not converge. This avoids cycling
+            of the depth between iterations (e.g. with a variable ground temperature).
+        concurrent_sizing : bool
+            True if the relevant quadrants in the L2 and L3 sizing should be sized at the same time on a thread pool.
+            Every quadrant has its own depth, temperatures and interpolation of the g-function values, so the result
+            is the same for every run, and only the exactly calculated g-function values are shared.
+            Note that every quadrant then starts from the initial depth and that a quadrant is also sized when the
+            sequential sizing would not need it, so this is only faster on multiple cores and the result can differ
+            slightly (within the tolerances) from the sequential sizing.
 
         References
         ----------
@@ -81,6 +105,10 @@ class CalculationSetup(BaseClass):
         self.use_precalculated_dataset: bool = use_precalculated_dataset
         self.deep_sizing: bool = deep_sizing
         self.force_deep_sizing: bool = force_deep_sizing
+        self.first_and_last_year_sizing: bool = first_and_last_year_sizing
+        self.load_aggregation: bool = load_aggregation
+        self.bracketing_sizing: bool = bracketing_sizing
+        self.concurrent_sizing: bool = concurrent_sizing
 
         self._backup: CalculationSetup = None
 
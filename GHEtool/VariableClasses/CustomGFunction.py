@@ -1,14 +1,23 @@
 """
 This file contains both the CustomGFunction class and all the relevant information w.r.t. custom gfunctions.
 """
+import copy
+import hashlib
+import json
+import os
 import pickle
+import tempfile
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List, Union
 
 import numpy as np
 import pygfunction as gt
-from scipy import interpolate
 from GHEtool.logger.ghe_logger import ghe_logger
+from GHEtool.VariableClasses.BorefieldFingerprint import borefield_fingerprint
+from GHEtool.VariableClasses.GFunctionInterpolator import GFunctionInterpolator
+from GHEtool.VariableClasses.TimeGrids import claesson_javed_time_values
 
 
 def _timeValues(dt=3600., t_max=100. * 8760 * 3600.) -> np.array:
@@ -34,13 +43,46 @@ def _timeValues(dt=3600., t_max=100. * 8760 * 3600.) -> np.array:
        load-aggregation method to calculate extraction temperatures of
        borehole heat exchangers. ASHRAE Transactions, 118 (1): 530–539.
     """
-    dt: float = dt  # Time step (s)
-    t_max: float = t_max  # Maximum time (s)
+    # the memoized grid is read-only, so a copy is returned
+    return np.copy(claesson_javed_time_values(dt, t_max))
 
-    # Load aggregation scheme
-    load_agg = gt.load_aggregation.ClaessonJaved(dt, t_max)
 
-    return load_agg.get_times_for_simulation()
+# binary dataset format (see CustomGFunction.save_custom_dataset)
+DATASET_MAGIC: bytes = b"GHEGFUNC"
+DATASET_VERSION: int = 1
+DATASET_ALIGNMENT: int = 64  # bytes
+DATASET_PREAMBLE: np.dtype = np.dtype([("magic", "S8"), ("version", "<u4"), ("header_length", "<u8")])
+
+
+def _calculate_gvalues_at_depth(borefield: List[gt.boreholes.Borehole], alpha: float, H: float,
+                                time_array: np.ndarray, options: dict) -> np.ndarray:
+    """
+    This function calculates the gvalues of a borefield at a certain depth.
+    The depth is set on a copy of the borefield, so multiple depths can be calculated independently
+    (e.g. in different processes).
+
+    Parameters
+    ----------
+    borefield : list[pygfunction.boreholes.Borehole]
+        Borefield object for which the gvalues should be calculated
+    alpha : float
+        Ground thermal diffusivity [m2/s]
+    H : float
+        Depth [m]
+    time_array : np.ndarray
+        Time values [s] for which the gvalues should be calculated
+    options : dict
+        Dictionary with options for the gFunction class of pygfunction
+
+    Returns
+    -------
+    np.ndarray
+        Gvalues at this depth
+    """
+    borefield = copy.deepcopy(borefield)
+    for borehole in borefield:
+        borehole.H = H
+    return gt.gfunction.gFunction(borefield, alpha, time_array, options=options, method=options["method"]).gFunc
 
 
 class CustomGFunction:
@@ -53,6 +95,18 @@ class CustomGFunction:
     DEFAULT_DEPTH_ARRAY[0] = 10  # m
     DEFAULT_TIME_ARRAY: np.ndarray = _timeValues()  # sec
 
+    # ground thermal diffusivity and borefield fingerprint for which the dataset is created
+    # (class attributes, so datasets that are pickled before these attributes existed can still be loaded)
+    alpha: float = 0.
+    borefield_fingerprint: str = ""
+    # number of requests that are interpolated from the dataset and that are out of its range and number and total
+    # wall time [s] of the calculations with pygfunction to create the dataset (see stats)
+    STATS: tuple = ("hits", "misses", "pygfunction_calls", "pygfunction_time")
+    hits: int = 0
+    misses: int = 0
+    pygfunction_calls: int = 0
+    pygfunction_time: float = 0.
+
     def __init__(self, time_array: np.ndarray = None, depth_array: np.ndarray = None, options: dict = None):
         """
 
@@ -137,13 +191,30 @@ class CustomGFunction:
         if check and not self.within_range(time_value, H):
             return False
 
-        if not isinstance(time_value, (float, int)):
-            # multiple values are requested
-            g_value = interpolate.interpn((self.depth_array, self.time_array), self.gvalues_array, np.array([[H, t] for t in time_value]))
-        else:
-            # only one value is requested
-            g_value = interpolate.interpn((self.depth_array, self.time_array), self.gvalues_array, np.array([H, time_value]))
-        return g_value
+        self.hits += 1
+        return self._get_interpolator()(H, time_value)
+
+    def _get_interpolator(self) -> GFunctionInterpolator:
+        """
+        This function returns the interpolator of the dataset. It is only recreated when the dataset has changed.
+
+        Returns
+        -------
+        GFunctionInterpolator
+            Interpolator of the dataset
+        """
+        # datasets that are dumped before the interpolator existed, do not have this attribute
+        interpolator = getattr(self, "_interpolator", None)
+        if interpolator is None or not interpolator.is_up_to_date(self.depth_array, self.time_array,
+                                                                  self.gvalues_array):
+            self._interpolator = GFunctionInterpolator(self.depth_array, self.time_array, self.gvalues_array)
+        return self._interpolator
+
+    def __getstate__(self) -> dict:
+        # the interpolator is not saved, since it can be recreated from the dataset
+        state = self.__dict__.copy()
+        state.pop("_interpolator", None)
+        return state
 
     def within_range(self, time_value: Union[list, float, np.ndarray], H: float) -> bool:
         """
@@ -165,6 +236,7 @@ class CustomGFunction:
 
         # check if the custom gfunctions are calculated
         if not np.any(self.gvalues_array):
+            self.misses += 1
             return False
 
         max_time_value = time_value if isinstance(time_value, (float, int)) else max(time_value)
@@ -175,6 +247,7 @@ class CustomGFunction:
             warnings.warn("The requested depth of " + str(H) + "m is outside the bounds of " + str(self.min_H) +
                           " and " + str(self.max_H) +
                           " of the precalculated data. The gfunctions will be calculated jit.", UserWarning)
+            self.misses += 1
             return False
 
         # check if max time in precalculated data range
@@ -183,6 +256,7 @@ class CustomGFunction:
                 "The requested time of " + str(max_time_value) + "s is outside the bounds of " + str(self.min_t) +
                 " and " + str(self.max_t) + " of the precalculated data. The gfunctions will be calculated jit.",
                 UserWarning)
+            self.misses += 1
             return False
 
         # check if min time in precalculated data range
@@ -191,13 +265,18 @@ class CustomGFunction:
                 "The requested time of " + str(min_time_value) + "s is outside the bounds of " + str(self.min_t) +
                 " and " + str(self.max_t) + " of the precalculated data. The gfunctions will be calculated jit.",
                 UserWarning)
+            self.misses += 1
             return False
 
         return True
 
-    def create_custom_dataset(self, borefield: List[gt.boreholes.Borehole], alpha: float) -> None:
+    def create_custom_dataset(self, borefield: List[gt.boreholes.Borehole], alpha: float, workers: int = 1,
+                              checkpoint: str = None) -> None:
         """
         This function creates the custom dataset.
+        Every depth is calculated independently on a copy of the borefield, so the depths can be calculated on a
+        pool of worker processes. When a checkpoint file is given, the gvalues are written to it after every depth,
+        so an interrupted calculation can be resumed by calling this function again with the same checkpoint.
 
         Parameters
         ----------
@@ -205,29 +284,180 @@ class CustomGFunction:
             Borefield object for which the custom dataset should be created
         alpha : float
             Ground thermal diffusivity [m2/s]
+        workers : int
+            Number of worker processes. If None, the number of processors of the machine is used.
+        checkpoint : str
+            Path of the checkpoint file (.npz). If None, no checkpoint is used.
 
         Returns
         -------
         None
+
+        Raises
+        ------
+        ValueError
+            When the number of workers is smaller than 1
         """
+        if workers is not None and workers < 1:
+            raise ValueError(f"The number of workers should be at least 1 and not {workers}.")
         # chek if there is a method in options
         if not "method" in self.options:
             self.options["method"] = "equivalent"
 
-        for idx, H in enumerate(self.depth_array):
-            ghe_logger.info(f'Start H: {H}')
+        self.alpha = alpha
+        self.borefield_fingerprint = borefield_fingerprint(borefield)
+        key = self._checkpoint_key(borefield, alpha)
+        calculated = self._load_checkpoint(checkpoint, key) if checkpoint is not None \
+            else np.zeros(self.depth_array.size, dtype=bool)
+        todo = [idx for idx in range(self.depth_array.size) if not calculated[idx]]
+        if len(todo) < self.depth_array.size:
+            ghe_logger.info(f'Resumed from checkpoint: {self.depth_array.size - len(todo)}/{self.depth_array.size} '
+                            f'depths are already calculated.')
+
+        start = time.perf_counter()
+
+        def store(idx: int, gvalues: np.ndarray) -> None:
+            self.gvalues_array[idx] = gvalues
+            calculated[idx] = True
+            self.pygfunction_calls += 1
+            if checkpoint is not None:
+                self._store_checkpoint(checkpoint, key, calculated)
+            ghe_logger.info(f'Calculated H: {self.depth_array[idx]} '
+                            f'({np.count_nonzero(calculated)}/{self.depth_array.size})')
+
+        if workers == 1 or len(todo) <= 1:
+            for idx in todo:
+                ghe_logger.info(f'Start H: {self.depth_array[idx]}')
+                store(idx, _calculate_gvalues_at_depth(borefield, alpha, self.depth_array[idx], self.time_array,
+                                                       self.options))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_calculate_gvalues_at_depth, borefield, alpha, self.depth_array[idx],
+                                           self.time_array, self.options): idx for idx in todo}
+                for future in as_completed(futures):
+                    store(futures[future], future.result())
+        # with multiple workers, this is the elapsed time and not the sum of the calculation times
+        self.pygfunction_time += time.perf_counter() - start
+
+        # the dataset is changed in place, so the interpolator should be recreated
+        self._interpolator = None
+
+    def stats(self, log: bool = False) -> dict:
+        """
+        This function returns the statistics of the custom dataset.
 
-            # Calculate the g-function for uniform borehole wall temperature
+        Parameters
+        ----------
+        log : bool
+            True if the statistics should also be logged with the ghe_logger
 
-            # set borehole depth in borefield
-            for borehole in borefield:
-                borehole.H = H
+        Returns
+        -------
+        dict
+            Dictionary with the number of hits and misses, the number of calls and the total and average wall time [s]
+            of the calculations with pygfunction and the number of stored depths
+        """
+        stats = {"hits": self.hits,
+                 "misses": self.misses,
+                 "pygfunction_calls": self.pygfunction_calls,
+                 "pygfunction_time": self.pygfunction_time,
+                 "pygfunction_time_per_call": self.pygfunction_time / self.pygfunction_calls
+                 if self.pygfunction_calls else 0.,
+                 "stored_depths": self.depth_array.size}
+        if log:
+            ghe_logger.info("Custom g-function statistics: " +
+                            ", ".join(f"{key}: {value}" for key, value in stats.items()))
+        return stats
+
+    def reset_stats(self) -> None:
+        """
+        This function resets all the counters and timings of the statistics (see stats).
 
-            gfunc_uniform_T = gt.gfunction.gFunction(borefield, alpha,
-                                                     self.time_array, options=self.options,
-                                                     method=self.options["method"])
+        Returns
+        -------
+        None
+        """
+        self.hits = 0
+        self.misses = 0
+        self.pygfunction_calls = 0
+        self.pygfunction_time = 0.
 
-            self.gvalues_array[idx] = gfunc_uniform_T.gFunc
+    def _checkpoint_key(self, borefield: List[gt.boreholes.Borehole], alpha: float) -> str:
+        """
+        This function returns the key of the checkpoint, so a checkpoint of another borefield, alpha or options
+        is not used.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield object for which the custom dataset is created
+        alpha : float
+            Ground thermal diffusivity [m2/s]
+
+        Returns
+        -------
+        str
+            Hexadecimal hash of the borefield, alpha and options
+        """
+        sha = hashlib.sha256()
+        sha.update(borefield_fingerprint(borefield).encode())
+        sha.update(np.float64(alpha).tobytes())
+        sha.update(json.dumps(self.options, sort_keys=True, default=str).encode())
+        return sha.hexdigest()
+
+    def _load_checkpoint(self, checkpoint: str, key: str) -> np.ndarray:
+        """
+        This function loads the gvalues of the checkpoint, if it belongs to the same dataset.
+
+        Parameters
+        ----------
+        checkpoint : str
+            Path of the checkpoint file
+        key : str
+            Key of the dataset (see _checkpoint_key)
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array with True for the depths that are already calculated
+        """
+        calculated = np.zeros(self.depth_array.size, dtype=bool)
+        try:
+            with np.load(checkpoint) as data:
+                if str(data["key"]) != key or not np.array_equal(data["depth_array"], self.depth_array) \
+                        or not np.array_equal(data["time_array"], self.time_array):
+                    ghe_logger.warning(f'The checkpoint {checkpoint} belongs to another dataset and is not used.')
+                    return calculated
+                calculated = data["calculated"].copy()
+                self.gvalues_array[calculated] = data["gvalues_array"][calculated]
+        except (OSError, KeyError, ValueError):
+            # the checkpoint does not exist (yet) or is corrupt
+            pass
+        return calculated
+
+    def _store_checkpoint(self, checkpoint: str, key: str, calculated: np.ndarray) -> None:
+        """
+        This function writes the calculated gvalues to the checkpoint.
+        The file is written to a temporary file first, so an interruption never leaves an incomplete checkpoint.
+
+        Parameters
+        ----------
+        checkpoint : str
+            Path of the checkpoint file
+        key : str
+            Key of the dataset (see _checkpoint_key)
+        calculated : np.ndarray
+            Boolean array with True for the depths that are calculated
+
+        Returns
+        -------
+        None
+        """
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(checkpoint)))
+        with os.fdopen(file_descriptor, "wb") as file:
+            np.savez(file, key=key, depth_array=self.depth_array, time_array=self.time_array,
+                     gvalues_array=self.gvalues_array, calculated=calculated)
+        os.replace(temp_path, checkpoint)
 
     def dump_custom_dataset(self, path: str, name: str) -> None:
         """
@@ -247,6 +477,51 @@ class CustomGFunction:
         with open(path + name + '.gvalues', 'wb') as f:
             pickle.dump(self, f)
 
+    def save_custom_dataset(self, path: str) -> None:
+        """
+        This function saves the current custom dataset in the binary dataset format of GHEtool, which can be loaded
+        with load_custom_gfunction. In contrast to dump_custom_dataset, the file does not depend on the layout of the
+        CustomGFunction class and the gvalues can be memory-mapped, so large datasets open instantly and are shared
+        between processes that load the same file.
+
+        The file consists of:
+
+        1. an 8-byte magic string b'GHEGFUNC', a little-endian uint32 with the format version and a little-endian
+        uint64 with the length of the header in bytes;
+
+        2. a UTF-8 encoded JSON header with the keys version, borefield_fingerprint, alpha, options, depth_array,
+        time_array, dtype and shape, padded with spaces so the gvalues start at a multiple of 64 bytes;
+
+        3. the gvalues as a contiguous C-ordered matrix of little-endian float64 values with one row per depth.
+
+        Parameters
+        ----------
+        path : str
+            Location of the file
+
+        Returns
+        -------
+        None
+        """
+        gvalues = np.ascontiguousarray(self.gvalues_array, dtype="<f8")
+        header = json.dumps({"version": DATASET_VERSION,
+                             "borefield_fingerprint": self.borefield_fingerprint,
+                             "alpha": float(self.alpha),
+                             "options": self.options,
+                             "depth_array": self.depth_array.astype(np.float64).tolist(),
+                             "time_array": self.time_array.astype(np.float64).tolist(),
+                             "dtype": gvalues.dtype.str,
+                             "shape": list(gvalues.shape)}, default=str).encode()
+        header += b" " * (-(DATASET_PREAMBLE.itemsize + len(header)) % DATASET_ALIGNMENT)
+        preamble = np.array([(DATASET_MAGIC, DATASET_VERSION, len(header))], dtype=DATASET_PREAMBLE)
+
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(preamble.tobytes())
+            file.write(header)
+            file.write(gvalues.tobytes())
+        os.replace(temp_path, path)
+
     def set_options_gfunction_calculation(self, options: dict) -> None:
         """
         This function sets the options for the gfunction calculation of pygfunction.
@@ -278,6 +553,8 @@ class CustomGFunction:
         if not isinstance(other, CustomGFunction):
             return False
         for i in iter(self.__dict__):
+            if i == "_interpolator" or i in CustomGFunction.STATS:
+                continue
             if isinstance(getattr(self, i), np.ndarray) or isinstance(getattr(self, i), list):
                 if not np.array_equal(getattr(self, i), getattr(other, i)):
                     return False
@@ -287,18 +564,52 @@ class CustomGFunction:
         return True
 
 
-def load_custom_gfunction(path: str) -> CustomGFunction:
+def load_custom_gfunction(path: str, mmap: bool = True) -> CustomGFunction:
     """
     This function loads a custom gfunction dataset.
+    Both the binary dataset format (see CustomGFunction.save_custom_dataset) and pickled datasets
+    (see CustomGFunction.dump_custom_dataset) can be loaded. Only load pickled datasets from trusted sources.
 
     Parameters
     ----------
     path : str
         Location of the dataset
+    mmap : bool
+        True if the gvalues of a dataset in the binary format should be memory-mapped (copy-on-write) instead of
+        read into memory
 
     Returns
     -------
     CustomGFunction
         Dataset with the custom gfunction data
+
+    Raises
+    ------
+    ValueError
+        When the binary dataset is created with a newer, unsupported version of the format or is corrupt
     """
-    return pickle.load(open(path, 'rb'))
+    with open(path, 'rb') as file:
+        if file.read(len(DATASET_MAGIC)) != DATASET_MAGIC:
+            file.seek(0)
+            return pickle.load(file)
+        file.seek(0)
+        preamble = np.frombuffer(file.read(DATASET_PREAMBLE.itemsize), dtype=DATASET_PREAMBLE)[0]
+        if preamble["version"] > DATASET_VERSION:
+            raise ValueError(f"The dataset {path} has version {preamble['version']} of the dataset format, but only "
+                             f"versions up to {DATASET_VERSION} are supported. Please update GHEtool.")
+        header = json.loads(file.read(int(preamble["header_length"])).decode())
+    offset = DATASET_PREAMBLE.itemsize + int(preamble["header_length"])
+    shape = tuple(header["shape"])
+    if shape != (len(header["depth_array"]), len(header["time_array"])):
+        raise ValueError(f"The dataset {path} is corrupt.")
+
+    custom_gfunction = CustomGFunction(np.array(header["time_array"]), np.array(header["depth_array"]),
+                                       header["options"])
+    custom_gfunction.alpha = header["alpha"]
+    custom_gfunction.borefield_fingerprint = header["borefield_fingerprint"]
+    if mmap:
+        custom_gfunction.gvalues_array = np.memmap(path, dtype=header["dtype"], mode="c", offset=offset, shape=shape)
+    else:
+        custom_gfunction.gvalues_array = np.fromfile(path, dtype=header["dtype"], count=int(np.prod(shape)),
+                                                     offset=offset).reshape(shape)
+    return custom_gfunction
@@ -0,0 +1,212 @@
+"""
+This file contains the DimensionlessGFunctionCache class, which stores g-values in dimensionless coordinates so they
+can be reused for other ground thermal diffusivities and borehole spacings.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+import pygfunction as gt
+
+from .BorefieldFingerprint import borefield_shape_fingerprint
+
+
+class DimensionlessGFunctionCache:
+    """
+    This class contains a cache of g-values in dimensionless coordinates.
+    A g-function only depends on the dimensionless geometry of the borefield (B/H, D/H, r_b/H and the relative
+    positions of the boreholes) and on the dimensionless time ln(t/ts), with ts = H^2/(9 alpha).
+    The g-values are therefore stored per borefield shape and B/H on a fixed grid of ln(t/ts), so they can be
+    interpolated for every ground thermal diffusivity for which the requested ln(t/ts) lies within the stored range.
+    When the B/H of the borefield lies between two stored values that are close enough to each other,
+    the g-values are interpolated linearly in B/H as well.
+    """
+
+    def __init__(self, time_step: float = 0.1, time_margin: float = 0.7, threshold_spacing_interpolation: float = 0.1):
+        """
+
+        Parameters
+        ----------
+        time_step : float
+            Step of the grid of ln(t/ts) on which the g-values are stored
+        time_margin : float
+            Margin of ln(t/ts) that is added on both sides of the requested time values when the g-values are
+            calculated, so they can be reused for other alphas (the default covers a factor 2 in alpha)
+        threshold_spacing_interpolation : float
+            Maximum relative difference between two stored values of B/H for which the g-values are interpolated
+        """
+        self.time_step: float = time_step
+        self.time_margin: float = time_margin
+        self.threshold_spacing_interpolation: float = threshold_spacing_interpolation
+        # for every shape key, a dictionary with B/H as key and (index of the first time step, g-values) as value
+        self.data: Dict[str, Dict[float, Tuple[int, np.ndarray]]] = {}
+        # number of requests that are interpolated from the stored data and that are calculated
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def dimensionless_geometry(borefield: List[gt.boreholes.Borehole], options: dict) -> Union[Tuple[str, float], None]:
+        """
+        This function calculates the shape key and the dimensionless spacing B/H of a borefield.
+        The spacing B is the smallest distance between two boreholes and the shape key is the hash of the shape of
+        the borefield (see borefield_shape_fingerprint), D/H and r_b/H of all the boreholes and the options of the
+        calculation.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model
+        options : dict
+            Options (including the method) of the pygfunction gFunction class
+
+        Returns
+        -------
+        tuple or None
+            Shape key and B/H, or None if the boreholes do not have the same depth
+        """
+        depth = borefield[0].H
+        if any(borehole.H != depth for borehole in borefield):
+            return None
+        shape, spacing = borefield_shape_fingerprint(borefield)
+        ratios = np.array([(borehole.D / depth, borehole.r_b / depth) for borehole in borefield], dtype=np.float64)
+        blake = hashlib.blake2b(shape.encode(), digest_size=16)
+        # rounded, so the float noise of scaling the borefield does not change the key
+        blake.update(np.round(ratios, 8).tobytes())
+        blake.update(json.dumps(options, sort_keys=True, default=str).encode())
+        return blake.hexdigest(), float(np.round(spacing / depth, 10))
+
+    @staticmethod
+    def _ts(borefield: List[gt.boreholes.Borehole], alpha: float) -> float:
+        """
+        This function returns the characteristic time of the borefield.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+
+        Returns
+        -------
+        float
+            Characteristic time ts = H^2/(9 alpha) [s]
+        """
+        return borefield[0].H ** 2 / (9 * alpha)
+
+    def _interpolate_entry(self, entry: Tuple[int, np.ndarray], log_time: np.ndarray) -> Union[np.ndarray, None]:
+        """
+        This function interpolates the g-values of a stored entry at the given dimensionless times.
+
+        Parameters
+        ----------
+        entry : tuple
+            Index of the first time step and the g-values
+        log_time : np.ndarray
+            Dimensionless time values ln(t/ts)
+
+        Returns
+        -------
+        np.ndarray or None
+            G-values or None if the time values are outside the range of the entry
+        """
+        start, gvalues = entry
+        grid = (start + np.arange(gvalues.size)) * self.time_step
+        if np.min(log_time) < grid[0] or np.max(log_time) > grid[-1]:
+            return None
+        return np.interp(log_time, grid, gvalues)
+
+    def _load(self, geometry: Tuple[str, float], log_time: np.ndarray) -> Union[np.ndarray, None]:
+        """
+        This function interpolates the g-values from the stored data, if possible.
+
+        Parameters
+        ----------
+        geometry : tuple
+            Shape key and B/H of the borefield (see dimensionless_geometry)
+        log_time : np.ndarray
+            Dimensionless time values ln(t/ts)
+
+        Returns
+        -------
+        np.ndarray or None
+            G-values or None if they cannot be interpolated from the stored data
+        """
+        entries = self.data.get(geometry[0], {})
+        spacing = geometry[1]
+        if spacing in entries:
+            return self._interpolate_entry(entries[spacing], log_time)
+
+        lower = max((value for value in entries if value < spacing), default=None)
+        upper = min((value for value in entries if value > spacing), default=None)
+        if lower is None or upper is None or (upper - lower) / spacing > self.threshold_spacing_interpolation:
+            return None
+        gvalues_lower = self._interpolate_entry(entries[lower], log_time)
+        gvalues_upper = self._interpolate_entry(entries[upper], log_time)
+        if gvalues_lower is None or gvalues_upper is None:
+            return None
+        return gvalues_lower + (gvalues_upper - gvalues_lower) * (spacing - lower) / (upper - lower)
+
+    def gvalues(self, borefield: List[gt.boreholes.Borehole], alpha: float, time_values: np.ndarray, options: dict,
+                calculate: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        This function returns the g-values by interpolation in the stored data or, if that is not possible,
+        by calculating them on the grid of ln(t/ts). This grid contains the requested time values (with a margin on
+        both sides) and the time values that are already stored for this borefield shape and B/H, so the stored range
+        only grows.
+        Since the g-values of pygfunction depend slightly on the time values for which they are calculated, the
+        g-values on this (dense) grid can differ slightly from g-values calculated for only a few time values.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model for which the gvalues should be calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        time_values : np.ndarray
+            Array with all the time values [s] for which gvalues should be calculated
+        options : dict
+            Options (including the method) of the pygfunction gFunction class
+        calculate : Callable
+            Function that calculates the g-values of this borefield and alpha for an array of time values
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            1D array with all the requested gvalues
+        """
+        geometry = self.dimensionless_geometry(borefield, options)
+        if geometry is None:
+            return calculate(time_values)
+        ts = self._ts(borefield, alpha)
+        log_time = np.log(np.asarray(time_values, dtype=np.float64) / ts)
+
+        gvalues = self._load(geometry, log_time)
+        if gvalues is not None:
+            self.hits += 1
+            return gvalues
+        self.misses += 1
+
+        start = int(np.floor((np.min(log_time) - self.time_margin) / self.time_step))
+        end = int(np.ceil((np.max(log_time) + self.time_margin) / self.time_step))
+        if geometry[1] in self.data.get(geometry[0], {}):
+            stored_start, stored_gvalues = self.data[geometry[0]][geometry[1]]
+            start = min(start, stored_start)
+            end = max(end, stored_start + stored_gvalues.size - 1)
+        grid = np.arange(start, end + 1) * self.time_step
+        grid_gvalues = np.asarray(calculate(ts * np.exp(grid)), dtype=np.float64)
+        self.data.setdefault(geometry[0], {})[geometry[1]] = (start, grid_gvalues)
+        return np.interp(log_time, grid, grid_gvalues)
+
+    def clear(self) -> None:
+        """
+        This function removes all the stored g-values.
+
+        Returns
+        -------
+        None
+        """
+        self.data = {}
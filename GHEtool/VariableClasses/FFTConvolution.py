@@ -0,0 +1,116 @@
+"""
+This file contains the FFTConvolution class, which is used to speed up the convolution of a load with g-values.
+"""
+import numpy as np
+from scipy import fft
+
+
+class FFTConvolution:
+    """
+    This class convolves a fixed signal (e.g. the hourly load over the simulation period) with different kernels
+    (e.g. the g-value differences for different depths) using the fast Fourier transform.
+    The spectrum of the signal is calculated only once and is reused for every new kernel, so only the kernel has to be
+    transformed during the sizing iterations.
+    """
+
+    def __init__(self, signal: np.ndarray = None):
+        """
+
+        Parameters
+        ----------
+        signal : np.ndarray
+            Signal which will be convolved with the different kernels
+        """
+        self._signal_length: int = 0
+        self._fft_length: int = 0
+        self._signal_spectrum: np.ndarray = np.array([])
+
+        if signal is not None:
+            self.set_signal(signal)
+
+    @property
+    def is_set(self) -> bool:
+        """
+        This function returns whether or not there is a signal spectrum available.
+
+        Returns
+        -------
+        bool
+            True if the spectrum of the signal is calculated
+        """
+        return self._signal_length != 0
+
+    @property
+    def signal_length(self) -> int:
+        """
+        This function returns the length of the stored signal.
+
+        Returns
+        -------
+        int
+            Length of the signal
+        """
+        return self._signal_length
+
+    def set_signal(self, signal: np.ndarray) -> None:
+        """
+        This function calculates and stores the spectrum of the signal.
+        The length of the fft is chosen so that the first len(signal) values of the linear convolution are not
+        influenced by the circular nature of the discrete Fourier transform.
+
+        Parameters
+        ----------
+        signal : np.ndarray
+            Signal which will be convolved with the different kernels
+
+        Returns
+        -------
+        None
+        """
+        signal = np.asarray(signal, dtype=np.float64)
+        self._signal_length = signal.size
+        self._fft_length = fft.next_fast_len(2 * signal.size - 1, real=True)
+        self._signal_spectrum = fft.rfft(signal, self._fft_length)
+
+    def convolve(self, kernel: np.ndarray) -> np.ndarray:
+        """
+        This function returns the first len(signal) values of the linear convolution of the stored signal with the
+        kernel. This is the same as convolve(signal, kernel)[:len(signal)].
+
+        Parameters
+        ----------
+        kernel : np.ndarray
+            Kernel (e.g. g-value differences) with which the signal should be convolved.
+            When a 2D-array is given, every row is convolved with the signal.
+
+        Returns
+        -------
+        np.ndarray
+            Convolution of the signal and the kernel
+
+        Raises
+        ------
+        ValueError
+            When no signal is set or the kernel is longer than the signal
+        """
+        if not self.is_set:
+            raise ValueError("No signal is set for the convolution.")
+        kernel = np.asarray(kernel, dtype=np.float64)
+        if kernel.shape[-1] > self._signal_length:
+            raise ValueError(f"The kernel with length {kernel.shape[-1]} is longer than the signal with length "
+                             f"{self._signal_length}.")
+
+        kernel_spectrum = fft.rfft(kernel, self._fft_length, axis=-1)
+        return fft.irfft(kernel_spectrum * self._signal_spectrum, self._fft_length, axis=-1)[..., :self._signal_length]
+
+    def clear(self) -> None:
+        """
+        This function removes the stored signal spectrum.
+
+        Returns
+        -------
+        None
+        """
+        self._signal_length = 0
+        self._fft_length = 0
+        self._signal_spectrum = np.array([])
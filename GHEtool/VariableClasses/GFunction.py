@@ -1,12 +1,22 @@
 from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
 from typing import List, Tuple, Union
 
 import numpy as np
 import copy
+import json
+import threading
+import time
 import pygfunction as gt
-from scipy import interpolate
 
-from .CustomGFunction import _timeValues
+from .TimeGrids import claesson_javed_time_values
+from .BorefieldFingerprint import borefield_fingerprint
+from GHEtool.logger.ghe_logger import ghe_logger
+from .DimensionlessGFunctionCache import DimensionlessGFunctionCache
+from .GFunctionDiskCache import GFunctionDiskCache
+from .GFunctionInterpolator import GFunctionInterpolator
 
 
 class FIFO:
@@ -79,15 +89,17 @@ class GFunction:
     This is done by storing previously calculated gvalues.
     """
 
-    DEFAULT_TIMESTEPS: np.ndarray = _timeValues()
+    DEFAULT_TIMESTEPS: np.ndarray = claesson_javed_time_values()
     DEFAULT_NUMBER_OF_TIMESTEPS: int = DEFAULT_TIMESTEPS.size
     DEFAULT_STORE_PREVIOUS_VALUES: bool = True
+    DEFAULT_MAX_STORED_DATA_SIZE: float = 100e6  # bytes
 
     def __init__(self):
         self.store_previous_values: bool = GFunction.DEFAULT_STORE_PREVIOUS_VALUES
         self.options: dict = {"method": "equivalent"}
         self.alpha: float = 0.
-        self.borefield: list[gt.boreholes.Borehole] = []
+        self._borefield: list[gt.boreholes.Borehole] = []
+        self._borefield_fingerprint: str = ""
         self.depth_array: np.ndarray = np.array([])
         self.time_array: np.ndarray = np.array([])
         self.previous_gfunctions: np.ndarray = np.array([])
@@ -95,11 +107,102 @@ class GFunction:
 
         self.no_extrapolation: bool = True
         self.threshold_depth_interpolation: float = .25  # %
+        # maximum estimated relative error of the depth extrapolation, when no_extrapolation is False
+        self.extrapolation_tolerance: float = 0.01
+        # maximum estimated relative error of the depth interpolation. If None, the depths are interpolated when
+        # they are closer together than threshold_depth_interpolation
+        self.interpolation_tolerance: float = None
+        # interpolation method between the stored depths ('linear' or 'cubic') and time values ('linear' or 'log')
+        self.depth_interpolation: str = "linear"
+        self.time_interpolation: str = "linear"
+        self._interpolator: GFunctionInterpolator = None
 
         self.fifo_list: FIFO = FIFO(8)
 
+        # data of previous borefields, alphas and options, with the least recently used first
+        self.stored_data: OrderedDict = OrderedDict()
+        self.max_stored_data_size: float = GFunction.DEFAULT_MAX_STORED_DATA_SIZE
+        # number of requests that are interpolated from the stored data and that are calculated
+        self.hits: int = 0
+        self.misses: int = 0
+        # number of hits that are interpolated and extrapolated, number of FIFO loop-breaks and number and
+        # total wall time [s] of the calculations with pygfunction (see stats)
+        self.interpolations: int = 0
+        self.extrapolations: int = 0
+        self.loop_breaks: int = 0
+        self.pygfunction_calls: int = 0
+        self.pygfunction_time: float = 0.
+
+        # optional cache on disk, which is checked before the g-values are calculated with pygfunction
+        self.disk_cache: GFunctionDiskCache = None
+        # optional cache in dimensionless coordinates, which is reused for other alphas and spacings
+        self.dimensionless_cache: DimensionlessGFunctionCache = None
+
+        # lock so the stored data can be shared between threads (e.g. for concurrent quadrant sizing)
+        self._lock: threading.RLock = threading.RLock()
+        # gvalues that are calculated by the copies for concurrent sizing (see _fork), shared between these copies,
+        # and the data that is newly calculated by this copy, which is moved back to the original object (see _join)
+        self._shared_gvalues: dict = None
+        self._new_data: list = None
+
+    def __getstate__(self) -> dict:
+        # the lock cannot be copied nor pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @property
+    def borefield(self) -> List[gt.boreholes.Borehole]:
+        """
+        This function returns the borefield of the current data.
+
+        Returns
+        -------
+        list[pygfunction.boreholes.Borehole]
+            Borefield model
+        """
+        return self._borefield
+
+    @borefield.setter
+    def borefield(self, borefield: List[gt.boreholes.Borehole]) -> None:
+        """
+        This function sets the borefield of the current data and calculates its fingerprint.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model
+
+        Returns
+        -------
+        None
+        """
+        self._set_borefield(borefield, borefield_fingerprint(borefield))
+
+    def _set_borefield(self, borefield: List[gt.boreholes.Borehole], fingerprint: str) -> None:
+        """
+        This function sets the borefield of the current data together with its (already calculated) fingerprint.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model
+        fingerprint : str
+            Fingerprint of the borefield geometry (see borefield_fingerprint)
+
+        Returns
+        -------
+        None
+        """
+        self._borefield = borefield
+        self._borefield_fingerprint = fingerprint
+
     def calculate(self, time_value: Union[list, float, np.ndarray], borefield: List[gt.boreholes.Borehole],
-                  alpha: float, interpolate: bool = None):
+                  alpha: float, interpolate: bool = None, fingerprint: str = None):
         """
         This function returns the gvalues either by interpolation or by calculating them.
         It does so by calling the function gvalues which does this calculation.
@@ -116,12 +219,16 @@ class GFunction:
             Thermal diffusivity of the ground [m2/s]
         interpolate : bool
             True if results should be interpolated when possible, False otherwise. If None, the default is chosen.
+        fingerprint : str
+            Fingerprint of the borefield geometry (see borefield_fingerprint). If None, it is calculated.
 
         Returns
         -------
         gvalues : np.ndarray
             1D array with all the requested gvalues
         """
+        if fingerprint is None:
+            fingerprint = borefield_fingerprint(borefield)
 
         def gvalues(time_values: np.ndarray, borefield: List[gt.boreholes.Borehole], alpha: float,
                     depth: float, interpolate: bool = None) -> np.ndarray:
@@ -146,44 +253,53 @@ class GFunction:
             gvalues : np.ndarray
                 1D array with all the requested gvalues
             """
-            # check if the value is in the fifo_list
-            # if the value is in self.depth_array, there is no problem, since the interpolation will be exact anyway
-            if self.fifo_list.in_fifo_list(depth) and depth not in self.depth_array:
-                # chances are we are stuck in a loop, so calculate the gfunction and do not iterate
-
-                # calculate the g-values for uniform borehole wall temperature
-                gfunc_calculated = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options).gFunc
-
-                # store the calculated g-values
-                self.set_new_calculated_data(time_values, depth, gfunc_calculated, borefield, alpha)
-
-                self.fifo_list.add(depth)
-
-                return gfunc_calculated
-
-            # store in fifo_list to make sure we are not stuck in iterations
-            self.fifo_list.add(depth)
-
-            # check if previous depth is close to current one
-            # if so, returns previous gfunction data to speed up sizing convergence
-            if np.abs(self.previous_depth - depth) < 1:
-                depth = self.previous_depth
-            else:
-                self.previous_depth = depth
-            # do interpolation
-            interpolate = interpolate if interpolate is not None else self.store_previous_values
-            gfunc_interpolated = self.interpolate_gfunctions(time_values, depth, alpha, borefield)\
-                if interpolate else np.array([])
-
-            # if there are g-values calculated, return them
-            if np.any(gfunc_interpolated):
-                return gfunc_interpolated
+            # the stored data is only accessed while holding the lock, but the lock is released during the
+            # (time-consuming) calculation with pygfunction, so multiple threads can calculate at the same time
+            with self._lock:
+                # make the stored data of this borefield and alpha the current data, if available
+                self._load_stored_data(borefield, alpha, fingerprint, time_values)
+
+                # check if the value is in the fifo_list
+                # if the value is in self.depth_array, there is no problem, since the interpolation will be exact anyway
+                if self.fifo_list.in_fifo_list(depth) and depth not in self.depth_array:
+                    # chances are we are stuck in a loop, so calculate the gfunction and do not iterate
+                    self.fifo_list.add(depth)
+                    stuck_in_loop = True
+                    self.loop_breaks += 1
+                else:
+                    stuck_in_loop = False
+                    # store in fifo_list to make sure we are not stuck in iterations
+                    self.fifo_list.add(depth)
+
+                    # check if previous depth is close to current one
+                    # if so, returns previous gfunction data to speed up sizing convergence
+                    # this is not needed when the interpolation error is controlled
+                    if self.interpolation_tolerance is None and np.abs(self.previous_depth - depth) < 1:
+                        depth = self.previous_depth
+                    else:
+                        self.previous_depth = depth
+                    # do interpolation
+                    interpolate = interpolate if interpolate is not None else self.store_previous_values
+                    gfunc_interpolated = self.interpolate_gfunctions(time_values, depth, alpha, borefield, fingerprint)\
+                        if interpolate else np.array([])
+
+                    # if there are g-values calculated, return them
+                    if np.any(gfunc_interpolated):
+                        self.hits += 1
+                        return gfunc_interpolated
+
+                self.misses += 1
 
             # calculate the g-values for uniform borehole wall temperature
-            gfunc_calculated = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options, method=self.options['method']).gFunc
+            # when stuck in a loop, the default method of pygfunction is used
+            method = "equivalent" if stuck_in_loop else self.options['method']
+            gfunc_calculated = self._calculate_gvalues(time_values, borefield, alpha, method, fingerprint)
 
             # store the calculated g-values
-            self.set_new_calculated_data(time_values, depth, gfunc_calculated, borefield, alpha)
+            with self._lock:
+                self.set_new_calculated_data(time_values, depth, gfunc_calculated, borefield, alpha, fingerprint)
+            if self._new_data is not None:
+                self._new_data.append((time_values, depth, gfunc_calculated, borefield, alpha, fingerprint))
 
             return gfunc_calculated
 
@@ -200,7 +316,7 @@ class GFunction:
             # due to this many requested time values, the calculation will be slow.
             # there will be interpolation
 
-            time_value_new = _timeValues(t_max=time_value[-1])
+            time_value_new = claesson_javed_time_values(t_max=float(time_value[-1]))
 
             # calculate g-function values
             gfunc_uniform_T = gvalues(time_value_new, borefield, alpha, depth, interpolate)
@@ -220,8 +336,280 @@ class GFunction:
 
         return gfunc_uniform_T
 
+    def _calculate_gvalues(self, time_values: np.ndarray, borefield: List[gt.boreholes.Borehole], alpha: float,
+                           method: str, fingerprint: str = None) -> np.ndarray:
+        """
+        This function calculates the gvalues with pygfunction. When a dimensionless cache is set, the gvalues are
+        interpolated from it if possible, otherwise they are calculated on its grid of dimensionless time values.
+        When a disk cache is set, the gvalues are loaded from the disk cache if possible and the newly calculated
+        gvalues are stored in it.
+        For the copies for concurrent sizing (see _fork), the gvalues that are already calculated (or being
+        calculated) by another copy for the same borefield, depth, alpha, options and time values are reused.
+
+        Parameters
+        ----------
+        time_values : np.ndarray
+            Array with all the time values [s] for which gvalues should be calculated
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model for which the gvalues should be calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        method : str
+            Method of the pygfunction gFunction class
+        fingerprint : str
+            Fingerprint of the borefield geometry (see borefield_fingerprint). If None, it is calculated.
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            1D array with all the requested gvalues
+        """
+        def pygfunction(time_values: np.ndarray) -> np.ndarray:
+            """
+            This function calculates the gvalues with pygfunction and keeps track of the calculation time.
+
+            Parameters
+            ----------
+            time_values : np.ndarray
+                Array with all the time values [s] for which gvalues should be calculated
+
+            Returns
+            -------
+            gvalues : np.ndarray
+                1D array with all the requested gvalues
+            """
+            start = time.perf_counter()
+            gvalues = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options, method=method).gFunc
+            with self._lock:
+                self.pygfunction_calls += 1
+                self.pygfunction_time += time.perf_counter() - start
+            return gvalues
+
+        def calculate(time_values: np.ndarray) -> np.ndarray:
+            """
+            This function calculates the gvalues with pygfunction or loads them from the disk cache.
+
+            Parameters
+            ----------
+            time_values : np.ndarray
+                Array with all the time values [s] for which gvalues should be calculated
+
+            Returns
+            -------
+            gvalues : np.ndarray
+                1D array with all the requested gvalues
+            """
+            if self.disk_cache is None:
+                return pygfunction(time_values)
+
+            key = GFunctionDiskCache.key(borefield, alpha, time_values, {**self.options, "method": method})
+            gvalues = self.disk_cache.load(key)
+            if gvalues is not None and gvalues.shape == np.shape(time_values):
+                return gvalues
+            gvalues = pygfunction(time_values)
+            self.disk_cache.store(key, gvalues)
+            return gvalues
+
+        def calculate_with_caches() -> np.ndarray:
+            """
+            This function calculates the gvalues, using the dimensionless cache if it is set.
+
+            Returns
+            -------
+            gvalues : np.ndarray
+                1D array with all the requested gvalues
+            """
+            if self.dimensionless_cache is None:
+                return calculate(time_values)
+            return self.dimensionless_cache.gvalues(borefield, alpha, time_values,
+                                                    {**self.options, "method": method}, calculate)
+
+        if self._shared_gvalues is None:
+            return calculate_with_caches()
+
+        if fingerprint is None:
+            fingerprint = borefield_fingerprint(borefield)
+        key = GFunction._key(fingerprint, alpha, {**self.options, "method": method}, time_values) + \
+            (borefield[0].H,)
+        with self._lock:
+            future = self._shared_gvalues.get(key)
+            calculating = future is None
+            if calculating:
+                future = self._shared_gvalues[key] = Future()
+        if calculating:
+            try:
+                future.set_result(calculate_with_caches())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def _fork(self, number: int) -> List[GFunction]:
+        """
+        This function returns copies of this object, so multiple sizings can be performed at the same time on
+        different threads (see Borefield._size_quadrants_concurrently).
+        Every copy has its own sizing state (the FIFO list, the previous depth and the current and stored data),
+        which starts from the state of this object, so the result of a sizing does not depend on the other sizings
+        nor on the timing of the threads. Only the gvalues that are calculated exactly are shared between the copies,
+        keyed per borefield, depth, alpha, options and time values, so the same gvalues are not calculated twice.
+        The borefield, depth, alpha and options are the same as when a copy would calculate them itself, so this
+        does not change the results, unless the dimensionless cache is used, since it interpolates between the
+        gvalues that are stored in it.
+        The newly calculated data is moved back to this object with _join.
+
+        Parameters
+        ----------
+        number : int
+            Number of copies
+
+        Returns
+        -------
+        List[GFunction]
+            Copies of this object
+        """
+        shared_gvalues = {}
+        forks = []
+        with self._lock:
+            for _ in range(number):
+                fork = copy.copy(self)
+                fork._lock = self._lock
+                fork.fifo_list = copy.deepcopy(self.fifo_list)
+                fork.stored_data = OrderedDict(self.stored_data)
+                fork._shared_gvalues = shared_gvalues
+                fork._new_data = []
+                # the statistics of the copies are added to the ones of this object afterwards
+                fork.hits = fork.misses = fork.interpolations = fork.extrapolations = fork.loop_breaks = 0
+                fork.pygfunction_calls = 0
+                fork.pygfunction_time = 0.
+                forks.append(fork)
+        return forks
+
+    def _join(self, forks: List[GFunction]) -> None:
+        """
+        This function stores the data that is newly calculated by the copies of this object (see _fork) in this
+        object, in the order of the copies and in the order in which they are calculated, as if the sizings were
+        performed one after the other. The statistics of the copies are added to the statistics of this object.
+
+        Parameters
+        ----------
+        forks : List[GFunction]
+            Copies of this object
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            for fork in forks:
+                for new_data in fork._new_data:
+                    self.set_new_calculated_data(*new_data)
+                self.hits += fork.hits
+                self.misses += fork.misses
+                self.interpolations += fork.interpolations
+                self.extrapolations += fork.extrapolations
+                self.loop_breaks += fork.loop_breaks
+                self.pygfunction_calls += fork.pygfunction_calls
+                self.pygfunction_time += fork.pygfunction_time
+
+    def stats(self, log: bool = False) -> dict:
+        """
+        This function returns the statistics of the g-function calculation, so it can be seen whether the
+        calculation time is spent in pygfunction or whether e.g. threshold_depth_interpolation or the size of the
+        stored data should be changed.
+
+        Parameters
+        ----------
+        log : bool
+            True if the statistics should also be logged with the ghe_logger
+
+        Returns
+        -------
+        dict
+            Dictionary with the number of hits and misses, the number of interpolations, extrapolations and FIFO
+            loop-breaks, the number of calls, the total and the average wall time [s] of the calculations with
+            pygfunction, the number of stored depths of the current data, the number of stored previous datasets
+            and their size [bytes] and the number of hits and misses of the dimensionless cache
+        """
+        with self._lock:
+            stats = {"hits": self.hits,
+                     "misses": self.misses,
+                     "interpolations": self.interpolations,
+                     "extrapolations": self.extrapolations,
+                     "loop_breaks": self.loop_breaks,
+                     "pygfunction_calls": self.pygfunction_calls,
+                     "pygfunction_time": self.pygfunction_time,
+                     "pygfunction_time_per_call": self.pygfunction_time / self.pygfunction_calls
+                     if self.pygfunction_calls else 0.,
+                     "stored_depths": self.depth_array.size,
+                     "stored_data": len(self.stored_data),
+                     "stored_data_size": self.stored_data_size,
+                     "dimensionless_cache_hits": 0 if self.dimensionless_cache is None
+                     else self.dimensionless_cache.hits,
+                     "dimensionless_cache_misses": 0 if self.dimensionless_cache is None
+                     else self.dimensionless_cache.misses}
+        if log:
+            ghe_logger.info("G-function statistics: " + ", ".join(f"{key}: {value}" for key, value in stats.items()))
+        return stats
+
+    def reset_stats(self) -> None:
+        """
+        This function resets all the counters and timings of the statistics (see stats).
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.interpolations = 0
+            self.extrapolations = 0
+            self.loop_breaks = 0
+            self.pygfunction_calls = 0
+            self.pygfunction_time = 0.
+            if self.dimensionless_cache is not None:
+                self.dimensionless_cache.hits = 0
+                self.dimensionless_cache.misses = 0
+
+    def set_disk_cache(self, folder: Union[str, Path] = None, max_size: float = 100e6) -> None:
+        """
+        This function sets the folder of the cache on disk in which the gvalues, calculated with pygfunction,
+        are stored. When the same gvalues are needed again, even in another process, they are loaded from
+        this cache instead of calculated.
+
+        Parameters
+        ----------
+        folder : str, Path
+            Folder of the cache. If None, the disk cache is not used.
+        max_size : float
+            Maximum size of the cache [bytes]. When it is exceeded, the least recently used gvalues are removed.
+
+        Returns
+        -------
+        None
+        """
+        self.disk_cache = None if folder is None else GFunctionDiskCache(folder, max_size)
+
+    def set_dimensionless_cache(self, use_cache: bool = True, time_step: float = 0.1) -> None:
+        """
+        This function sets the cache in which the gvalues are stored in dimensionless coordinates, so they are
+        reused for other ground thermal diffusivities and borehole spacings (see DimensionlessGFunctionCache).
+
+        Parameters
+        ----------
+        use_cache : bool
+            True if the dimensionless cache should be used, False otherwise
+        time_step : float
+            Step of the grid of ln(t/ts) on which the gvalues are stored
+
+        Returns
+        -------
+        None
+        """
+        self.dimensionless_cache = DimensionlessGFunctionCache(time_step) if use_cache else None
+
     def interpolate_gfunctions(self, time_value: Union[list, float, np.ndarray], depth: float,
-                               alpha: float, borefield: List[gt.boreholes.Borehole]) -> np.ndarray:
+                               alpha: float, borefield: List[gt.boreholes.Borehole],
+                               fingerprint: str = None) -> np.ndarray:
         """
         This function returns the gvalues by interpolation them. If interpolation is not possible, an emtpy
         array is returned.
@@ -236,6 +624,8 @@ class GFunction:
             Thermal diffusivity of the ground [m2/s]
         borefield : list[pygfunction.boreholes.Borehole]
             Borefield model for which the gvalues should be calculated
+        fingerprint : str
+            Fingerprint of the borefield geometry (see borefield_fingerprint). If None, it is calculated.
 
         Returns
         -------
@@ -245,7 +635,7 @@ class GFunction:
         gvalues: np.ndarray = np.zeros(len(time_value))
 
         # check if interpolation is possible:
-        if not (self._check_alpha(alpha) and self._check_borefield(borefield)):
+        if not (self._check_alpha(alpha) and self._check_borefield(borefield, fingerprint)):
             # the alpha and/or borefield is not in line with the precalculated data
             return gvalues
 
@@ -253,27 +643,161 @@ class GFunction:
         if not self._check_time_values(time_value):
             return gvalues
 
+        if self.interpolation_tolerance is not None:
+            if not np.all(np.isin(time_value, self.time_array)):
+                # the error of the interpolation in time is not controlled
+                return gvalues
+            if self.depth_array[0] <= depth <= self.depth_array[-1]:
+                gvalues = self._interpolate_gfunctions_adaptively(time_value, depth)
+                self.interpolations += bool(np.any(gvalues))
+                return gvalues
+
         # find nearest depth indices
         idx_prev, idx_next = self._get_nearest_depth_index(depth)
 
-        if self.no_extrapolation:
-            # no interpolation can be made since depth is not in between values in the depth array
-            if idx_prev is None or idx_next is None:
-                return gvalues
-
+        if idx_prev is not None and idx_next is not None:
             # do interpolation
-            if self.depth_array.size == 1:
-                gvalues = interpolate.interpn([self.time_array], self.previous_gfunctions, time_value)
-            else:
-                gvalues = interpolate.interpn((self.depth_array, self.time_array), self.previous_gfunctions,
-                                              np.array([[depth, t] for t in time_value]))
+            self.interpolations += 1
+            return self._get_interpolator()(depth, time_value)
 
+        if self.no_extrapolation or (idx_prev is None and idx_next is None):
+            # no interpolation can be made since depth is not in between values in the depth array
             return gvalues
 
         # when extrapolation is permitted
-        # not yet implemented
+        gvalues = self._extrapolate_gfunctions(time_value, depth, idx_next if idx_prev is None else idx_prev)
+        self.extrapolations += bool(np.any(gvalues))
         return gvalues
 
+    def _extrapolate_gfunctions(self, time_value: np.ndarray, depth: float, idx_edge: int) -> np.ndarray:
+        """
+        This function returns the gvalues for a depth outside the range of the stored depths by extrapolation.
+        The gvalues change smoothly with the depth, so they are extrapolated with a second order polynomial through
+        the three stored depths nearest to the requested depth. The difference with the first order extrapolation
+        (through the two nearest depths) is used as an estimate of the extrapolation error.
+        When this difference is larger than extrapolation_tolerance (relative to the gvalues), when less than three
+        depths are stored or when the depth is further from the stored depths than the distance between these three
+        depths, the gvalues are not extrapolated and an empty array is returned, so they are calculated.
+
+        Parameters
+        ----------
+        time_value : np.ndarray
+            Time value(s) [s] for which gvalues should be calculated
+        depth : float
+            Depth of the borefield [m]
+        idx_edge : int
+            Index of the stored depth that is nearest to the depth (the first or the last one)
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            1D array with all the requested gvalues
+        """
+        gvalues: np.ndarray = np.zeros(len(time_value))
+        if self.depth_array.size < 3:
+            return gvalues
+
+        # the three stored depths that are nearest to the requested depth, starting with the nearest one
+        step = 1 if idx_edge == 0 else -1
+        depths = self.depth_array[[idx_edge, idx_edge + step, idx_edge + 2 * step]]
+        if abs(depth - depths[0]) > abs(depths[0] - depths[2]):
+            # the error estimate is not reliable that far from the stored depths
+            return gvalues
+        first_order, second_order = self._polynomial_estimates(time_value, depth, depths)
+
+        if np.max(np.abs(second_order - first_order)) > self.extrapolation_tolerance * np.max(np.abs(second_order)):
+            # the depth is too far from the stored depths for an accurate extrapolation
+            return gvalues
+        return second_order
+
+    def _interpolate_gfunctions_adaptively(self, time_value: np.ndarray, depth: float) -> np.ndarray:
+        """
+        This function returns the gvalues for a depth within the range of the stored depths by interpolation,
+        when the estimated interpolation error is smaller than interpolation_tolerance.
+        The error of the linear interpolation between the two stored depths around the requested depth is estimated
+        by comparing it to the second order interpolation that also uses the nearest stored depth outside this
+        interval. Since the temperature difference between the ground and the borehole wall is proportional to the
+        gvalues, this is also an estimate of the relative error on this temperature difference.
+        When the estimated error is too large, or when there is no third stored depth, an empty array is returned,
+        so the gvalues are calculated at this depth. In this way, pygfunction is only called where the stored depths
+        are too far apart for the required accuracy.
+
+        Parameters
+        ----------
+        time_value : np.ndarray
+            Time value(s) [s] for which gvalues should be calculated
+        depth : float
+            Depth of the borefield [m], within the range of the stored depths
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            1D array with all the requested gvalues
+        """
+        gvalues: np.ndarray = np.zeros(len(time_value))
+        idx_next = int(np.searchsorted(self.depth_array, depth))
+        if self.depth_array[idx_next] == depth:
+            # the exact depth is in the previous calculated data
+            return self._get_interpolator()(depth, time_value)
+
+        # the third depth is the nearest stored depth outside the interval around the requested depth
+        candidates = [idx for idx in (idx_next - 2, idx_next + 1) if 0 <= idx < self.depth_array.size]
+        if not candidates:
+            return gvalues
+        idx_third = min(candidates, key=lambda idx: abs(self.depth_array[idx] - depth))
+        depths = self.depth_array[[idx_next - 1, idx_next, idx_third]]
+        first_order, second_order = self._polynomial_estimates(time_value, depth, depths)
+
+        if np.max(np.abs(second_order - first_order)) > self.interpolation_tolerance * np.max(np.abs(second_order)):
+            # the stored depths are too far apart for an accurate interpolation
+            return gvalues
+        return second_order
+
+    def _polynomial_estimates(self, time_value: np.ndarray, depth: float,
+                              depths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function calculates the first order estimate of the gvalues, based on the first two stored depths,
+        and the second order (Lagrange) estimate, based on all three stored depths.
+
+        Parameters
+        ----------
+        time_value : np.ndarray
+            Time value(s) [s] for which gvalues should be calculated
+        depth : float
+            Depth of the borefield [m]
+        depths : np.ndarray
+            Three different stored depths [m]
+
+        Returns
+        -------
+        tuple(np.ndarray, np.ndarray)
+            First and second order estimate of the gvalues
+        """
+        interpolator = self._get_interpolator()
+        rows = [interpolator(stored_depth, time_value) for stored_depth in depths]
+        first_order = rows[0] + (rows[1] - rows[0]) * (depth - depths[0]) / (depths[1] - depths[0])
+        second_order = sum(row * np.prod([(depth - other) / (stored_depth - other)
+                                          for other in depths if other != stored_depth])
+                           for row, stored_depth in zip(rows, depths))
+        return first_order, second_order
+
+    def _get_interpolator(self) -> GFunctionInterpolator:
+        """
+        This function returns the interpolator of the stored data. It is only recreated when the stored data
+        (or the interpolation method) has changed since the last interpolation.
+
+        Returns
+        -------
+        GFunctionInterpolator
+            Interpolator of the stored data
+        """
+        if self._interpolator is None or self._interpolator.depth_method != self.depth_interpolation or \
+                self._interpolator.time_method != self.time_interpolation or \
+                not self._interpolator.is_up_to_date(self.depth_array, self.time_array, self.previous_gfunctions):
+            self._interpolator = GFunctionInterpolator(self.depth_array, self.time_array, self.previous_gfunctions,
+                                                       self.depth_interpolation, self.time_interpolation)
+        return self._interpolator
+
     @staticmethod
     def _nearest_value(array: np.ndarray, value: float) -> Tuple[int, int]:
         """
@@ -402,12 +926,124 @@ class GFunction:
         -------
         None
         """
-        self.options = options
+        with self._lock:
+            if options != self.options:
+                # the current data is only valid for the previous options
+                self.store_previous_data()
+            self.options = options
+
+    @staticmethod
+    def _key(fingerprint: str, alpha: float, options: dict, time_array: np.ndarray = None) -> tuple:
+        """
+        This function returns the key under which the data of a borefield is stored.
+
+        Parameters
+        ----------
+        fingerprint : str
+            Fingerprint of the borefield geometry (see borefield_fingerprint)
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        options : dict
+            Dictionary with options for the gFunction class of pygfunction
+        time_array : np.ndarray
+            Time values [s] of the data, if the data of different time values is stored separately
+
+        Returns
+        -------
+        tuple
+            Key of the data
+        """
+        key = fingerprint, alpha, json.dumps(options, sort_keys=True, default=str)
+        if time_array is None:
+            return key
+        return key + (np.asarray(time_array, dtype=np.float64).tobytes(),)
+
+    @property
+    def stored_data_size(self) -> int:
+        """
+        This function returns the memory size of the stored data of the previous borefields.
+
+        Returns
+        -------
+        int
+            Size [bytes]
+        """
+        return sum(data[0].nbytes + data[1].nbytes + data[2].nbytes for data in self.stored_data.values())
+
+    def store_previous_data(self) -> None:
+        """
+        This function moves the current data to the stored data of the previous borefields, so it can be reused when
+        the same borefield, alpha and options are used again. Afterwards, the current data is removed.
+        When the interpolation error is controlled (see interpolation_tolerance), the data of different time values
+        is stored separately, so e.g. the data of the different sizing quadrants is not lost.
+        When the stored data exceeds max_stored_data_size, the least recently used data is removed.
+
+        Returns
+        -------
+        None
+        """
+        if self.depth_array.size != 0 and self.borefield and self.alpha != 0:
+            key = GFunction._key(self._borefield_fingerprint, self.alpha, self.options,
+                                 None if self.interpolation_tolerance is None else self.time_array)
+            self.stored_data[key] = (self.depth_array, self.time_array, self.previous_gfunctions)
+            self.stored_data.move_to_end(key)
+            while self.stored_data and self.stored_data_size > self.max_stored_data_size:
+                self.stored_data.popitem(last=False)
+        self.remove_previous_data()
+
+    def _load_stored_data(self, borefield: List[gt.boreholes.Borehole], alpha: float, fingerprint: str,
+                          time_values: np.ndarray = None) -> bool:
+        """
+        This function makes the stored data of a borefield and alpha the current data.
+        The current data is moved to the stored data.
+        When the interpolation error is controlled (see interpolation_tolerance), the stored data of the time values
+        is loaded if the current data cannot be used for these time values.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model for which the gvalues should be calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        fingerprint : str
+            Fingerprint of the borefield geometry (see borefield_fingerprint)
+        time_values : np.ndarray
+            Time values [s] for which the gvalues are needed
+
+        Returns
+        -------
+        bool
+            True if there is data available for this borefield and alpha, False otherwise
+        """
+        time_values = None if self.interpolation_tolerance is None else time_values
+        key = GFunction._key(fingerprint, alpha, self.options, time_values)
+        if self._check_alpha(alpha) and self._check_borefield(borefield, fingerprint) and \
+                (time_values is None or np.all(np.isin(time_values, self.time_array)) or key not in self.stored_data):
+            return self.depth_array.size > 0
+        self.store_previous_data()
+        if key not in self.stored_data:
+            return False
+        self.depth_array, self.time_array, self.previous_gfunctions = self.stored_data.pop(key)
+        self._set_borefield(borefield, fingerprint)
+        self.alpha = alpha
+        return True
+
+    def clear_stored_data(self) -> None:
+        """
+        This function removes all the calculated data, including the stored data of the previous borefields.
+
+        Returns
+        -------
+        None
+        """
+        self.remove_previous_data()
+        self.stored_data.clear()
 
     def remove_previous_data(self) -> None:
         """
         This function removes the previous calculated data by setting the depth_array, time_array and
         previous_gfunctions back to empty arrays.
+        The stored data of the previous borefields is kept (see store_previous_data).
 
         Returns
         -------
@@ -421,7 +1057,7 @@ class GFunction:
         self.fifo_list.clear()
 
     def set_new_calculated_data(self, time_values: np.ndarray, depth: float, gvalues: np.ndarray,
-                                borefield, alpha) -> bool:
+                                borefield, alpha, fingerprint: str = None) -> bool:
         """
         This function stores the newly calculated gvalues if this is needed.
 
@@ -437,12 +1073,16 @@ class GFunction:
             Borefield model for which the gvalues should be calculated
         alpha : float
             Thermal diffusivity of the ground [m2/s]
+        fingerprint : str
+            Fingerprint of the borefield geometry (see borefield_fingerprint). If None, it is calculated.
 
         Returns
         -------
         bool
             True if the data is saved, False otherwise
         """
+        if fingerprint is None:
+            fingerprint = borefield_fingerprint(borefield)
 
         def check_if_data_should_removed() -> bool:
             """
@@ -457,10 +1097,11 @@ class GFunction:
             if not self._check_alpha(alpha):
                 return True
 
-            if not self._check_borefield(borefield):
+            if not self._check_borefield(borefield, fingerprint):
                 return True
 
-            if not self._check_time_values(time_values):
+            if not np.array_equal(self.time_array, time_values):
+                # the stored g-values are calculated for other time values
                 return True
 
             return False
@@ -485,9 +1126,10 @@ class GFunction:
                 # previous data should not be stored
                 return False
 
-            if time_values.size < self.time_array.size:
+            if time_values.size < self.time_array.size and self.interpolation_tolerance is None:
                 # the new time array is smaller, so we would lose data if it was saved, whereby the
                 # previous data should be deleted.
+                # (when the interpolation error is controlled, the previous data is stored separately)
                 return False
 
             return True
@@ -496,9 +1138,20 @@ class GFunction:
         if not check_if_data_should_be_saved():
             return False
 
+        # make the stored data of this borefield and alpha the current data, if available
+        self._load_stored_data(borefield, alpha, fingerprint, time_values)
+
         # check if the previous stored data should be removed
         if check_if_data_should_removed():
-            self.remove_previous_data()
+            if self.interpolation_tolerance is None:
+                self.remove_previous_data()
+            else:
+                # keep the data of the other time values
+                self.store_previous_data()
+
+        if depth in self.depth_array:
+            # the data for this depth is already stored (e.g. calculated at the same time in another thread)
+            return False
 
         nearest_idx = 0
 
@@ -519,41 +1172,31 @@ class GFunction:
 
         self.depth_array = np.insert(self.depth_array, nearest_idx, depth)
         self.time_array = time_values
-        self.borefield = borefield
+        self._set_borefield(borefield, fingerprint)
         self.alpha = alpha
 
         return True
 
-    def _check_borefield(self, borefield: List[gt.boreholes.Borehole]) -> bool:
+    def _check_borefield(self, borefield: List[gt.boreholes.Borehole], fingerprint: str = None) -> bool:
         """
         This function checks whether the new borefield object is equal to the previous one.
-        It does so by comparing all the parameters (neglecting the depth).
-        If the borefield objects are unequal, the borefield variable is set to the new borefield
-        and all the previously saved gfunctions are deleted.
+        It does so by comparing the fingerprints of the borefield geometries (neglecting the depth).
 
         Parameters
         ----------
         borefield : list[pygfunction.boreholes.Borehole]
             New borefield for which the gfunctions should be calculated
+        fingerprint : str
+            Fingerprint of the new borefield geometry (see borefield_fingerprint). If None, it is calculated.
 
         Returns
         -------
         True
             True if the borefields are the same, False otherwise
         """
-        # borefields are unequal if they have different number of boreholes
-        if len(borefield) != len(self.borefield):
-            return False
-
-        keys = set(borefield[0].__dict__.keys())
-        keys.remove("H")
-
-        for idx, _ in enumerate(borefield):
-            for key in keys:
-                if getattr(borefield[idx], key) != getattr(self.borefield[idx], key):
-                    return False
-
-        return True
+        if fingerprint is None:
+            fingerprint = borefield_fingerprint(borefield)
+        return fingerprint == self._borefield_fingerprint
 
     def _check_alpha(self, alpha) -> bool:
         """
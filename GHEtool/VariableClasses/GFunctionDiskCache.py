@@ -0,0 +1,188 @@
+"""
+This file contains the GFunctionDiskCache class, which stores calculated g-values on disk so they can be reused
+in other processes and sessions.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+import pygfunction as gt
+
+
+class GFunctionDiskCache:
+    """
+    This class contains a content-addressed cache of g-values on disk.
+    Every set of g-values is stored in a separate .npy-file, whose name is the hash of everything the g-values
+    depend on: the geometry (including the depth) of the boreholes, the ground thermal diffusivity, the time values and
+    the pygfunction options. When the total size of the cache exceeds the maximum size, the least recently used files
+    are removed.
+    """
+
+    EXTENSION: str = ".npy"
+
+    def __init__(self, folder: Union[str, Path], max_size: float = 100e6):
+        """
+
+        Parameters
+        ----------
+        folder : str, Path
+            Folder in which the g-values are stored. It is created if it does not exist.
+        max_size : float
+            Maximum size of the cache [bytes]
+        """
+        self.folder: Path = Path(folder)
+        self.max_size: float = max_size
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(borefield: List[gt.boreholes.Borehole], alpha: float, time_values: np.ndarray, options: dict) -> str:
+        """
+        This function returns the key of a set of g-values.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model for which the gvalues are calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        time_values : np.ndarray
+            Array with all the time values [s] for which the gvalues are calculated
+        options : dict
+            Options (including the method) of the pygfunction gFunction class
+
+        Returns
+        -------
+        str
+            Hexadecimal hash of the input
+        """
+        geometry = np.array([(borehole.x, borehole.y, borehole.D, borehole.r_b, borehole.tilt, borehole.orientation,
+                              borehole.H) for borehole in borefield], dtype=np.float64)
+        sha = hashlib.sha256()
+        sha.update(geometry.tobytes())
+        sha.update(np.float64(alpha).tobytes())
+        sha.update(np.asarray(time_values, dtype=np.float64).tobytes())
+        sha.update(json.dumps(options, sort_keys=True, default=str).encode())
+        return sha.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """
+        This function returns the path of the file with the given key.
+
+        Parameters
+        ----------
+        key : str
+            Key of the g-values
+
+        Returns
+        -------
+        Path
+            Path of the file
+        """
+        return self.folder.joinpath(key + GFunctionDiskCache.EXTENSION)
+
+    def load(self, key: str) -> Union[np.ndarray, None]:
+        """
+        This function loads the g-values with the given key from the cache.
+        The modification time of the file is updated, so it is the most recently used file.
+
+        Parameters
+        ----------
+        key : str
+            Key of the g-values
+
+        Returns
+        -------
+        np.ndarray or None
+            G-values or None if they are not in the cache
+        """
+        path = self._path(key)
+        try:
+            gvalues = np.array(np.load(path, mmap_mode="r"))
+            os.utime(path)
+        except (OSError, ValueError):
+            # the file does not exist (anymore) or is corrupt
+            return None
+        return gvalues
+
+    def store(self, key: str, gvalues: np.ndarray) -> None:
+        """
+        This function stores the g-values in the cache and removes the least recently used files when the maximum
+        size of the cache is exceeded.
+        The file is written to a temporary file first, so other processes never read an incomplete file.
+
+        Parameters
+        ----------
+        key : str
+            Key of the g-values
+        gvalues : np.ndarray
+            G-values
+
+        Returns
+        -------
+        None
+        """
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.folder)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                np.save(file, np.asarray(gvalues, dtype=np.float64))
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        This function removes the least recently used files until the size of the cache is below the maximum size.
+
+        Returns
+        -------
+        None
+        """
+        files = []
+        for path in self.folder.glob("*" + GFunctionDiskCache.EXTENSION):
+            try:
+                stat = path.stat()
+            except OSError:
+                # removed by another process
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        size = sum(file[1] for file in files)
+        for _, file_size, path in sorted(files, key=lambda file: file[0]):
+            if size <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= file_size
+
+    @property
+    def size(self) -> int:
+        """
+        This function returns the size of the cache.
+
+        Returns
+        -------
+        int
+            Size of all the stored files [bytes]
+        """
+        return sum(path.stat().st_size for path in self.folder.glob("*" + GFunctionDiskCache.EXTENSION))
+
+    def clear(self) -> None:
+        """
+        This function removes all the stored g-values.
+
+        Returns
+        -------
+        None
+        """
+        for path in self.folder.glob("*" + GFunctionDiskCache.EXTENSION):
+            path.unlink()
@@ -0,0 +1,150 @@
+"""
+This file contains the GFunctionInterpolator class, which interpolates precalculated g-values in depth and time.
+"""
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+
+class GFunctionInterpolator:
+    """
+    This class interpolates a table of g-values (depth x time) for a whole array of time values at once.
+    Along the depth axis, the interpolation is linear or cubic. Along the time axis, the interpolation is linear in time
+    or, since the g-function is almost linear in the logarithm of time, linear in log-time.
+    Everything that only depends on the table (e.g. the logarithm of the time values and the cubic spline) is
+    calculated once when the object is created, so the interpolator should only be recreated when the table changes.
+    With linear interpolation in depth and time, the result is the same as with scipy.interpolate.interpn.
+    """
+
+    def __init__(self, depth_array: np.ndarray, time_array: np.ndarray, gvalues: np.ndarray,
+                 depth_method: str = "linear", time_method: str = "linear"):
+        """
+
+        Parameters
+        ----------
+        depth_array : np.ndarray
+            Sorted depths [m] of the rows in the table
+        time_array : np.ndarray
+            Sorted time values [s] of the columns in the table
+        gvalues : np.ndarray
+            Table with the g-values (a 1D-array when there is only one depth)
+        depth_method : str
+            'linear' or 'cubic' interpolation along the depth axis
+        time_method : str
+            'linear' or 'log' (linear in log-time) interpolation along the time axis
+
+        Raises
+        ------
+        ValueError
+            When the depth or time method is unknown
+        """
+        if depth_method not in ("linear", "cubic"):
+            raise ValueError(f"The depth interpolation method {depth_method} is unknown. Use 'linear' or 'cubic'.")
+        if time_method not in ("linear", "log"):
+            raise ValueError(f"The time interpolation method {time_method} is unknown. Use 'linear' or 'log'.")
+        # the original arrays are kept, so it can be checked whether the interpolator is still up-to-date
+        self.source: tuple = (depth_array, time_array, gvalues)
+
+        self.depth_array: np.ndarray = np.atleast_1d(np.asarray(depth_array, dtype=np.float64))
+        self.time_axis: np.ndarray = self._transform_time(time_array, time_method)
+        self.gvalues: np.ndarray = np.atleast_2d(np.asarray(gvalues, dtype=np.float64))
+        self.depth_method: str = depth_method
+        self.time_method: str = time_method
+        self._spline: CubicSpline = CubicSpline(self.depth_array, self.gvalues, axis=0) \
+            if depth_method == "cubic" and self.depth_array.size > 1 else None
+
+    @staticmethod
+    def _transform_time(time_value: Union[list, float, np.ndarray], time_method: str) -> np.ndarray:
+        """
+        This function transforms the time values to the axis on which the interpolation is linear.
+
+        Parameters
+        ----------
+        time_value : list, float, np.ndarray
+            Time value(s) [s]
+        time_method : str
+            'linear' or 'log'
+
+        Returns
+        -------
+        np.ndarray
+            1D array with the transformed time values
+        """
+        time_value = np.atleast_1d(np.asarray(time_value, dtype=np.float64))
+        return np.log(time_value) if time_method == "log" else time_value
+
+    def is_up_to_date(self, depth_array: np.ndarray, time_array: np.ndarray, gvalues: np.ndarray) -> bool:
+        """
+        This function checks whether the interpolator is created for the given arrays.
+
+        Parameters
+        ----------
+        depth_array : np.ndarray
+            Depths [m] of the rows in the table
+        time_array : np.ndarray
+            Time values [s] of the columns in the table
+        gvalues : np.ndarray
+            Table with the g-values
+
+        Returns
+        -------
+        bool
+            True if the interpolator is created for exactly these arrays
+        """
+        return all(array is source for array, source in zip((depth_array, time_array, gvalues), self.source))
+
+    def _gvalues_at_depth(self, depth: float) -> np.ndarray:
+        """
+        This function interpolates the g-values at all the time values of the table for a certain depth.
+
+        Parameters
+        ----------
+        depth : float
+            Depth [m]
+
+        Returns
+        -------
+        np.ndarray
+            G-values at the time values of the table
+        """
+        if self.depth_array.size == 1:
+            return self.gvalues[0]
+        if self._spline is not None:
+            return self._spline(depth)
+        idx = min(np.searchsorted(self.depth_array, depth, side="right"), self.depth_array.size - 1)
+        idx = max(idx, 1)
+        weight = (depth - self.depth_array[idx - 1]) / (self.depth_array[idx] - self.depth_array[idx - 1])
+        return self.gvalues[idx - 1] + weight * (self.gvalues[idx] - self.gvalues[idx - 1])
+
+    def __call__(self, depth: float, time_value: Union[list, float, np.ndarray]) -> np.ndarray:
+        """
+        This function returns the interpolated g-values.
+
+        Parameters
+        ----------
+        depth : float
+            Depth [m]
+        time_value : list, float, np.ndarray
+            Time value(s) [s]
+
+        Returns
+        -------
+        np.ndarray
+            1D array with the interpolated g-values
+
+        Raises
+        ------
+        ValueError
+            When the depth or time values are outside the range of the table
+        """
+        time_axis = self._transform_time(time_value, self.time_method)
+        # with only one depth in the table, the depth is not interpolated
+        if self.depth_array.size > 1 and not self.depth_array[0] <= depth <= self.depth_array[-1]:
+            raise ValueError(f"The depth {depth} is outside the range of the interpolation table "
+                             f"({self.depth_array[0]} - {self.depth_array[-1]}).")
+        if time_axis.size and (np.min(time_axis) < self.time_axis[0] or np.max(time_axis) > self.time_axis[-1]):
+            raise ValueError("The time values are outside the range of the interpolation table.")
+        return np.interp(time_axis, self.time_axis, self._gvalues_at_depth(depth))
@@ -0,0 +1,328 @@
+"""
+This file contains the GFunctionLibrary class, which contains precalculated g-values of standard borefield shapes
+in dimensionless coordinates.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+import pygfunction as gt
+
+from .BorefieldFingerprint import borefield_shape_fingerprint
+
+
+class GFunctionLibrary:
+    """
+    This class contains a library of precalculated g-values for borefield shapes (e.g. the rectangular, box-shaped,
+    L-shaped, U-shaped and circular fields of pygfunction).
+    For every shape (see borefield_shape_fingerprint), the g-values are stored on a grid of B/H, D/H and the
+    dimensionless time ln(t/ts), with ts = H^2/(9 alpha), for a reference value of r_b/H of the library.
+    The g-values of a borefield with this shape are interpolated linearly in B/H, D/H and ln(t/ts), and corrected for
+    the borehole radius with -ln((r_b/H) / (r_b/H)_ref) [#Eskilson1987]_, so no pygfunction calculation is needed.
+    This radius correction is accurate for time values that are large compared to r_b^2/alpha (i.e. more than a few
+    hours).
+
+    A library is created with add_shape or build_standard_library, and saved and loaded as a compressed .npz file
+    with an index of the shapes in it. A small library, with the rectangular fields of up to 4 x 4 boreholes, is
+    included in GHEtool (see load_default).
+
+    References
+    ----------
+    .. [#Eskilson1987] Eskilson, P. (1987). Thermal analysis of heat extraction boreholes. PhD Thesis. University
+       of Lund, Lund, Sweden.
+    """
+
+    VERSION: int = 1
+    REFERENCE_DEPTH: float = 100.  # m
+    REFERENCE_ALPHA: float = 1e-6  # m2/s
+    DEFAULT_SPACING_RATIOS: np.ndarray = np.array([0.02, 0.03, 0.04, 0.05, 0.06, 0.08, 0.1, 0.15, 0.2, 0.3])
+    DEFAULT_BURIAL_RATIOS: np.ndarray = np.array([0.005, 0.01, 0.02, 0.04, 0.08])
+    DEFAULT_RADIUS_RATIO: float = 0.0005
+    # location of the library that is included in GHEtool
+    DEFAULT_LIBRARY: Path = Path(__file__).parent.joinpath("data", "gfunction_library.npz")
+
+    def __init__(self, options: dict = None, radius_ratio: float = DEFAULT_RADIUS_RATIO, log_time: np.ndarray = None):
+        """
+
+        Parameters
+        ----------
+        options : dict
+            Options (including the method) of the pygfunction gFunction class with which the library is calculated
+        radius_ratio : float
+            Reference value of r_b/H for which the library is calculated
+        log_time : np.ndarray
+            Sorted grid of the dimensionless time ln(t/ts) on which the g-values are stored. If None, a grid with a
+            step of 0.1 from ln(9 (r_b/H)^2) (i.e. t = r_b^2/alpha, below which the calculation with pygfunction is
+            not stable) to 5 is used.
+        """
+        self.options: dict = {"method": "equivalent"} if options is None else options
+        self.radius_ratio: float = radius_ratio
+        if log_time is None:
+            start = np.ceil(np.log(9 * radius_ratio ** 2) * 10) / 10
+            log_time = np.round(np.arange(start, 5.05, 0.1), 10)
+        self.log_time: np.ndarray = np.asarray(log_time, dtype=np.float64)
+        # for every shape fingerprint, a dictionary with name, spacing_ratios, burial_ratios and gvalues
+        self.shapes: Dict[str, dict] = {}
+        # shape fingerprint and spacing of the borefields that were already looked up, by borefield fingerprint
+        self._shape_cache: Dict[str, Tuple[str, float]] = {}
+
+    @property
+    def index(self) -> List[str]:
+        """
+        This function returns the names of the shapes in the library.
+
+        Returns
+        -------
+        list[str]
+            Names of the shapes
+        """
+        return [shape["name"] for shape in self.shapes.values()]
+
+    def add_shape(self, name: str, borefield: List[gt.boreholes.Borehole], spacing_ratios: np.ndarray = None,
+                  burial_ratios: np.ndarray = None) -> None:
+        """
+        This function calculates the g-values of a borefield shape and adds them to the library.
+        The borefield is scaled to the reference depth for every B/H and D/H of the grid.
+
+        Parameters
+        ----------
+        name : str
+            Name of the shape in the index of the library
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield with the shape (its size, depth and borehole radius are not used)
+        spacing_ratios : np.ndarray
+            Grid of B/H (neglected for a single borehole)
+        burial_ratios : np.ndarray
+            Grid of D/H
+
+        Returns
+        -------
+        None
+        """
+        spacing_ratios = np.sort(GFunctionLibrary.DEFAULT_SPACING_RATIOS if spacing_ratios is None
+                                 else np.asarray(spacing_ratios, dtype=np.float64))
+        burial_ratios = np.sort(GFunctionLibrary.DEFAULT_BURIAL_RATIOS if burial_ratios is None
+                                else np.asarray(burial_ratios, dtype=np.float64))
+        key, spacing = borefield_shape_fingerprint(borefield)
+        if spacing == 0:
+            spacing_ratios = np.array([0.])
+
+        depth = GFunctionLibrary.REFERENCE_DEPTH
+        alpha = GFunctionLibrary.REFERENCE_ALPHA
+        time_values = depth ** 2 / (9 * alpha) * np.exp(self.log_time)
+        gvalues = np.zeros((spacing_ratios.size, burial_ratios.size, self.log_time.size))
+        for i, spacing_ratio in enumerate(spacing_ratios):
+            scale = spacing_ratio * depth / spacing if spacing > 0 else 0.
+            for j, burial_ratio in enumerate(burial_ratios):
+                scaled_borefield = [gt.boreholes.Borehole(depth, burial_ratio * depth, self.radius_ratio * depth,
+                                                          (borehole.x - borefield[0].x) * scale,
+                                                          (borehole.y - borefield[0].y) * scale,
+                                                          borehole.tilt, borehole.orientation)
+                                    for borehole in borefield]
+                gvalues[i, j] = gt.gfunction.gFunction(scaled_borefield, alpha, time_values, options=self.options,
+                                                       method=self.options["method"]).gFunc
+        self.shapes[key] = {"name": name, "spacing_ratios": spacing_ratios, "burial_ratios": burial_ratios,
+                            "gvalues": gvalues}
+
+    @staticmethod
+    def _weights(axis: np.ndarray, value: float) -> Union[List[Tuple[int, float]], None]:
+        """
+        This function returns the indices and weights for the linear interpolation along an axis of the grid.
+
+        Parameters
+        ----------
+        axis : np.ndarray
+            Sorted grid values
+        value : float
+            Value for which should be interpolated
+
+        Returns
+        -------
+        list or None
+            List with (index, weight) or None if the value is outside the grid
+        """
+        if axis.size == 1:
+            return [(0, 1.)] if np.isclose(axis[0], value, rtol=1e-6, atol=1e-12) else None
+        if not axis[0] <= value <= axis[-1]:
+            return None
+        idx = int(min(max(np.searchsorted(axis, value, side="right"), 1), axis.size - 1))
+        weight = (value - axis[idx - 1]) / (axis[idx] - axis[idx - 1])
+        return [(idx - 1, 1. - weight), (idx, weight)]
+
+    def gvalues(self, time_value: Union[list, float, np.ndarray], borefield: List[gt.boreholes.Borehole],
+                alpha: float, H: float = None, options: dict = None,
+                fingerprint: str = None) -> Union[np.ndarray, None]:
+        """
+        This function returns the g-values from the library, if the borefield is in it.
+
+        Parameters
+        ----------
+        time_value : list, float, np.ndarray
+            Time value(s) [s] for which the gvalues should be calculated
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model for which the gvalues should be calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        H : float
+            Depth [m]. If None, the depth of the first borehole is used.
+        options : dict
+            Options of the pygfunction gFunction class. If they differ from the options of the library,
+            the library is not used.
+        fingerprint : str
+            Fingerprint of the borefield geometry (see borefield_fingerprint), so the shape of the borefield only has
+            to be determined once. If None, the shape is determined every time.
+
+        Returns
+        -------
+        np.ndarray or None
+            1D array with the gvalues or None if the borefield, depth or time values are not in the library or when
+            the boreholes do not have the same depth, buried depth and radius
+        """
+        if not borefield or (options is not None and
+                             json.dumps(options, sort_keys=True, default=str) !=
+                             json.dumps(self.options, sort_keys=True, default=str)):
+            return None
+        if any(borehole.H != borefield[0].H or borehole.D != borefield[0].D or borehole.r_b != borefield[0].r_b
+               for borehole in borefield):
+            # the library only contains borefields with equal boreholes
+            return None
+        if fingerprint is None:
+            key, spacing = borefield_shape_fingerprint(borefield)
+        else:
+            if fingerprint not in self._shape_cache:
+                self._shape_cache[fingerprint] = borefield_shape_fingerprint(borefield)
+            key, spacing = self._shape_cache[fingerprint]
+        if key not in self.shapes:
+            return None
+        shape = self.shapes[key]
+
+        H = borefield[0].H if H is None else H
+        weights_spacing = self._weights(shape["spacing_ratios"], spacing / H)
+        weights_burial = self._weights(shape["burial_ratios"], borefield[0].D / H)
+        log_time = np.log(np.atleast_1d(np.asarray(time_value, dtype=np.float64)) * 9 * alpha / H ** 2)
+        if weights_spacing is None or weights_burial is None or \
+                np.min(log_time) < self.log_time[0] or np.max(log_time) > self.log_time[-1]:
+            return None
+
+        gvalues = sum(weight_spacing * weight_burial * np.interp(log_time, self.log_time, shape["gvalues"][i, j])
+                      for i, weight_spacing in weights_spacing for j, weight_burial in weights_burial)
+        # correction for the borehole radius
+        return gvalues - np.log(borefield[0].r_b / H / self.radius_ratio)
+
+    def save(self, path: str) -> None:
+        """
+        This function saves the library as a compressed .npz file.
+
+        Parameters
+        ----------
+        path : str
+            Location of the file
+
+        Returns
+        -------
+        None
+        """
+        keys = list(self.shapes)
+        index = {"version": GFunctionLibrary.VERSION, "options": self.options, "radius_ratio": self.radius_ratio,
+                 "shapes": [{"key": key, "name": self.shapes[key]["name"]} for key in keys]}
+        arrays = {}
+        for idx, key in enumerate(keys):
+            arrays[f"spacing_ratios_{idx}"] = self.shapes[key]["spacing_ratios"]
+            arrays[f"burial_ratios_{idx}"] = self.shapes[key]["burial_ratios"]
+            arrays[f"gvalues_{idx}"] = self.shapes[key]["gvalues"]
+        np.savez_compressed(path, index=json.dumps(index, default=str), log_time=self.log_time, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> GFunctionLibrary:
+        """
+        This function loads a library from a .npz file (see save).
+
+        Parameters
+        ----------
+        path : str
+            Location of the file
+
+        Returns
+        -------
+        GFunctionLibrary
+            Library
+
+        Raises
+        ------
+        ValueError
+            When the library is created with a newer, unsupported version
+        """
+        with np.load(path) as data:
+            index = json.loads(str(data["index"]))
+            if index["version"] > GFunctionLibrary.VERSION:
+                raise ValueError(f"The g-function library {path} has version {index['version']}, but only versions "
+                                 f"up to {GFunctionLibrary.VERSION} are supported. Please update GHEtool.")
+            library = cls(index["options"], index["radius_ratio"], data["log_time"])
+            for idx, shape in enumerate(index["shapes"]):
+                library.shapes[shape["key"]] = {"name": shape["name"],
+                                                "spacing_ratios": data[f"spacing_ratios_{idx}"],
+                                                "burial_ratios": data[f"burial_ratios_{idx}"],
+                                                "gvalues": data[f"gvalues_{idx}"]}
+        return library
+
+    @classmethod
+    def load_default(cls) -> GFunctionLibrary:
+        """
+        This function loads the library that is included in GHEtool. It contains the rectangular fields of up to
+        4 x 4 boreholes on the default grids of B/H and D/H. Larger libraries can be built with
+        build_standard_library.
+
+        Returns
+        -------
+        GFunctionLibrary
+            Library
+        """
+        return cls.load(GFunctionLibrary.DEFAULT_LIBRARY)
+
+
+def build_standard_library(sizes: Iterable[int] = range(1, 11), spacing_ratios: np.ndarray = None,
+                           burial_ratios: np.ndarray = None, options: dict = None) -> GFunctionLibrary:
+    """
+    This function builds a library with the standard borefield shapes of pygfunction (and the GUI):
+    rectangular, box-shaped, L-shaped and U-shaped fields of N1 x N2 boreholes with an equal spacing in both
+    directions, and circular fields of N boreholes, for all N1, N2 and N in sizes.
+    Depending on the sizes and the grids, this can take hours, so the library should be saved and reused.
+
+    Parameters
+    ----------
+    sizes : Iterable[int]
+        Number of boreholes in each direction (or on the circle)
+    spacing_ratios : np.ndarray
+        Grid of B/H
+    burial_ratios : np.ndarray
+        Grid of D/H
+    options : dict
+        Options (including the method) of the pygfunction gFunction class
+
+    Returns
+    -------
+    GFunctionLibrary
+        Library with the standard borefield shapes
+    """
+    library = GFunctionLibrary(options)
+    sizes = list(sizes)
+    shapes = {}
+    for n_1 in sizes:
+        for n_2 in sizes:
+            shapes[f"rectangle_field({n_1}, {n_2})"] = gt.boreholes.rectangle_field(n_1, n_2, 1, 1, 100, 1, 0.05)
+            if n_1 > 2 and n_2 > 2:
+                shapes[f"box_shaped_field({n_1}, {n_2})"] = gt.boreholes.box_shaped_field(n_1, n_2, 1, 1, 100, 1,
+                                                                                          0.05)
+                shapes[f"U_shaped_field({n_1}, {n_2})"] = gt.boreholes.U_shaped_field(n_1, n_2, 1, 1, 100, 1, 0.05)
+            if n_1 > 1 and n_2 > 1:
+                shapes[f"L_shaped_field({n_1}, {n_2})"] = gt.boreholes.L_shaped_field(n_1, n_2, 1, 1, 100, 1, 0.05)
+        if n_1 > 2:
+            shapes[f"circle_field({n_1})"] = gt.boreholes.circle_field(n_1, 1, 100, 1, 0.05)
+    for name, borefield in shapes.items():
+        # the same shape (e.g. a rectangular field of 1 x 2 boreholes and an L-shaped field) is only calculated once
+        if borefield_shape_fingerprint(borefield)[0] not in library.shapes:
+            library.add_shape(name, borefield, spacing_ratios, burial_ratios)
+    return library
@@ -0,0 +1,132 @@
+"""
+This file contains the LoadAggregation class, which is used to calculate the temperature response of a load
+with the load aggregation scheme of Claesson and Javed [#ClaessonJaved2012]_.
+
+References
+----------
+.. [#ClaessonJaved2012] Claesson, J., & Javed, S. (2012). A
+   load-aggregation method to calculate extraction temperatures of
+   borehole heat exchangers. ASHRAE Transactions, 118 (1): 530–539.
+"""
+import numpy as np
+import pygfunction as gt
+
+
+class LoadAggregation:
+    """
+    This class calculates the temporal superposition of a load with the g-function using the load aggregation scheme
+    of Claesson and Javed. The past loads are grouped in cells whose width grows with the time since the load was
+    applied, so the g-function is only needed at the boundaries of these cells (around 90 values for a simulation of 100
+    years with an hourly time step) instead of at every time step.
+    Since the whole load is known beforehand, the aggregated load of every cell is calculated for all time steps at
+    once based on the cumulative sum of the load, so the calculation time grows linearly with the simulation length.
+    """
+
+    def __init__(self, dt: float = 3600., cells_per_level: int = 5):
+        """
+
+        Parameters
+        ----------
+        dt : float
+            Time step of the load [s]
+        cells_per_level : int
+            Number of aggregation cells in every level of the aggregation scheme
+        """
+        self.dt: float = dt
+        self.cells_per_level: int = cells_per_level
+        self._number_of_time_steps: int = 0
+        self._cell_boundaries: np.ndarray = np.array([])
+
+    def _set_number_of_time_steps(self, number_of_time_steps: int) -> None:
+        """
+        This function calculates the boundaries of the aggregation cells (expressed as a number of time steps
+        before the current time step) so that the cells cover the given number of time steps.
+
+        Parameters
+        ----------
+        number_of_time_steps : int
+            Number of time steps in the simulation
+
+        Returns
+        -------
+        None
+        """
+        if number_of_time_steps == self._number_of_time_steps:
+            return
+        load_agg = gt.load_aggregation.ClaessonJaved(self.dt, number_of_time_steps * self.dt,
+                                                     cells_per_level=self.cells_per_level)
+        self._cell_boundaries = np.concatenate(([0], np.rint(load_agg.get_times_for_simulation() / self.dt)))\
+            .astype(np.int64)
+        self._number_of_time_steps = number_of_time_steps
+
+    def time_values(self, number_of_time_steps: int) -> np.ndarray:
+        """
+        This function returns the time values at which the g-function should be evaluated for a simulation with
+        a certain number of time steps. These are the outer boundaries of the aggregation cells.
+
+        Parameters
+        ----------
+        number_of_time_steps : int
+            Number of time steps in the simulation
+
+        Returns
+        -------
+        np.ndarray
+            Time values [s]
+        """
+        self._set_number_of_time_steps(number_of_time_steps)
+        return self._cell_boundaries[1:] * self.dt
+
+    def calculate(self, load: np.ndarray, g_values: np.ndarray) -> np.ndarray:
+        """
+        This function calculates the temporal superposition of the load with the g-values using the load aggregation
+        scheme. The result is an approximation of convolve(load, np.diff(g-values at every time step,
+        prepend=0))[:len(load)].
+
+        Parameters
+        ----------
+        load : np.ndarray
+            Load at every time step
+        g_values : np.ndarray
+            g-values at the time values of the aggregation cells (see time_values)
+
+        Returns
+        -------
+        np.ndarray
+            Temporal superposition of the load at every time step
+
+        Raises
+        ------
+        ValueError
+            When the number of g-values does not match the number of aggregation cells
+        """
+        load = np.asarray(load, dtype=np.float64)
+        number_of_time_steps = load.size
+        self._set_number_of_time_steps(number_of_time_steps)
+        if len(g_values) != self._cell_boundaries.size - 1:
+            raise ValueError(f"The number of g-values ({len(g_values)}) does not match the number of aggregation cells "
+                             f"({self._cell_boundaries.size - 1}).")
+
+        # g-value difference per time step within every cell
+        cell_widths = np.diff(self._cell_boundaries)
+        weights = np.diff(g_values, prepend=0) / cell_widths
+
+        # cumulative sum of the load, with zeros in front for the time before the start of the simulation
+        # the cell boundaries are limited to the number of time steps, since there is no load before the start
+        padding = number_of_time_steps
+        cell_boundaries = np.minimum(self._cell_boundaries, number_of_time_steps)
+        cumulative_load = np.zeros(padding + number_of_time_steps + 1)
+        np.cumsum(load, out=cumulative_load[padding + 1:])
+
+        # the load in the cell between a and b time steps before time step n, is the sum of the loads
+        # at time steps n - b + 1 up to n - a, which equals cumulative_load[n - a + 1] - cumulative_load[n - b + 1]
+        results = np.zeros(number_of_time_steps)
+        temp = np.empty(number_of_time_steps)
+        for start, end, weight in zip(cell_boundaries[:-1], cell_boundaries[1:], weights):
+            if start >= number_of_time_steps:
+                break
+            np.subtract(cumulative_load[padding - start + 1:padding - start + 1 + number_of_time_steps],
+                        cumulative_load[padding - end + 1:padding - end + 1 + number_of_time_steps], out=temp)
+            temp *= weight
+            results += temp
+        return results
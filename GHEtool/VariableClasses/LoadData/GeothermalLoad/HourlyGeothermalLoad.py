@@ -1,8 +1,13 @@
+import os
+import tempfile
+
 import numpy as np
 import pandas as pd
 
-from typing import Union, Tuple
+from typing import Callable, Union, Tuple
 from GHEtool.VariableClasses.LoadData._LoadData import _LoadData
+from GHEtool.VariableClasses.FFTConvolution import FFTConvolution
+from GHEtool.VariableClasses.LoadData.HourlyProfileReader import read_hourly_profile
 from GHEtool.logger import ghe_logger
 
 
@@ -18,6 +23,9 @@ class HourlyGeothermalLoad(_LoadData):
     START = pd.to_datetime("2019-01-01 00:00:00")
     END = pd.to_datetime("2019-12-31 23:59:00")
     HOURS_SERIES = pd.Series(pd.date_range(START, END, freq="1H"))
+    # index of the first hour of every month, for calendar months and for months of equal length
+    MONTH_START = np.cumsum([0, 744, 672, 744, 720, 744, 720, 744, 744, 720, 744, 720])
+    MONTH_START_EQUAL = np.arange(0, 8760, 730, dtype=np.int64)
 
     def __init__(self, heating_load: Union[np.ndarray, list, tuple] = np.zeros(8760),
                  cooling_load: Union[np.ndarray, list, tuple] = np.zeros(8760),
@@ -39,6 +47,13 @@ class HourlyGeothermalLoad(_LoadData):
 
         super().__init__(hourly_resolution=True, simulation_period=simulation_period)
 
+        # initiate convolution object with the spectrum of the hourly load
+        self._convolution: FFTConvolution = FFTConvolution()
+        self._convolution_key: tuple = ()
+
+        # initiate cache with the aggregated values (e.g. the monthly peaks and baseloads) of the hourly load
+        self._aggregates: dict = {}
+
         # initiate variables
         self._hourly_heating_load: np.ndarray = np.zeros(8760)
         self._hourly_cooling_load: np.ndarray = np.zeros(8760)
@@ -76,6 +91,34 @@ class HourlyGeothermalLoad(_LoadData):
             return False
         return True
 
+    @staticmethod
+    def _read_only_array(load: Union[np.ndarray, list, tuple]) -> np.ndarray:
+        """
+        This function returns the load as a private, read-only array, so the cached values that are calculated from
+        it (e.g. the monthly peaks and the spectrum of the load) cannot become outdated by changing it in place.
+        An array that is read-only, together with all the arrays it is a view of (e.g. a memory-mapped profile),
+        cannot be changed and is therefore not copied.
+
+        Parameters
+        ----------
+        load : np.ndarray, list or tuple
+            Hourly load [kWh/h]
+
+        Returns
+        -------
+        np.ndarray
+            Read-only array with the load
+        """
+        if isinstance(load, np.ndarray) and load.dtype == np.float64:
+            base = load
+            while isinstance(base, np.ndarray) and not base.flags.writeable:
+                base = base.base
+            if not isinstance(base, np.ndarray):
+                return load
+        load = np.array(load, dtype=np.float64)
+        load.flags.writeable = False
+        return load
+
     @property
     def hourly_heating_load(self) -> np.ndarray:
         """
@@ -109,7 +152,9 @@ class HourlyGeothermalLoad(_LoadData):
             values
         """
         if self._check_input(load):
-            self._hourly_heating_load = load
+            self._hourly_heating_load = self._read_only_array(load)
+            self._convolution.clear()
+            self._aggregates.clear()
             return
         raise ValueError
 
@@ -167,7 +212,9 @@ class HourlyGeothermalLoad(_LoadData):
             values
         """
         if self._check_input(load):
-            self._hourly_cooling_load = load
+            self._hourly_cooling_load = self._read_only_array(load)
+            self._convolution.clear()
+            self._aggregates.clear()
             return
         raise ValueError
 
@@ -207,26 +254,71 @@ class HourlyGeothermalLoad(_LoadData):
     def resample_to_monthly(self, hourly_load: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         This function resamples an hourly_load to monthly peaks (kW/month) and baseloads (kWh/month).
+        The months are either the calendar months of a non-leap year or, if all_months_equal is True,
+        twelve months of 730 hours.
 
         Parameters
         ----------
         hourly_load : np.ndarray
-            Hourly loads in kWh/h
+            Hourly loads in kWh/h (or a 2D-array with the hourly loads of one year per row)
 
         Returns
         -------
         peak loads [kW], monthly average loads [kWh/month] : np.ndarray, np.ndarray
+            Arrays with 12 values (per row)
         """
-        # create dataframe
-        df = pd.DataFrame(hourly_load, index=HourlyGeothermalLoad.HOURS_SERIES, columns=['load'])
+        hourly_load = np.asarray(hourly_load, dtype=np.float64)
+        month_start = self.MONTH_START_EQUAL if self.all_months_equal else self.MONTH_START
+        return np.maximum.reduceat(hourly_load, month_start, axis=-1), \
+            np.add.reduceat(hourly_load, month_start, axis=-1)
 
-        if self.all_months_equal:
-            return np.max(np.array_split(hourly_load, 12), axis=1), np.sum(np.array_split(hourly_load, 12), axis=1)
+    def _cached(self, name: tuple, key: tuple, calculate: Callable) -> Union[np.ndarray, Tuple[np.ndarray, ...]]:
+        """
+        This function returns an aggregated value of the hourly load from the cache. It is (re)calculated when it is
+        not in the cache or when it was calculated with another key. The cache is cleared when the hourly load is set.
 
-        # resample
-        return np.array(df.resample('M').agg({'load': 'max'})['load']),\
-            np.array(df.resample('M').agg({'load': 'sum'})['load'])
+        Parameters
+        ----------
+        name : tuple
+            Name of the aggregated value
+        key : tuple
+            Parameters (other than the hourly load) on which the value depends
+        calculate : Callable
+            Function without arguments that calculates the value (an array or a tuple of arrays)
 
+        Returns
+        -------
+        np.ndarray or tuple of np.ndarray
+            Read-only array(s)
+        """
+        # objects created by from_dict do not run __init__
+        cache = self.__dict__.setdefault('_aggregates', {})
+        if name not in cache or cache[name][0] != key:
+            value = calculate()
+            for array in value if isinstance(value, tuple) else (value,):
+                array.flags.writeable = False
+            cache[name] = (key, value)
+        return cache[name][1]
+
+    def _resample_hourly_load(self, heating: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function returns the monthly peaks (kW/month) and baseloads (kWh/month) of the hourly heating or
+        cooling load. These are only resampled once and reused until the hourly load is set again, or the domestic
+        hot water or the month definition changes.
+
+        Parameters
+        ----------
+        heating : bool
+            True if the heating load should be resampled, False for the cooling load
+
+        Returns
+        -------
+        peak loads [kW], monthly average loads [kWh/month] : np.ndarray, np.ndarray
+            Read-only arrays
+        """
+        return self._cached(("monthly", heating), (self.all_months_equal, self.dhw, self.simulation_period),
+                            lambda: self.resample_to_monthly(self.hourly_heating_load if heating
+                                                             else self.hourly_cooling_load))
 
     @property
     def baseload_cooling(self) -> np.ndarray:
@@ -238,7 +330,7 @@ class HourlyGeothermalLoad(_LoadData):
         baseload cooling : np.ndarray
             Baseload cooling values [kWh/month] for one year, so the length of the array is 12
         """
-        return self.resample_to_monthly(self.hourly_cooling_load)[1]
+        return self._resample_hourly_load(False)[1]
 
     @property
     def baseload_heating(self) -> np.ndarray:
@@ -250,7 +342,7 @@ class HourlyGeothermalLoad(_LoadData):
         baseload heating : np.ndarray
             Baseload heating values [kWh/month] for one year, so the length of the array is 12
         """
-        return self.resample_to_monthly(self.hourly_heating_load)[1]
+        return self._resample_hourly_load(True)[1]
 
     @property
     def peak_cooling(self) -> np.ndarray:
@@ -262,7 +354,7 @@ class HourlyGeothermalLoad(_LoadData):
         peak cooling : np.ndarray
             Peak cooling values for one year, so the length of the array is 12
         """
-        return self.resample_to_monthly(self.hourly_cooling_load)[0]
+        return self._resample_hourly_load(False)[0]
 
     @property
     def peak_heating(self) -> np.ndarray:
@@ -274,7 +366,44 @@ class HourlyGeothermalLoad(_LoadData):
         peak heating : np.ndarray
             Peak heating values for one year, so the length of the array is 12
         """
-        return self.resample_to_monthly(self.hourly_heating_load)[0]
+        return self._resample_hourly_load(True)[0]
+
+    @property
+    def hourly_cooling_load_per_year(self) -> np.ndarray:
+        """
+        This function returns the hourly cooling in kWh/h for every year of the simulation period.
+
+        Returns
+        -------
+        hourly cooling : np.ndarray
+            Read-only array with shape (simulation period, 8760)
+        """
+        return self._periodic(self.hourly_cooling_load)
+
+    @property
+    def hourly_heating_load_per_year(self) -> np.ndarray:
+        """
+        This function returns the hourly heating in kWh/h for every year of the simulation period.
+
+        Returns
+        -------
+        hourly heating : np.ndarray
+            Read-only array with shape (simulation period, 8760)
+        """
+        return self._periodic(self.hourly_heating_load)
+
+    @property
+    def hourly_load_per_year(self) -> np.ndarray:
+        """
+        This function calculates the resulting hourly load in kW for every year of the simulation period.
+        The load of one year is only calculated once and is not copied for every year.
+
+        Returns
+        -------
+        resulting hourly load : np.ndarray
+            Read-only array with shape (simulation period, 8760)
+        """
+        return self._periodic(self.hourly_cooling_load - self.hourly_heating_load)
 
     @property
     def hourly_cooling_load_simulation_period(self) -> np.ndarray:
@@ -286,7 +415,7 @@ class HourlyGeothermalLoad(_LoadData):
         hourly cooling : np.ndarray
             hourly cooling for the whole simulation period
         """
-        return np.tile(self.hourly_cooling_load, self.simulation_period)
+        return self.hourly_cooling_load_per_year.ravel()
 
     @property
     def hourly_load_simulation_period(self) -> np.ndarray:
@@ -297,7 +426,7 @@ class HourlyGeothermalLoad(_LoadData):
         -------
         resulting hourly load : np.ndarray
         """
-        return self.hourly_cooling_load_simulation_period - self.hourly_heating_load_simulation_period
+        return self.hourly_load_per_year.ravel()
 
     @property
     def hourly_heating_load_simulation_period(self) -> np.ndarray:
@@ -309,12 +438,38 @@ class HourlyGeothermalLoad(_LoadData):
         hourly heating : np.ndarray
             hourly heating for the whole simulation period
         """
-        return np.tile(self.hourly_heating_load, self.simulation_period)
+        return self.hourly_heating_load_per_year.ravel()
+
+    def convolve_hourly_load(self, g_value_differences: np.ndarray) -> np.ndarray:
+        """
+        This function convolves the resulting hourly load [W] over the whole simulation period with the given
+        g-value differences. The spectrum of the hourly load is calculated only once and reused until the load,
+        the simulation period or the domestic hot water changes, so that only the g-values have to be transformed
+        in every sizing iteration.
+
+        Parameters
+        ----------
+        g_value_differences : np.ndarray
+            Differences of the g-values over the whole simulation period (or a 2D-array with one row per depth)
+
+        Returns
+        -------
+        np.ndarray
+            Convolution of the hourly load [W] with the g-value differences, with the length of the simulation period
+        """
+        key = (self.simulation_period, self.dhw)
+        if not self._convolution.is_set or self._convolution_key != key:
+            self._convolution.set_signal(self.hourly_load_simulation_period * 1000)
+            self._convolution_key = key
+        return self._convolution.convolve(g_value_differences)
 
     def load_hourly_profile(self, file_path: str, header: bool = True, separator: str = ";",
-                            decimal_seperator: str = ".", col_heating: int = 0, col_cooling: int = 1) -> None:
+                            decimal_seperator: str = ".", col_heating: int = 0, col_cooling: int = 1,
+                            cache: bool = True) -> None:
         """
         This function loads in an hourly load profile [kW].
+        The profile can be a csv-file, or a .npy or .npz-file (e.g. created with save_hourly_profile) with one column
+        per load. Csv-files are parsed in chunks, .npy-files are memory-mapped.
 
         Parameters
         ----------
@@ -330,29 +485,53 @@ class HourlyGeothermalLoad(_LoadData):
             Column index for heating
         col_cooling : int
             Column index for cooling
+        cache : bool
+            True if the parsed file can be reused when it is loaded again and has not changed in the meantime
 
         Returns
         -------
         None
         """
-        if header:
-            header: int = 0
-        else:
-            header = None
-
         # TODO implement single column
         # if col_heating == col_cooling:
         #     ghe_logger.info('Only one column with data selected. Load will be splitted into heating and cooling load.')
 
         # import data
-        df = pd.read_csv(file_path, sep=separator, header=header, decimal=decimal_seperator)
+        heating, cooling = read_hourly_profile(str(file_path), header, separator, decimal_seperator,
+                                               (col_heating, col_cooling), cache)
 
         # set data
-        self.hourly_heating_load = np.array(df.iloc[:, col_heating])
-        self.hourly_cooling_load = np.array(df.iloc[:, col_cooling])
+        self.hourly_heating_load = heating
+        self.hourly_cooling_load = cooling
 
         ghe_logger.info("Hourly profile loaded!")
 
+    def save_hourly_profile(self, file_path: str) -> None:
+        """
+        This function saves the hourly heating and cooling load [kW] (without DHW) as a .npy-file, with heating in
+        the first and cooling in the second column, so it can be loaded (memory-mapped) with load_hourly_profile.
+        The profile is written to a temporary file which then replaces the file, so loads that have memory-mapped
+        the previous version of the file keep their values.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the .npy-file
+
+        Returns
+        -------
+        None
+        """
+        file_path = str(file_path)
+        if not file_path.endswith(".npy"):
+            file_path += ".npy"
+        # store the columns contiguously, so a memory-mapped column is not strided
+        profile = np.asfortranarray(np.column_stack((self._hourly_heating_load, self._hourly_cooling_load)))
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(file_path)))
+        with os.fdopen(file_descriptor, "wb") as file:
+            np.save(file, profile)
+        os.replace(temp_path, file_path)
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, HourlyGeothermalLoad):
             return False
@@ -1,6 +1,6 @@
 import numpy as np
 
-from typing import Union
+from typing import Tuple, Union
 from GHEtool.logger import ghe_logger
 from GHEtool.VariableClasses.LoadData.GeothermalLoad.HourlyGeothermalLoad import HourlyGeothermalLoad
 
@@ -71,7 +71,8 @@ class HourlyGeothermalLoadMultiYear(HourlyGeothermalLoad):
         hourly heating : np.ndarray
             Hourly heating values [kWh/h] for one year, so the length of the array is 8760
         """
-        return np.mean(self._hourly_heating_load.reshape((self.simulation_period, 8760)), axis=0)
+        return self._cached(("yearly mean", True), (self.simulation_period,),
+                            lambda: np.mean(self.hourly_heating_load_per_year, axis=0))
 
     @hourly_heating_load.setter
     def hourly_heating_load(self, load: Union[np.ndarray, list, tuple]) -> None:
@@ -94,8 +95,10 @@ class HourlyGeothermalLoadMultiYear(HourlyGeothermalLoad):
             values
         """
         if self._check_input(load):
-            self._hourly_heating_load = load
+            self._hourly_heating_load = self._read_only_array(load)
             self.simulation_period = int(len(load) / 8760)
+            self._convolution.clear()
+            self._aggregates.clear()
             return
         raise ValueError
 
@@ -110,7 +113,8 @@ class HourlyGeothermalLoadMultiYear(HourlyGeothermalLoad):
         hourly cooling : np.ndarray
             Hourly cooling values [kWh/h] for one year, so the length of the array is 8760
         """
-        return np.mean(self._hourly_cooling_load.reshape((self.simulation_period, 8760)), axis=0)
+        return self._cached(("yearly mean", False), (self.simulation_period,),
+                            lambda: np.mean(self.hourly_cooling_load_per_year, axis=0))
 
     @hourly_cooling_load.setter
     def hourly_cooling_load(self, load: Union[np.ndarray, list, tuple]) -> None:
@@ -133,11 +137,170 @@ class HourlyGeothermalLoadMultiYear(HourlyGeothermalLoad):
             values
         """
         if self._check_input(load):
-            self._hourly_cooling_load = load
+            self._hourly_cooling_load = self._read_only_array(load)
             self.simulation_period = int(len(load) / 8760)
+            self._convolution.clear()
+            self._aggregates.clear()
             return
         raise ValueError
 
+    @property
+    def hourly_cooling_load_per_year(self) -> np.ndarray:
+        """
+        This function returns the hourly cooling in kWh/h for every year of the simulation period.
+
+        Returns
+        -------
+        hourly cooling : np.ndarray
+            Read-only array with shape (simulation period, 8760)
+        """
+        return self._per_year_view(self._hourly_cooling_load)
+
+    @property
+    def hourly_heating_load_per_year(self) -> np.ndarray:
+        """
+        This function returns the hourly heating in kWh/h for every year of the simulation period.
+
+        Returns
+        -------
+        hourly heating : np.ndarray
+            Read-only array with shape (simulation period, 8760)
+        """
+        return self._per_year_view(self._hourly_heating_load)
+
+    @property
+    def hourly_load_per_year(self) -> np.ndarray:
+        """
+        This function calculates the resulting hourly load in kW for every year of the simulation period.
+
+        Returns
+        -------
+        resulting hourly load : np.ndarray
+            Array with shape (simulation period, 8760)
+        """
+        return self.hourly_cooling_load_per_year - self.hourly_heating_load_per_year
+
+    def _resample_per_year(self, heating: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function returns the monthly peaks (kW/month) and baseloads (kWh/month) of every year of the hourly
+        heating or cooling load. These are only resampled once and reused until the hourly load is set again or the
+        month definition changes.
+
+        Parameters
+        ----------
+        heating : bool
+            True if the heating load should be resampled, False for the cooling load
+
+        Returns
+        -------
+        peak loads [kW], monthly average loads [kWh/month] : np.ndarray, np.ndarray
+            Read-only arrays with shape (simulation period, 12)
+        """
+        return self._cached(("monthly per year", heating), (self.all_months_equal, self.simulation_period),
+                            lambda: self.resample_to_monthly(self.hourly_heating_load_per_year if heating
+                                                             else self.hourly_cooling_load_per_year))
+
+    @property
+    def baseload_heating_per_year(self) -> np.ndarray:
+        """
+        This function returns the baseload heating in kWh/month for every year of the simulation period.
+
+        Returns
+        -------
+        baseload heating : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._resample_per_year(True)[1]
+
+    @property
+    def baseload_cooling_per_year(self) -> np.ndarray:
+        """
+        This function returns the baseload cooling in kWh/month for every year of the simulation period.
+
+        Returns
+        -------
+        baseload cooling : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._resample_per_year(False)[1]
+
+    @property
+    def peak_heating_per_year(self) -> np.ndarray:
+        """
+        This function returns the peak heating in kW/month for every year of the simulation period.
+
+        Returns
+        -------
+        peak heating : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._resample_per_year(True)[0]
+
+    @property
+    def peak_cooling_per_year(self) -> np.ndarray:
+        """
+        This function returns the peak cooling in kW/month for every year of the simulation period.
+
+        Returns
+        -------
+        peak cooling : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._resample_per_year(False)[0]
+
+    @property
+    def baseload_heating_power_per_year(self) -> np.ndarray:
+        """
+        This function returns the average heating power in kW avg/month for every year of the simulation period.
+
+        Returns
+        -------
+        average heating power : np.ndarray
+            Array with shape (simulation period, 12)
+        """
+        return np.divide(self.baseload_heating_per_year, self.UPM)
+
+    @property
+    def baseload_cooling_power_per_year(self) -> np.ndarray:
+        """
+        This function returns the average cooling power in kW avg/month for every year of the simulation period.
+
+        Returns
+        -------
+        average cooling power : np.ndarray
+            Array with shape (simulation period, 12)
+        """
+        return np.divide(self.baseload_cooling_per_year, self.UPM)
+
+    @property
+    def monthly_average_load_per_year(self) -> np.ndarray:
+        """
+        This function calculates the average monthly load in kW for every year of the simulation period.
+
+        Returns
+        -------
+        monthly average load : np.ndarray
+            Array with shape (simulation period, 12)
+        """
+        return self.baseload_cooling_power_per_year - self.baseload_heating_power_per_year
+
+    def _per_year_view(self, load: np.ndarray) -> np.ndarray:
+        """
+        This function reshapes a load for the whole simulation period to one row per year, without copying it.
+
+        Parameters
+        ----------
+        load : np.ndarray
+            Load for the whole simulation period
+
+        Returns
+        -------
+        np.ndarray
+            Read-only view with shape (simulation period, 8760)
+        """
+        view = np.asarray(load).reshape((self.simulation_period, 8760))
+        view.flags.writeable = False
+        return view
 
     @property
     def hourly_cooling_load_simulation_period(self) -> np.ndarray:
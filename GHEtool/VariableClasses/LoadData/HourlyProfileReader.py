@@ -0,0 +1,172 @@
+"""
+This file contains the readers for hourly load profiles. Profiles can be read from a .npy-file (memory-mapped),
+a .npz-file or a csv-file. Csv-files are parsed in chunks, which are written directly into preallocated arrays,
+so the file is never held in memory as a whole. Every parsed file can be cached, based on its path, its inode,
+its modification time and its size, so reading the same file again does not parse it another time.
+"""
+import os
+from itertools import islice
+from typing import Tuple
+
+import numpy as np
+
+from GHEtool.logger import ghe_logger
+
+# number of lines that are parsed at once in a csv-file
+CHUNK_SIZE: int = 8760
+# maximum number of parsed files that are kept in the cache
+MAX_CACHE_SIZE: int = 16
+
+_profile_cache: dict = {}
+
+
+def clear_hourly_profile_cache() -> None:
+    """
+    This function clears the cache with the parsed hourly profiles.
+
+    Returns
+    -------
+    None
+    """
+    _profile_cache.clear()
+
+
+def _read_binary(file_path: str, columns: Tuple[int, ...]) -> Tuple[np.ndarray, ...]:
+    """
+    This function reads the columns of a profile that is stored as a .npy or .npz-file.
+    A .npy-file is memory-mapped, so only the values that are used, are read from the disk. Therefore, a .npy-file
+    that is in use should be replaced by a new file (as save_hourly_profile does) and not be overwritten in place.
+    A .npz-file cannot be memory-mapped, so its (first) array is read in memory.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the .npy or .npz-file
+    columns : tuple
+        Column indices that should be returned
+
+    Returns
+    -------
+    tuple of np.ndarray
+        One array per column
+
+    Raises
+    ------
+    ValueError
+        When the file does not contain an array with one or two dimensions
+    """
+    if file_path.lower().endswith(".npz"):
+        with np.load(file_path) as data:
+            profile = data[data.files[0]]
+    else:
+        profile = np.load(file_path, mmap_mode="r")
+    if profile.ndim == 1:
+        profile = profile[:, np.newaxis]
+    if profile.ndim != 2:
+        raise ValueError(f"The hourly profile should be a 1D or 2D-array instead of a {profile.ndim}D-array.")
+    return tuple(profile[:, column] for column in columns)
+
+
+def _read_csv(file_path: str, header: bool, separator: str, decimal_seperator: str,
+              columns: Tuple[int, ...]) -> Tuple[np.ndarray, ...]:
+    """
+    This function reads the columns of a csv-file in chunks of CHUNK_SIZE lines.
+    The values are written in preallocated arrays (one row per column), which are only enlarged when the file
+    contains more than a year of data.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the csv-file
+    header : bool
+        True if this file contains a header row
+    separator : str
+        Symbol used in the file to separate the columns
+    decimal_seperator : str
+        Symbol used for the decimal number separation
+    columns : tuple
+        Column indices that should be returned
+
+    Returns
+    -------
+    tuple of np.ndarray
+        One array per column
+    """
+    unique_columns = tuple(sorted(set(columns)))
+    data = np.empty((len(unique_columns), 8760))
+    rows = 0
+    with open(file_path, encoding="utf-8-sig") as file:
+        if header:
+            next(file, None)
+        while True:
+            lines = list(islice(file, CHUNK_SIZE))
+            if not lines:
+                break
+            if decimal_seperator != ".":
+                lines = [line.replace(decimal_seperator, ".") for line in lines]
+            chunk = np.loadtxt(lines, delimiter=separator, usecols=unique_columns, ndmin=2)
+            if rows + len(chunk) > data.shape[1]:
+                # double the size of the arrays
+                enlarged = np.empty((len(unique_columns), max(2 * data.shape[1], rows + len(chunk))))
+                enlarged[:, :rows] = data[:, :rows]
+                data = enlarged
+            data[:, rows:rows + len(chunk)] = chunk.T
+            rows += len(chunk)
+    return tuple(data[unique_columns.index(column), :rows] for column in columns)
+
+
+def read_hourly_profile(file_path: str, header: bool = True, separator: str = ";", decimal_seperator: str = ".",
+                        columns: Tuple[int, ...] = (0, 1), cache: bool = True) -> Tuple[np.ndarray, ...]:
+    """
+    This function reads the columns of an hourly load profile from a .npy, .npz or csv-file.
+    For binary files, the profile is the (first) array in the file, with one column per load.
+    When cache is True, the parsed columns are stored (as read-only arrays) together with the inode, the modification
+    time and the size of the file, so they are only read again when the file is changed or replaced.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the hourly load file
+    header : bool
+        True if this file contains a header row (only for csv-files)
+    separator : str
+        Symbol used in the file to separate the columns (only for csv-files)
+    decimal_seperator : str
+        Symbol used for the decimal number separation (only for csv-files)
+    columns : tuple
+        Column indices that should be returned
+    cache : bool
+        True if the parsed file should be taken from, or stored in, the cache
+
+    Returns
+    -------
+    tuple of np.ndarray
+        One array per column
+
+    Raises
+    ------
+    FileNotFoundError
+        When the file does not exist
+    """
+    file_path = os.path.abspath(file_path)
+    columns = tuple(int(column) for column in columns)
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_ino, stat.st_mtime_ns, stat.st_size, bool(header), separator, decimal_seperator,
+           columns)
+    if cache and key in _profile_cache:
+        ghe_logger.debug(f"The hourly profile {file_path} is taken from the cache.")
+        return _profile_cache[key]
+
+    if file_path.lower().endswith((".npy", ".npz")):
+        profile = _read_binary(file_path, columns)
+    else:
+        profile = _read_csv(file_path, header, separator, decimal_seperator, columns)
+
+    if cache:
+        for column in profile:
+            column.flags.writeable = False
+        if len(_profile_cache) >= MAX_CACHE_SIZE:
+            # remove the oldest entry
+            del _profile_cache[next(iter(_profile_cache))]
+        _profile_cache[key] = profile
+    return profile
@@ -5,6 +5,7 @@ from typing import Union
 import numpy as np
 
 from GHEtool.VariableClasses.BaseClass import BaseClass
+from GHEtool.VariableClasses.TimeGrids import hourly_time_values, monthly_time_values
 
 
 class _LoadData(BaseClass, ABC):
@@ -194,7 +195,7 @@ class _LoadData(BaseClass, ABC):
         baseload heating : np.ndarray
             baseload heating for the whole simulation period
         """
-        return np.tile(self.baseload_heating, self.simulation_period)
+        return self.baseload_heating_per_year.ravel()
 
     @property
     def baseload_cooling_simulation_period(self) -> np.ndarray:
@@ -206,7 +207,7 @@ class _LoadData(BaseClass, ABC):
         baseload cooling : np.ndarray
             baseload cooling for the whole simulation period
         """
-        return np.tile(self.baseload_cooling, self.simulation_period)
+        return self.baseload_cooling_per_year.ravel()
 
     @property
     def peak_heating_simulation_period(self) -> np.ndarray:
@@ -218,7 +219,7 @@ class _LoadData(BaseClass, ABC):
         peak heating : np.ndarray
             peak heating for the whole simulation period
         """
-        return np.tile(self.peak_heating, self.simulation_period)
+        return self.peak_heating_per_year.ravel()
 
     @property
     def peak_cooling_simulation_period(self) -> np.ndarray:
@@ -230,7 +231,7 @@ class _LoadData(BaseClass, ABC):
         peak cooling : np.ndarray
             peak cooling for the whole simulation period
         """
-        return np.tile(self.peak_cooling, self.simulation_period)
+        return self.peak_cooling_per_year.ravel()
 
     @property
     def baseload_heating_power_simulation_period(self) -> np.ndarray:
@@ -242,7 +243,7 @@ class _LoadData(BaseClass, ABC):
         average heating power : np.ndarray
             average heating power for the whole simulation period
         """
-        return np.tile(self.baseload_heating_power, self.simulation_period)
+        return self.baseload_heating_power_per_year.ravel()
 
     @property
     def baseload_cooling_power_simulation_period(self) -> np.ndarray:
@@ -254,7 +255,96 @@ class _LoadData(BaseClass, ABC):
         average cooling power : np.ndarray
             average cooling for the whole simulation period
         """
-        return np.tile(self.baseload_cooling_power, self.simulation_period)
+        return self.baseload_cooling_power_per_year.ravel()
+
+    def _periodic(self, values: np.ndarray) -> np.ndarray:
+        """
+        This function repeats the values of one year for every year of the simulation period, without copying them.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Values for one year
+
+        Returns
+        -------
+        np.ndarray
+            Read-only view with shape (simulation period, length of values)
+        """
+        values = np.asarray(values)
+        return np.broadcast_to(values, (self.simulation_period, values.size))
+
+    @property
+    def baseload_heating_per_year(self) -> np.ndarray:
+        """
+        This function returns the baseload heating in kWh/month for every year of the simulation period.
+
+        Returns
+        -------
+        baseload heating : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._periodic(self.baseload_heating)
+
+    @property
+    def baseload_cooling_per_year(self) -> np.ndarray:
+        """
+        This function returns the baseload cooling in kWh/month for every year of the simulation period.
+
+        Returns
+        -------
+        baseload cooling : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._periodic(self.baseload_cooling)
+
+    @property
+    def peak_heating_per_year(self) -> np.ndarray:
+        """
+        This function returns the peak heating in kW/month for every year of the simulation period.
+
+        Returns
+        -------
+        peak heating : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._periodic(self.peak_heating)
+
+    @property
+    def peak_cooling_per_year(self) -> np.ndarray:
+        """
+        This function returns the peak cooling in kW/month for every year of the simulation period.
+
+        Returns
+        -------
+        peak cooling : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._periodic(self.peak_cooling)
+
+    @property
+    def baseload_heating_power_per_year(self) -> np.ndarray:
+        """
+        This function returns the average heating power in kW avg/month for every year of the simulation period.
+
+        Returns
+        -------
+        average heating power : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._periodic(self.baseload_heating_power)
+
+    @property
+    def baseload_cooling_power_per_year(self) -> np.ndarray:
+        """
+        This function returns the average cooling power in kW avg/month for every year of the simulation period.
+
+        Returns
+        -------
+        average cooling power : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._periodic(self.baseload_cooling_power)
 
     @property
     def imbalance(self) -> float:
@@ -288,7 +378,19 @@ class _LoadData(BaseClass, ABC):
         -------
         monthly average load : np.ndarray
         """
-        return np.tile(self.monthly_average_load, self.simulation_period)
+        return self.monthly_average_load_per_year.ravel()
+
+    @property
+    def monthly_average_load_per_year(self) -> np.ndarray:
+        """
+        This function calculates the average monthly load in kW for every year of the simulation period.
+
+        Returns
+        -------
+        monthly average load : np.ndarray
+            Read-only array with shape (simulation period, 12)
+        """
+        return self._periodic(self.monthly_average_load)
 
     @property
     def peak_heating_duration(self) -> float:
@@ -389,11 +491,13 @@ class _LoadData(BaseClass, ABC):
         Time for L3 sizing, i.e. an array with monthly the cumulative seconds that have passed.
         [744, 1416 ...] * 3600
 
+        The array is shared (see TimeGrids) and therefore read-only.
+
         Returns
         -------
         Times for the L3 sizing : np.ndarray
         """
-        return np.cumsum(np.tile(self.UPM, self.simulation_period) * 3600)
+        return monthly_time_values(self.UPM, self.simulation_period)
 
     @property
     def time_L4(self) -> np.ndarray:
@@ -401,16 +505,13 @@ class _LoadData(BaseClass, ABC):
         Times for the L4 sizing, i.e. an array with hourly the cumulative seconds that have passed.
         [1, 2, 3, 4 ...] * 3600
 
+        The array is shared (see TimeGrids) and therefore read-only.
+
         Returns
         -------
         Times for the L4 sizing : np.ndarray
         """
-        # set the time constant for the L4 sizing
-        time_L4 = 3600 * np.arange(1, 8760 * self.simulation_period + 1, dtype=np.float16)
-        if np.isinf(time_L4).any():
-            # 16 bit is not enough, go to 32
-            time_L4 = 3600 * np.arange(1, 8760 * self.simulation_period + 1, dtype=np.float32)
-        return time_L4
+        return hourly_time_values(self.simulation_period)
 
     @staticmethod
     def get_month_index(peak_load, avg_load) -> int:
@@ -1,2 +1,3 @@
 from .GeothermalLoad import *
-from ._LoadData import _LoadData
\ No newline at end of file
+from ._LoadData import _LoadData
+from .HourlyProfileReader import read_hourly_profile, clear_hourly_profile_cache
\ No newline at end of file
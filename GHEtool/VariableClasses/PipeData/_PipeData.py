@@ -1,6 +1,11 @@
 import abc
+import copy
+
+import numpy as np
 import pygfunction as gt
 from abc import ABC
+from typing import Union
+
 from GHEtool.VariableClasses.BaseClass import BaseClass
 from GHEtool.VariableClasses.FluidData import FluidData
 
@@ -96,6 +101,90 @@ class _PipeData(BaseClass, ABC):
         None
         """
 
+    def effective_borehole_thermal_resistance(self, fluid_data: FluidData, k_s: float, r_b: float,
+                                              H: Union[float, np.ndarray],
+                                              mfr: Union[float, np.ndarray] = None) -> np.ndarray:
+        """
+        This function calculates the equivalent borehole thermal resistance for arrays of borehole depths and
+        mass flow rates at once.
+        The delta-circuit of thermal resistances (i.e. the multipole solution) does not depend on the borehole depth,
+        so it is only calculated once for every mass flow rate with the pipe model of pygfunction. Afterwards, the
+        fluid temperatures along the borehole (for a uniform borehole wall temperature) are solved for all the depths
+        at once, based on the eigenvalues of the system of differential equations of the pipe model.
+        The result is the same as the effective_borehole_thermal_resistance of the pipe model of pygfunction.
+
+        Parameters
+        ----------
+        fluid_data : FluidData
+            Fluid data
+        k_s : float
+            Ground thermal conductivity [W/mK]
+        r_b : float
+            Borehole radius [m]
+        H : float, np.ndarray
+            Borehole depth(s) [m]
+        mfr : float, np.ndarray
+            Mass flow rate(s) per borehole [kg/s]. If None, the mass flow rate of the fluid data is used.
+            The depths and the mass flow rates are broadcast against each other.
+
+        Returns
+        -------
+        np.ndarray
+            Equivalent borehole thermal resistances [mK/W] with the broadcast shape of H and mfr
+        """
+        H, mfr = np.broadcast_arrays(np.asarray(H, dtype=np.float64),
+                                     np.asarray(fluid_data.mfr if mfr is None else mfr, dtype=np.float64))
+        Rb = np.zeros(H.shape)
+        for flow in np.unique(mfr):
+            mask = mfr == flow
+            # the resistances are calculated on a copy, so the pipe data itself is not changed
+            fluid = FluidData(flow, fluid_data.k_f, fluid_data.rho, fluid_data.Cp, fluid_data.mu)
+            pipe_data = copy.copy(self)
+            pipe_data.calculate_resistances(fluid)
+            model = pipe_data.pipe_model(fluid, k_s, gt.boreholes.Borehole(1., 0., r_b, 0., 0.))
+            a_out = _PipeData._outlet_temperature_coefficient(model._Rd, flow / model.nPipes * fluid.Cp, H[mask])
+            Rb[mask] = H[mask] / (2 * flow * fluid.Cp) * (1 + a_out) / (1 - a_out)
+        return Rb
+
+    @staticmethod
+    def _outlet_temperature_coefficient(Rd: np.ndarray, capacity_flow: float, H: np.ndarray) -> np.ndarray:
+        """
+        This function calculates the coefficient a_out of the outlet fluid temperature
+        T_f,out - T_b = a_out (T_f,in - T_b) for a uniform borehole wall temperature T_b and the pipes in parallel,
+        for all the depths at once.
+
+        Parameters
+        ----------
+        Rd : np.ndarray
+            Delta-circuit of thermal resistances [mK/W], with first the downward and then the upward flowing pipes
+        capacity_flow : float
+            Heat capacity flow rate per pipe [W/K]
+        H : np.ndarray
+            Borehole depths [m]
+
+        Returns
+        -------
+        np.ndarray
+            Coefficients of the outlet fluid temperature
+        """
+        n_pipes = Rd.shape[0] // 2
+        # coefficient matrix of the differential equations dT_f/dz = A (T_f - T_b)
+        with np.errstate(divide="ignore"):
+            conductances = 1. / Rd
+        A = conductances.copy()
+        np.fill_diagonal(A, -np.sum(conductances, axis=1))
+        A[n_pipes:] = -A[n_pipes:]
+        eigenvalues, eigenvectors = np.linalg.eig(A / capacity_flow)
+        # fluid temperatures at the bottom as a function of the fluid temperatures at the top
+        exponentials = np.exp(np.multiply.outer(H, eigenvalues))
+        M = np.real((eigenvectors * exponentials[:, np.newaxis, :]) @ np.linalg.inv(eigenvectors))
+        down, up = slice(0, n_pipes), slice(n_pipes, 2 * n_pipes)
+        # the downward pipes start at the inlet temperature and are connected to the upward pipes at the bottom
+        T_up = np.linalg.solve(M[:, down, up] - M[:, up, up],
+                               -np.sum(M[:, down, down] - M[:, up, down], axis=2)[..., np.newaxis])[..., 0]
+        # the outlet temperature is the mixing temperature of the upward pipes
+        return np.mean(T_up, axis=1)
+
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
@@ -54,3 +54,24 @@ class Results:
     @property
     def Tb(self) -> np.ndarray:
         return self._Tb
+
+
+class SizingStatistics:
+    """
+    Class which contains information about the convergence of the root finding in the sizing.
+    """
+    def __init__(self, iterations: int = 0, gfunction_evaluations: int = 0, residual: float = 0.):
+        """
+
+        Parameters
+        ----------
+        iterations : int
+            Number of iterations (i.e. evaluations of the temperature residual) needed to find the depth
+        gfunction_evaluations : int
+            Number of times the g-function was evaluated during the sizing
+        residual : float
+            Difference between the limiting fluid temperature and the temperature limit at the sized depth [K]
+        """
+        self.iterations: int = iterations
+        self.gfunction_evaluations: int = gfunction_evaluations
+        self.residual: float = residual
@@ -0,0 +1,117 @@
+"""
+This file contains the memoized time grids that are used throughout GHEtool (the time values of the load
+aggregation scheme of Claesson and Javed and the monthly and hourly time values of the simulation period).
+Every grid is only created once per set of parameters and is returned as a read-only array, so it can be shared
+safely between all the objects that need it. Use np.copy when a grid has to be modified.
+"""
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+import pygfunction as gt
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """
+    This function makes an array read-only.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Array
+
+    Returns
+    -------
+    np.ndarray
+        The same array, which can no longer be modified
+    """
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=32)
+def claesson_javed_time_values(dt: float = 3600., t_max: float = 100. * 8760 * 3600.) -> np.ndarray:
+    """
+    This function returns the time values of the load aggregation scheme of Claesson and Javed [#ClaessonJaved2012]_.
+
+    Parameters
+    ----------
+    dt : float
+        Time step [s]
+    t_max : float
+        Maximum time [s]
+
+    Returns
+    -------
+    np.ndarray
+        Read-only array with the time values [s]
+
+    References
+    ----------
+    .. [#ClaessonJaved2012] Claesson, J., & Javed, S. (2012). A
+       load-aggregation method to calculate extraction temperatures of
+       borehole heat exchangers. ASHRAE Transactions, 118 (1): 530–539.
+    """
+    return _read_only(np.asarray(gt.load_aggregation.ClaessonJaved(dt, t_max).get_times_for_simulation()))
+
+
+@lru_cache(maxsize=32)
+def _monthly_time_values(UPM: Tuple[float, ...], simulation_period: int) -> np.ndarray:
+    """
+    This function returns the cumulative time at the end of every month of the simulation period.
+
+    Parameters
+    ----------
+    UPM : tuple
+        Number of hours in every month of the year
+    simulation_period : int
+        Simulation period [years]
+
+    Returns
+    -------
+    np.ndarray
+        Read-only array with the time values [s]
+    """
+    return _read_only(np.cumsum(np.tile(np.array(UPM), simulation_period) * 3600))
+
+
+def monthly_time_values(UPM: np.ndarray, simulation_period: int) -> np.ndarray:
+    """
+    This function returns the cumulative time at the end of every month of the simulation period.
+    [744, 1416 ...] * 3600
+
+    Parameters
+    ----------
+    UPM : np.ndarray
+        Number of hours in every month of the year
+    simulation_period : int
+        Simulation period [years]
+
+    Returns
+    -------
+    np.ndarray
+        Read-only array with the time values [s]
+    """
+    return _monthly_time_values(tuple(np.asarray(UPM).tolist()), int(simulation_period))
+
+
+@lru_cache(maxsize=32)
+def hourly_time_values(simulation_period: int, dt: float = 3600.) -> np.ndarray:
+    """
+    This function returns the cumulative time at the end of every time step of the simulation period.
+    [1, 2, 3, 4 ...] * 3600
+
+    Parameters
+    ----------
+    simulation_period : int
+        Simulation period [years]
+    dt : float
+        Time step [s]
+
+    Returns
+    -------
+    np.ndarray
+        Read-only float32 array with the time values [s]
+    """
+    number_of_steps = int(round(8760 * 3600 * simulation_period / dt))
+    return _read_only(dt * np.arange(1, number_of_steps + 1, dtype=np.float32))
@@ -2,8 +2,16 @@ from .FluidData import FluidData
 from .GroundData import *
 from .LoadData import *
 from .PipeData import *
+from .TimeGrids import claesson_javed_time_values, monthly_time_values, hourly_time_values
+from .GFunctionInterpolator import GFunctionInterpolator
 from .CustomGFunction import CustomGFunction, load_custom_gfunction, _timeValues
+from .BorefieldFingerprint import borefield_fingerprint, borefield_shape_fingerprint
+from .DimensionlessGFunctionCache import DimensionlessGFunctionCache
+from .GFunctionDiskCache import GFunctionDiskCache
+from .GFunctionLibrary import GFunctionLibrary, build_standard_library
 from .GFunction import GFunction, FIFO
+from .FFTConvolution import FFTConvolution
+from .LoadAggregation import LoadAggregation
 from .CalculationSetup import CalculationSetup
 from .Borehole import Borehole
-from .Result import Results
+from .Result import Results, SizingStatistics
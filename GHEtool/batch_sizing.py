@@ -0,0 +1,229 @@
+"""
+This file contains the functions to size a batch of borefield scenarios on a pool of worker processes.
+"""
+from __future__ import annotations
+
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pygfunction as gt
+
+from GHEtool.main_class import Borefield
+from GHEtool.VariableClasses import Borehole, CalculationSetup, GFunction, borefield_fingerprint
+from GHEtool.VariableClasses.GroundData._GroundData import _GroundData
+from GHEtool.VariableClasses.LoadData import _LoadData
+
+# dtype of the array returned by size_batch
+SIZING_RESULT_DTYPE = np.dtype([("depth", np.float64),
+                                ("limiting_quadrant", np.int64),
+                                ("error", "U64"),
+                                ("message", "U256")])
+
+# maximum number of scenarios that are sized after each other by the same worker
+CHUNK_SIZE: int = 8
+# maximum number of g-function objects (i.e. borefield geometries) that are kept in a process
+MAX_GFUNCTION_CACHE_SIZE: int = 8
+
+# g-function objects of the worker process, one per borefield geometry
+_GFUNCTION_CACHE: Dict[str, GFunction] = {}
+
+
+class SizingScenario:
+    """
+    This class contains a lightweight description of a borefield that should be sized. It only contains the data
+    that is needed to build a Borefield object, so it can be sent to another process at a low cost.
+    """
+
+    def __init__(self, ground_data: _GroundData, load: _LoadData, borefield: List[gt.boreholes.Borehole],
+                 calculation_setup: CalculationSetup = None, borehole: Borehole = None,
+                 Tf_max: float = 16., Tf_min: float = 0.):
+        """
+
+        Parameters
+        ----------
+        ground_data : _GroundData
+            Ground data
+        load : _LoadData
+            Load data
+        borefield : list
+            List of pygfunction boreholes
+        calculation_setup : CalculationSetup
+            Calculation setup of the sizing. If None, the default setup is used.
+        borehole : Borehole
+            Borehole with the fluid and pipe data or a constant Rb* value. If None, the default borehole is used.
+        Tf_max : float
+            Maximum average fluid temperature [deg C]
+        Tf_min : float
+            Minimum average fluid temperature [deg C]
+        """
+        self.ground_data: _GroundData = ground_data
+        self.load: _LoadData = load
+        self.borefield: List[gt.boreholes.Borehole] = borefield
+        self.calculation_setup: CalculationSetup = calculation_setup
+        self.borehole: Borehole = borehole
+        self.Tf_max: float = Tf_max
+        self.Tf_min: float = Tf_min
+
+    @property
+    def geometry(self) -> str:
+        """
+        This function returns the fingerprint of the geometry of the borefield, which is used to send the scenarios
+        with the same geometry to the same worker. The depth of the boreholes is not part of the fingerprint, since it
+        changes during the sizing and the g-function cache can handle different depths.
+
+        Returns
+        -------
+        str
+            Fingerprint of the borefield geometry
+        """
+        return borefield_fingerprint(self.borefield)
+
+    def create_borefield(self) -> Borefield:
+        """
+        This function creates the Borefield object of this scenario.
+
+        Returns
+        -------
+        Borefield
+            Borefield object
+        """
+        borefield = Borefield(load=self.load)
+        borefield.ground_data = self.ground_data
+        # the depth of the boreholes is changed during the sizing, so the scenario itself is not modified
+        borefield.set_borefield(copy.deepcopy(self.borefield))
+        if self.borehole is not None:
+            borefield.borehole = self.borehole
+        borefield.set_max_avg_fluid_temperature(self.Tf_max)
+        borefield.set_min_avg_fluid_temperature(self.Tf_min)
+        if self.calculation_setup is not None:
+            borefield.calculation_setup(self.calculation_setup)
+        return borefield
+
+
+def _get_gfunction(geometry: str) -> GFunction:
+    """
+    This function returns the g-function object of a borefield geometry in the current process.
+    At most MAX_GFUNCTION_CACHE_SIZE objects are kept, so the oldest one is removed when a new geometry is added.
+
+    Parameters
+    ----------
+    geometry : str
+        Fingerprint of the borefield geometry
+
+    Returns
+    -------
+    GFunction
+        G-function object of this geometry
+    """
+    if geometry not in _GFUNCTION_CACHE and len(_GFUNCTION_CACHE) >= MAX_GFUNCTION_CACHE_SIZE:
+        # remove the oldest g-function object
+        del _GFUNCTION_CACHE[next(iter(_GFUNCTION_CACHE))]
+    return _GFUNCTION_CACHE.setdefault(geometry, GFunction())
+
+
+def _create_chunks(scenarios: List[SizingScenario]) -> List[List[Tuple[int, SizingScenario]]]:
+    """
+    This function divides the scenarios in chunks that can be sized by a single worker.
+    Every chunk only contains scenarios with the same borefield geometry and the same ground diffusivity, since the
+    stored g-values depend on both, and it contains at most CHUNK_SIZE scenarios, so a batch with a single geometry
+    is still divided over the workers.
+
+    Parameters
+    ----------
+    scenarios : list
+        List of SizingScenario objects
+
+    Returns
+    -------
+    list
+        List of chunks, each a list of (index, scenario) tuples, with the largest chunks first
+    """
+    groups: Dict[Tuple[str, float], List[Tuple[int, SizingScenario]]] = {}
+    for index, scenario in enumerate(scenarios):
+        groups.setdefault((scenario.geometry, scenario.ground_data.alpha), []).append((index, scenario))
+    chunks = [group[start:start + CHUNK_SIZE] for group in groups.values()
+              for start in range(0, len(group), CHUNK_SIZE)]
+    # the largest chunks are sized first, so they do not end up at the end of the queue
+    chunks.sort(key=len, reverse=True)
+    return chunks
+
+
+def _size_scenarios(scenarios: List[Tuple[int, SizingScenario]]) -> List[Tuple[int, tuple]]:
+    """
+    This function sizes a list of scenarios with the same borefield geometry in the current process.
+    The g-function object of this geometry is kept in the process, so the g-values that are calculated for one
+    scenario are reused for the next ones.
+
+    Parameters
+    ----------
+    scenarios : list
+        List of (index, scenario) tuples
+
+    Returns
+    -------
+    list
+        List of (index, result) tuples, where result is a record of SIZING_RESULT_DTYPE
+    """
+    results = []
+    for index, scenario in scenarios:
+        try:
+            borefield = scenario.create_borefield()
+            borefield.gfunction_calculation_object = _get_gfunction(scenario.geometry)
+            depth = borefield.size()
+            results.append((index, (depth, borefield.limiting_quadrant, "", "")))
+        except Exception as error:
+            results.append((index, (np.nan, 0, type(error).__name__, str(error))))
+    return results
+
+
+def size_batch(scenarios: List[SizingScenario], workers: int = None) -> np.ndarray:
+    """
+    This function sizes a batch of scenarios on a pool of worker processes.
+    The scenarios are divided in chunks (see _create_chunks) with the same borefield geometry and ground diffusivity,
+    which are sent to the same worker, so every worker can reuse its g-function cache.
+    Scenarios that cannot be sized (e.g. due to UnsolvableDueToTemperatureGradient) do not stop the batch,
+    but their error is stored in the result.
+
+    Parameters
+    ----------
+    scenarios : list
+        List of SizingScenario objects
+    workers : int
+        Maximum number of worker processes. If None, the number of processors on the machine is used.
+        If 1, or when there is only one chunk of scenarios, the scenarios are sized in the current process.
+
+    Returns
+    -------
+    np.ndarray
+        Structured array (see SIZING_RESULT_DTYPE) with, for every scenario in the same order, the depth [m] (nan when
+        the sizing failed), the limiting quadrant, the name of the error and the error message (empty strings when
+        the sizing succeeded)
+
+    Raises
+    ------
+    ValueError
+        When the number of workers is smaller than 1
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"The number of workers should be at least 1 and not {workers}.")
+
+    chunks = _create_chunks(scenarios)
+
+    results = np.zeros(len(scenarios), dtype=SIZING_RESULT_DTYPE)
+    if workers == 1 or len(chunks) <= 1:
+        try:
+            for chunk_result in map(_size_scenarios, chunks):
+                for index, result in chunk_result:
+                    results[index] = result
+        finally:
+            # the g-function objects are not kept in the current process after the batch
+            _GFUNCTION_CACHE.clear()
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_result in executor.map(_size_scenarios, chunks):
+            for index, result in chunk_result:
+                results[index] = result
+    return results
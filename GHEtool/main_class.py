@@ -7,17 +7,20 @@ import copy
 import warnings
 from math import pi
 from pathlib import Path
-from typing import Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Tuple
 import logging
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pygfunction as gt
+from scipy.optimize import brentq
 from scipy.signal import convolve
 from warnings import warn
 
-from GHEtool.VariableClasses import FluidData, Borehole, GroundConstantTemperature, Results
+from GHEtool.VariableClasses import FluidData, Borehole, GroundConstantTemperature, Results, SizingStatistics
 from GHEtool.VariableClasses import CustomGFunction, load_custom_gfunction, GFunction, CalculationSetup
+from GHEtool.VariableClasses import LoadAggregation, FFTConvolution, borefield_fingerprint, GFunctionLibrary
 from GHEtool.VariableClasses.LoadData import *
 from GHEtool.VariableClasses.LoadData import _LoadData
 from GHEtool.VariableClasses.PipeData import _PipeData
@@ -130,12 +133,20 @@ class Borefield(BaseClass):
 
         self.custom_gfunction: CustomGFunction = custom_gfunction
         self.gfunction_calculation_object: GFunction = GFunction()
+        # optional library with precalculated g-values of standard borefield shapes
+        self.gfunction_library: GFunctionLibrary = None
+        # load aggregation scheme for the hourly temperature calculation
+        self._load_aggregation: LoadAggregation = LoadAggregation()
 
         ## params w.r.t. pygfunction
         self.options_pygfunction: dict = {"method": "equivalent"}
 
         # initialize variables for temperature plotting
         self.results = Results()
+        # convergence information of the last bracketing sizing
+        self.sizing_statistics: SizingStatistics = None
+        # number of g-function evaluations
+        self._gfunction_evaluations: int = 0
 
         # initiate ground parameters
         self.H = 0.  # borehole depth m
@@ -176,6 +187,8 @@ class Borefield(BaseClass):
         self.cost_investment: list = Borefield.DEFAULT_INVESTMENT
 
         # set a custom borefield
+        # the fingerprint of the geometry is used to find the g-function data without comparing every borehole
+        self._borefield_fingerprint: str = ""
         self.borefield = borefield
 
         ghe_logger.main_info("Borefield object has been created.")
@@ -315,12 +328,16 @@ class Borefield(BaseClass):
         if borefield is None:
             del self.borefield
             return
+        fingerprint = borefield_fingerprint(borefield)
         self._borefield = borefield
         self._set_number_of_boreholes()
         self.D = borefield[0].D
         self.r_b = borefield[0].r_b
         self.H = borefield[0].H
-        self.gfunction_calculation_object.remove_previous_data()
+        if fingerprint != self._borefield_fingerprint:
+            # the data of the previous borefield is kept, so it can be reused when switching back to it
+            self.gfunction_calculation_object.store_previous_data()
+        self._borefield_fingerprint = fingerprint
 
     @borefield.deleter
     def borefield(self):
@@ -333,8 +350,9 @@ class Borefield(BaseClass):
         None
         """
         self._borefield = None
+        self._borefield_fingerprint = ""
         self._set_number_of_boreholes()
-        self.gfunction_calculation_object.remove_previous_data()
+        self.gfunction_calculation_object.store_previous_data()
         self.custom_gfunction = None
 
     def _update_borefield_depth(self, H: float = None) -> None:
@@ -362,6 +380,8 @@ class Borefield(BaseClass):
     def load_custom_gfunction(self, location: str) -> None:
         """
         This function loads the custom gfunction.
+        Both the binary dataset format (see CustomGFunction.save_custom_dataset), whose gvalues are memory-mapped,
+        and pickled datasets (see CustomGFunction.dump_custom_dataset) can be loaded.
 
         Parameters
         ----------
@@ -587,8 +607,8 @@ class Borefield(BaseClass):
         # new ground data implies that a new g-function should be loaded
         self.custom_gfunction = None
 
-        # the stored gfunction data should be deleted
-        self.gfunction_calculation_object.remove_previous_data()
+        # the gfunction data of the previous ground is stored, so it can be reused when switching back to it
+        self.gfunction_calculation_object.store_previous_data()
 
     def set_ground_parameters(self, data: _GroundData) -> None:
         """
@@ -652,6 +672,24 @@ class Borefield(BaseClass):
         """
         self.borehole.Rb = Rb
 
+    def set_Rb_curve(self, depths: list | np.ndarray) -> None:
+        """
+        This function calculates the equivalent borehole thermal resistance at the given depths, for the current
+        burial depth, borehole radius, ground thermal conductivity, pipe and fluid data.
+        When the Rb* is calculated dynamically, it is interpolated in this Rb*(H) curve for every depth in its
+        range (see Borehole.set_Rb_curve), so the sizing is (almost) as fast as with a constant Rb*.
+
+        Parameters
+        ----------
+        depths : list, np.ndarray
+            Borehole depths [m] at which Rb* is calculated
+
+        Returns
+        -------
+        None
+        """
+        self.borehole.set_Rb_curve(depths, self.D, self.r_b, self.ground_data.k_s)
+
     def set_max_avg_fluid_temperature(self, temp: float) -> None:
         """
         This functions sets the maximal average fluid temperature to temp.
@@ -758,6 +796,140 @@ class Borefield(BaseClass):
 
         return test_a_tol and test_rtol
 
+    def _find_depth(self, step: Callable[[], Tuple[float, float]]) -> float:
+        """
+        This function finds the depth of the borefield with the proportional update of the depth, as long as this
+        update converges, so the number of g-function evaluations is the same as without the bracketing sizing.
+        When the update stops converging (i.e. the change in depth does not decrease in two successive iterations,
+        as when the depth cycles between values), the root of the temperature residual (i.e. the difference between
+        the limiting fluid temperature and the temperature limit) is bracketed, starting from the depths that are
+        already evaluated, and Brent's method is used within this bracket.
+        The convergence information is stored in the sizing_statistics attribute.
+
+        Parameters
+        ----------
+        step : Callable
+            Function that returns, for the current depth (self.H), the new depth according to the proportional update
+            [m] and the temperature residual [K]. The latter is positive when the borefield is too shallow
+
+        Returns
+        -------
+        float
+            Required depth of the borefield [m]. This is negative when there is no positive depth that satisfies the
+            temperature limit
+
+        Raises
+        ------
+        MaximumNumberOfIterations
+            MaximumNumberOfIterations if the max number of iterations is crossed
+        """
+        max_nb_of_iterations = self._calculation_setup.max_nb_of_iterations
+        gfunction_evaluations = self._gfunction_evaluations
+        next_depths = {}
+        residuals = {}
+
+        def residual(depth: float) -> float:
+            if depth not in residuals:
+                if len(residuals) >= max_nb_of_iterations:
+                    raise MaximumNumberOfIterations(max_nb_of_iterations)
+                self.H = depth
+                next_depths[depth], residuals[depth] = step()
+            return residuals[depth]
+
+        def set_statistics(depth: float) -> None:
+            self.sizing_statistics = SizingStatistics(len(residuals),
+                                                      self._gfunction_evaluations - gfunction_evaluations,
+                                                      residuals.get(depth, 0.))
+
+        # the proportional update of the depth, as long as it converges
+        depth_a = self.H
+        previous_change = np.inf
+        not_decreasing = 0
+        while True:
+            residual(depth_a)
+            depth_b = next_depths[depth_a]
+            if depth_b < 0 or self._check_convergence(depth_b, depth_a, len(residuals) - 1):
+                # converged, or there is no solution with a positive depth
+                set_statistics(depth_a)
+                return depth_b
+            not_decreasing = not_decreasing + 1 if abs(depth_b - depth_a) >= previous_change else 0
+            if not_decreasing == 2:
+                break
+            previous_change = abs(depth_b - depth_a)
+            depth_a = depth_b
+
+        # use the evaluated depths that are closest to the root on both sides
+        too_shallow = [depth for depth in residuals if residuals[depth] > 0]
+        too_deep = [depth for depth in residuals if residuals[depth] < 0]
+        if too_shallow and too_deep:
+            depth_a, depth_b = max(too_shallow), min(too_deep)
+            residual_a, residual_b = residuals[depth_a], residuals[depth_b]
+        else:
+            # search for a bracket with secant steps, starting from the last proportional update
+            residual_a = residuals[depth_a]
+            while True:
+                if depth_b < 0:
+                    # there is no solution with a positive depth
+                    set_statistics(depth_a)
+                    return depth_b
+                residual_b = residual(depth_b)
+                if residual_b == 0 or np.sign(residual_a) != np.sign(residual_b):
+                    break
+                if next_depths[depth_b] < 0:
+                    # there is no solution with a positive depth
+                    set_statistics(depth_b)
+                    return next_depths[depth_b]
+                if residual_b != residual_a:
+                    depth_new = depth_b - residual_b * (depth_b - depth_a) / (residual_b - residual_a)
+                else:
+                    depth_new = next_depths[depth_b]
+                # the step should at least double, so the bracket is found within a limited number of iterations
+                if residual_b > 0:
+                    depth_new = max(depth_new, depth_b + 2 * abs(depth_b - depth_a))
+                else:
+                    depth_new = min(depth_new, depth_b - 2 * abs(depth_b - depth_a))
+                    if depth_new <= 0:
+                        depth_new = depth_b / 2
+                depth_a, residual_a = depth_b, residual_b
+                depth_b = depth_new
+
+        if residual_b != 0:
+            # Brent's method within the bracket
+            tolerances = [tol for tol in (self._calculation_setup.atol,
+                                          self._calculation_setup.rtol * min(depth_a, depth_b)
+                                          if self._calculation_setup.rtol else False) if tol]
+            depth_b = brentq(residual, min(depth_a, depth_b), max(depth_a, depth_b),
+                             xtol=min(tolerances) if tolerances else 2e-12, maxiter=max_nb_of_iterations)
+
+        if self.H != depth_b:
+            # make sure the results are calculated at the final depth
+            residuals.pop(depth_b, None)
+            residual(depth_b)
+        set_statistics(depth_b)
+        return depth_b
+
+    def _L2_step(self, next_depth: Callable[[], float]) -> Tuple[float, float]:
+        """
+        This function returns the new depth according to the proportional update of the L2 sizing and the
+        corresponding temperature residual, for the bracketing sizing.
+
+        Parameters
+        ----------
+        next_depth : Callable
+            Function that returns the new depth based on the current depth (self.H) [m]
+
+        Returns
+        -------
+        new depth, temperature residual : float, float
+            New depth [m] and the difference between the fluid temperature and the temperature limit [K],
+            which is positive when the borefield is too shallow
+        """
+        new_depth = next_depth()
+        # the temperature difference between the fluid and the ground at the current depth is
+        # H_new / H * abs(Tf - Tg), in the direction of the temperature limit
+        sign = 1 if self.Tf == self.Tf_max else -1
+        return new_depth, new_depth / self.H * abs(self.Tf - self._Tg()) - sign * (self.Tf - self._Tg())
+
     def _Ahmadfard(self, th: float, qh: float, qm: float, qa: float) -> float:
         """
         This function sizes the field based on the last year of operation, i.e. quadrants 2 and 4.
@@ -794,10 +966,8 @@ class Borefield(BaseClass):
         self.H = 50 if self.H < 1 else self.H
 
         time = np.array([th, th + self.load.tm, self.load.ty + self.load.tm + th])
-        # Iterates as long as there is no convergence
-        # (convergence if difference between depth in iterations is smaller than THRESHOLD_BOREHOLE_DEPTH)
-        i = 0
-        while not self._check_convergence(self.H, H_prev, i):
+
+        def next_depth() -> float:
             # calculate the required g-function values
             gfunct_uniform_T = self.gfunction(time, max(1, self.H))
             # calculate the thermal resistances
@@ -806,9 +976,19 @@ class Borefield(BaseClass):
             Rd = (gfunct_uniform_T[0]) / (2 * pi * self.ground_data.k_s)
             # calculate the total borehole length
             L = (qa * Ra + qm * Rm + qh * Rd + qh * self.Rb) / abs(self.Tf - self._Tg())
+            return L / self.number_of_boreholes
+
+        if self._calculation_setup.bracketing_sizing:
+            self.H = self._find_depth(lambda: self._L2_step(next_depth))
+            return self.H
+
+        # Iterates as long as there is no convergence
+        # (convergence if difference between depth in iterations is smaller than THRESHOLD_BOREHOLE_DEPTH)
+        i = 0
+        while not self._check_convergence(self.H, H_prev, i):
             # updating the depth values
             H_prev = self.H
-            self.H = L / self.number_of_boreholes
+            self.H = next_depth()
             i += 1
 
         return self.H
@@ -838,10 +1018,7 @@ class Borefield(BaseClass):
         if self.H < 1:
             self.H = 50
 
-        # Iterates as long as there is no convergence
-        # (convergence if difference between depth in iterations is smaller than THRESHOLD_BOREHOLE_DEPTH)
-        i = 0
-        while not self._check_convergence(self.H, H_prev, i):
+        def next_depth() -> float:
             # get the g-function values
             gfunc_uniform_T = self.gfunction(time_steps, max(1, self.H))
 
@@ -852,10 +1029,19 @@ class Borefield(BaseClass):
 
             # calculate the total length
             L = (qh * self.Rb + qh * Rh + qm * Rcm + qpm * Rpm) / abs(self.Tf - self._Tg())
+            return L / self.number_of_boreholes
+
+        if self._calculation_setup.bracketing_sizing:
+            self.H = self._find_depth(lambda: self._L2_step(next_depth))
+            return self.H
 
+        # Iterates as long as there is no convergence
+        # (convergence if difference between depth in iterations is smaller than THRESHOLD_BOREHOLE_DEPTH)
+        i = 0
+        while not self._check_convergence(self.H, H_prev, i):
             # updating the depth values
             H_prev = self.H
-            self.H = L / self.number_of_boreholes
+            self.H = next_depth()
             i += 1
         return self.H
 
@@ -1021,6 +1207,72 @@ class Borefield(BaseClass):
             return size_min_temp
         raise UnsolvableDueToTemperatureGradient
 
+    def _size_quadrants_concurrently(self, *size_quadrants: Callable[[Borefield], Any]) \
+            -> List[Tuple[Future, Borefield]]:
+        """
+        This function sizes multiple quadrants at the same time on a thread pool.
+        Every quadrant is sized on its own copy of the borefield object, so the depth, the temperatures and the
+        results are not shared between the quadrants. The pygfunction boreholes (whose depth is altered during the
+        sizing) and the Borehole object (with its cache of Rb* values) are copied for every quadrant as well.
+        Every quadrant has its own copy of the g-function calculation object (see GFunction._fork), so the
+        interpolation of the g-values does not depend on the other quadrants and the results are the same for every
+        run. Only the exactly calculated g-values are shared between these copies, and afterwards, the newly
+        calculated g-values are stored in the g-function calculation object of this borefield in the order of the
+        quadrants. The load, the ground data and the calculation setup are shared, since they are only read during
+        the sizing (the aggregates of an hourly load that are calculated when they are first needed, are stored in
+        a dict, which is safe between threads).
+
+        Parameters
+        ----------
+        size_quadrants : Callable
+            Functions that size a quadrant for the borefield object that is given as an argument
+
+        Returns
+        -------
+        List[Tuple[Future, Borefield]]
+            The future with the result of every sizing (so errors are only raised when the result is requested)
+            together with the borefield object on which the quadrant was sized
+        """
+        borefields = []
+        gfunction_calculation_objects = self.gfunction_calculation_object._fork(len(size_quadrants))
+        for gfunction_calculation_object in gfunction_calculation_objects:
+            borefield = copy.copy(self)
+            borefield._borefield = copy.deepcopy(self._borefield)
+            borefield.borehole = copy.deepcopy(self.borehole)
+            borefield.gfunction_calculation_object = gfunction_calculation_object
+            borefields.append(borefield)
+
+        with ThreadPoolExecutor(max_workers=len(size_quadrants)) as executor:
+            futures = [executor.submit(size_quadrant, borefield)
+                       for size_quadrant, borefield in zip(size_quadrants, borefields)]
+        self.gfunction_calculation_object._join(gfunction_calculation_objects)
+
+        # keep track of all the g-function evaluations
+        self._gfunction_evaluations += sum(borefield._gfunction_evaluations - self._gfunction_evaluations
+                                           for borefield in borefields)
+        return list(zip(futures, borefields))
+
+    def _set_sizing_state(self, borefield: Borefield) -> None:
+        """
+        This function copies the results of a sizing on another borefield object (see _size_quadrants_concurrently)
+        to the current borefield object.
+
+        Parameters
+        ----------
+        borefield : Borefield
+            Borefield object on which the sizing is performed
+
+        Returns
+        -------
+        None
+        """
+        if borefield is self:
+            return
+        self.H = borefield.H
+        self.Tf = borefield.Tf
+        self.results = borefield.results
+        self.sizing_statistics = borefield.sizing_statistics
+
     def size_L2(self, H_init: float = None, quadrant_sizing: int = 0) -> float:
         """
         This function sizes the  of the given configuration according to the methodology explained in
@@ -1054,25 +1306,28 @@ class Borefield(BaseClass):
         # initiate with a given depth
         self.H: float = H_init if H_init is not None else self._calculation_setup.H_init
 
-        def size_quadrant1():
-            th, _, tcm, qh, qpm, qm = self.load._calculate_first_year_params(False)  # calculate parameters
-            self.Tf = self.Tf_max
-            return self._Carcel(th, tcm, qh, qpm, qm)  # size
+        def size_quadrant1(borefield: Borefield = self) -> float:
+            th, _, tcm, qh, qpm, qm = borefield.load._calculate_first_year_params(False)  # calculate parameters
+            borefield.Tf = borefield.Tf_max
+            return borefield._Carcel(th, tcm, qh, qpm, qm)  # size
+
+        def size_quadrant2(borefield: Borefield = self) -> float:
+            th, qh, qm, qa = borefield.load._calculate_last_year_params(False)  # calculate parameters
+            borefield.Tf = borefield.Tf_max
+            return borefield._Ahmadfard(th, qh, qm, qa)  # size
 
-        def size_quadrant2():
-            th, qh, qm, qa = self.load._calculate_last_year_params(False)  # calculate parameters
-            self.Tf = self.Tf_max
-            return self._Ahmadfard(th, qh, qm, qa)  # size
+        def size_quadrant3(borefield: Borefield = self) -> float:
+            th, _, tcm, qh, qpm, qm = borefield.load._calculate_first_year_params(True)  # calculate parameters
+            borefield.Tf = borefield.Tf_min
+            return borefield._Carcel(th, tcm, qh, qpm, qm)  # size
 
-        def size_quadrant3():
-            th, _, tcm, qh, qpm, qm = self.load._calculate_first_year_params(True)  # calculate parameters
-            self.Tf = self.Tf_min
-            return self._Carcel(th, tcm, qh, qpm, qm)  # size
+        def size_quadrant4(borefield: Borefield = self) -> float:
+            th, qh, qm, qa = borefield.load._calculate_last_year_params(True)  # calculate parameters
+            borefield.Tf = borefield.Tf_min
+            return borefield._Ahmadfard(th, qh, qm, qa)  # size
 
-        def size_quadrant4():
-            th, qh, qm, qa = self.load._calculate_last_year_params(True)  # calculate parameters
-            self.Tf = self.Tf_min
-            return self._Ahmadfard(th, qh, qm, qa)  # size
+        def no_sizing(borefield: Borefield = self) -> float:
+            return 0
 
         if quadrant_sizing != 0:
             # size according to a specific quadrant
@@ -1090,32 +1345,29 @@ class Borefield(BaseClass):
             # determine which quadrants are relevant
             if self.load.imbalance <= 0:
                 # extraction dominated, so quadrants 1 and 4 are relevant
-                if self.load.max_peak_cooling != 0:
-                    quadrant1 = size_quadrant1()
-                else:
-                    quadrant1 = 0
-                quadrant4 = size_quadrant4()
-
-                self.H = self._select_size(quadrant1, quadrant4)
-
-                if quadrant1 == self.H:
-                    self.limiting_quadrant = 1
-                else:
-                    self.limiting_quadrant = 4
+                size_quadrants = (size_quadrant1 if self.load.max_peak_cooling != 0 else no_sizing, size_quadrant4)
+                limiting_quadrants = (1, 4)
             else:
                 # injection dominated, so quadrants 2 and 3 are relevant
-                quadrant2 = size_quadrant2()
-                if self.load.max_peak_heating != 0:
-                    quadrant3 = size_quadrant3()
-                else:
-                    quadrant3 = 0
+                size_quadrants = (size_quadrant2, size_quadrant3 if self.load.max_peak_heating != 0 else no_sizing)
+                limiting_quadrants = (2, 3)
 
-                self.H = self._select_size(quadrant2, quadrant3)
+            if self._calculation_setup.concurrent_sizing:
+                (future_a, borefield_a), (future_b, borefield_b) = self._size_quadrants_concurrently(*size_quadrants)
+                depth_a, depth_b = future_a.result(), future_b.result()
+            else:
+                depth_a = size_quadrants[0]()
+                depth_b = size_quadrants[1]()
+                borefield_a = borefield_b = self
 
-                if quadrant2 == self.H:
-                    self.limiting_quadrant = 2
-                else:
-                    self.limiting_quadrant = 3
+            self.H = self._select_size(depth_a, depth_b)
+
+            if depth_a == self.H:
+                self.limiting_quadrant = limiting_quadrants[0]
+                self._set_sizing_state(borefield_a)
+            else:
+                self.limiting_quadrant = limiting_quadrants[1]
+                self._set_sizing_state(borefield_b)
 
         return self.H
 
@@ -1157,14 +1409,26 @@ class Borefield(BaseClass):
             self.H, _ = self._size_based_on_temperature_profile(quadrant_sizing)
             return self.H
         else:
-            try:
-                max_temp, sized = self._size_based_on_temperature_profile(10, deep_sizing=self._calculation_setup.force_deep_sizing)
-            except MaximumNumberOfIterations as e:
-                # no convergence with normal method, but perhaps with deep_sizing enabled
-                if self._calculation_setup.deep_sizing and self.ground_data.variable_Tg:
-                    max_temp, sized = self._size_based_on_temperature_profile(10, deep_sizing=True)
-                else:
+            def size_max_temp(borefield: Borefield = self) -> Tuple[float, bool]:
+                try:
+                    return borefield._size_based_on_temperature_profile(
+                        10, deep_sizing=borefield._calculation_setup.force_deep_sizing)
+                except MaximumNumberOfIterations as e:
+                    # no convergence with normal method, but perhaps with deep_sizing enabled
+                    if borefield._calculation_setup.deep_sizing and borefield.ground_data.variable_Tg:
+                        return borefield._size_based_on_temperature_profile(10, deep_sizing=True)
                     raise e
+
+            def size_min_temp(borefield: Borefield = self) -> Tuple[float, bool]:
+                return borefield._size_based_on_temperature_profile(20)
+
+            if self._calculation_setup.concurrent_sizing:
+                (future_max, borefield_max), (future_min, borefield_min) = \
+                    self._size_quadrants_concurrently(size_max_temp, size_min_temp)
+                max_temp, sized = future_max.result()
+                self._set_sizing_state(borefield_max)
+            else:
+                max_temp, sized = size_max_temp()
             if sized:
                 # already correct size
                 self.H = max_temp
@@ -1173,7 +1437,11 @@ class Borefield(BaseClass):
                 else:
                     self.limiting_quadrant = 2
                 return max_temp
-            min_temp, sized = self._size_based_on_temperature_profile(20)
+            if self._calculation_setup.concurrent_sizing:
+                min_temp, sized = future_min.result()
+                self._set_sizing_state(borefield_min)
+            else:
+                min_temp, sized = size_min_temp()
             if sized:
                 self.H = min_temp
                 if self.load.imbalance <= 0:
@@ -1312,139 +1580,76 @@ class Borefield(BaseClass):
         if self.H < 1:
             self.H = 50
 
-        # define loads for sizing
-        # it only calculates the first and the last year, so the sizing is less computationally expensive
-        # loads_short = self.load.hourly_cooling_load - self.load.hourly_heating_load if hourly else self.load.monthly_average_load
-        # loads_short_rev = loads_short[::-1]
-        # loads_long = np.tile(loads_short, 2)
-        #
-        # # initialise the results array
-        # results = np.zeros(loads_short.size * 2)
-
         if deep_sizing:
             # set borefield to minimal depth
             self.H = 20
 
-        # Iterates as long as there is no convergence
-        # (convergence if difference between depth in iterations is smaller than THRESHOLD_BOREHOLE_DEPTH)
-        i = 0
-        while not self._check_convergence(self.H, H_prev, i):
-
-            if hourly:
-                # # calculate g-values
-                # g_values = self.gfunction(self.load.time_L4, self.H)
-                #
-                # # calculation of needed differences of the g-function values. These are the weight factors
-                # # in the calculation of Tb.
-                # g_value_differences = np.diff(g_values, prepend=0)
-                #
-                # # convolution to get the monthly results
-                # results[:8760] = convolve(loads_short * 1000, g_value_differences[:8760])[:8760]
-                #
-                # g_sum_n1 = g_value_differences[:8760 * (self.simulation_period - 1)].reshape(self.simulation_period - 1,
-                #                                                                              8760).sum(axis=0)
-                # g_sum = g_sum_n1 + g_value_differences[8760 * (self.simulation_period - 1):]
-                # g_sum_n2 = np.concatenate((np.array([0]), g_sum_n1[::-1]))[:-1]
-                #
-                # results[8760:] = convolve(loads_short * 1000, g_sum)[:8760] + convolve(loads_short_rev * 1000,
-                #                                                                        g_sum_n2)[:8760][::-1]
-                #
-                # # calculation the borehole wall temperature for every month i
-                # Tb = results / (2 * pi * self.ground_data.k_s) / (self.H * self.number_of_boreholes) + self._Tg(self.H)
-                #
-                # self.Tb = Tb
-                # # now the Tf will be calculated based on
-                # # Tf = Tb + Q * R_b
-                # temperature_result = Tb + loads_long * 1000 * (self.Rb / self.number_of_boreholes / self.H)
-                # # reset other variables
-                # self.results.peak_heating = temperature_result
-                # self.results.peak_cooling = temperature_result
-                self._calculate_temperature_profile(self.H, hourly=True)
+        # it only calculates the first and the last year, so the sizing is less computationally expensive
+        # this is only possible when the load is the same every year
+        first_and_last_year = self._calculation_setup.first_and_last_year_sizing and \
+            not isinstance(self.load, HourlyGeothermalLoadMultiYear)
 
+        def next_depth() -> float:
+            if first_and_last_year:
+                self._calculate_first_and_last_year_temperature_profile(self.H, hourly=hourly)
             else:
-                # # calculate g-values
-                # g_values = self.gfunction(self.load.time_L3, self.H)
-                #
-                # # the g-function value of the peak with length_peak hours
-                # g_value_peak_cooling = self.gfunction(self.load.peak_cooling_duration, self.H)[0]
-                # if self.load.peak_cooling_duration == self.load.peak_heating_duration:
-                #     g_value_peak_heating = g_value_peak_cooling
-                # else:
-                #     g_value_peak_heating = self.gfunction(self.load.peak_heating_duration, self.H)[0]
-                #
-                # # calculation of needed differences of the g-function values. These are the weight factors in
-                # # the calculation of Tb.
-                # g_value_differences = np.diff(g_values, prepend=0)
-                #
-                # # convolution to get the monthly results
-                # results[:12] = convolve(loads_short * 1000, g_value_differences[:12])[:12]
-                #
-                # g_sum_n1 = g_value_differences[:12 * (self.load.simulation_period - 1)]\
-                #     .reshape(self.load.simulation_period - 1, 12).sum(axis=0)
-                # g_sum = g_sum_n1 + g_value_differences[12 * (self.load.simulation_period - 1):]
-                # g_sum_n2 = np.concatenate((np.array([0]), g_sum_n1[::-1]))[:-1]
-                #
-                # results[12:] = convolve(loads_short * 1000, g_sum)[:12]\
-                #                + convolve(loads_short_rev * 1000, g_sum_n2)[:12][::-1]
-                #
-                # # calculation the borehole wall temperature for every month i
-                # Tb = results / (2 * pi * self.ground_data.k_s) / (self.H * self.number_of_boreholes) + self._Tg(self.H)
-                #
-                # self.Tb = Tb
-                # # now the Tf will be calculated based on
-                # # Tf = Tb + Q * R_b
-                # results_month_cooling = Tb + np.tile(self.load.baseload_cooling_power, 2) * 1000 \
-                #                         * (self.Rb / self.number_of_boreholes / self.H)
-                # results_month_heating = Tb - np.tile(self.load.baseload_heating_power, 2) * 1000 \
-                #                         * (self.Rb / self.number_of_boreholes / self.H)
-                #
-                # # extra summation if the g-function value for the peak is included
-                # results_peak_cooling = results_month_cooling +\
-                #                        np.tile(self.load.peak_cooling - self.load.baseload_cooling_power, 2) * 1000 *\
-                #                        (g_value_peak_cooling / self.ground_data.k_s / 2 / pi + self.Rb) / self.number_of_boreholes / self.H
-                # results_peak_heating = results_month_heating - np.tile(self.load.peak_heating - self.load.baseload_heating_power, 2) * 1000 \
-                #                        * (g_value_peak_heating / self.ground_data.k_s / 2 / pi + self.Rb)\
-                #                        / self.number_of_boreholes / self.H
-                #
-                # # save temperatures under variable
-                # self.results.peak_heating = results_peak_heating
-                # self.results.peak_cooling = results_peak_cooling
-                self._calculate_temperature_profile(self.H, hourly=False)
+                self._calculate_temperature_profile(self.H, hourly=hourly)
             H_prev = self.H
             if not deep_sizing:
                 if quadrant == 1:
                     # maximum temperature
                     # convert back to required length
-                    self.H = (np.max(self.results.peak_cooling[:8760 if hourly else 12]) - self._Tg()) / (self.Tf_max - self._Tg()) * H_prev
+                    return (np.max(self.results.peak_cooling[:8760 if hourly else 12]) - self._Tg()) / (self.Tf_max - self._Tg()) * H_prev
                 elif quadrant == 2:
                     # maximum temperature
                     # convert back to required length
-                    self.H = (np.max(self.results.peak_cooling[-8760 if hourly else -12:]) - self._Tg()) / (self.Tf_max - self._Tg()) * H_prev
+                    return (np.max(self.results.peak_cooling[-8760 if hourly else -12:]) - self._Tg()) / (self.Tf_max - self._Tg()) * H_prev
                 elif quadrant == 3:
                     # minimum temperature
                     # convert back to required length
-                    self.H = (np.min(self.results.peak_heating[:8760 if hourly else 12]) - self._Tg()) / (self.Tf_min - self._Tg()) * H_prev
+                    return (np.min(self.results.peak_heating[:8760 if hourly else 12]) - self._Tg()) / (self.Tf_min - self._Tg()) * H_prev
                 elif quadrant == 4:
                     # minimum temperature
                     # convert back to required length
-                    self.H = (np.min(self.results.peak_heating[-8760 if hourly else -12:]) - self._Tg()) / (self.Tf_min - self._Tg()) * H_prev
+                    return (np.min(self.results.peak_heating[-8760 if hourly else -12:]) - self._Tg()) / (self.Tf_min - self._Tg()) * H_prev
                 elif quadrant == 10:
                     # over all years
                     # maximum temperature
                     # convert back to required length
-                    self.H = (np.max(self.results.peak_cooling) - self._Tg()) / (self.Tf_max - self._Tg()) * H_prev
+                    return (np.max(self.results.peak_cooling) - self._Tg()) / (self.Tf_max - self._Tg()) * H_prev
                 elif quadrant == 20:
                     # over all years
                     # minimum temperature
                     # convert back to required length
-                    self.H = (np.min(self.results.peak_heating) - self._Tg()) / (self.Tf_min - self._Tg()) * H_prev
+                    return (np.min(self.results.peak_heating) - self._Tg()) / (self.Tf_min - self._Tg()) * H_prev
             elif self.ground_data.variable_Tg:
                 # for when the temperature gradient is active and it is cooling
-                self.H = self.calculate_next_depth_deep_sizing(H_prev)
+                return self.calculate_next_depth_deep_sizing(H_prev)
+            return H_prev
+
+        def step() -> Tuple[float, float]:
+            new_depth = next_depth()
+            # the proportional update is H_new = (T - Tg) / (T_limit - Tg) * H, so the temperature residual
+            # T - T_limit equals (H_new / H - 1) * (T_limit - Tg), which has no pole when Tg equals T_limit
+            if deep_sizing or quadrant in (1, 2, 10):
+                return new_depth, (new_depth / self.H - 1) * (self.Tf_max - self._Tg())
+            return new_depth, (new_depth / self.H - 1) * (self._Tg() - self.Tf_min)
+
+        if self._calculation_setup.bracketing_sizing:
+            self.H = self._find_depth(step)
             if self.H < 0:
                 return 0, False
+        else:
+            # Iterates as long as there is no convergence
+            # (convergence if difference between depth in iterations is smaller than THRESHOLD_BOREHOLE_DEPTH)
+            i = 0
+            while not self._check_convergence(self.H, H_prev, i):
+                H_prev = self.H
+                self.H = next_depth()
+                if self.H < 0:
+                    return 0, False
 
-            i += 1
+                i += 1
 
         return self.H, (np.max(self.results.peak_cooling) <= self.Tf_max + 0.05 or
                         (quadrant == 10 or quadrant == 1 or quadrant == 2))\
@@ -1569,6 +1774,96 @@ class Borefield(BaseClass):
         """
         self._calculate_temperature_profile(H=depth, hourly=hourly)
 
+    def temperature_envelope(self, depths: np.ndarray | list, hourly: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function calculates the minimum and maximum peak fluid temperature over the whole simulation period
+        for an array of depths. The g-values of all the depths are stacked in a 2D-array and convolved with the load
+        at once, instead of calculating the temperature profile for every depth separately.
+        This can be used to draw design charts of the fluid temperatures versus the borehole depth.
+        Note that the stored results of the borefield are not altered.
+
+        Parameters
+        ----------
+        depths : np.ndarray, list
+            Depths for which the temperatures should be calculated [m]
+        hourly : bool
+            True when the temperatures should be calculated based on hourly data
+
+        Returns
+        -------
+        minimum temperature, maximum temperature : np.ndarray, np.ndarray
+            Minimum and maximum peak fluid temperatures for every depth [deg C]
+
+        Raises
+        ------
+        ValueError
+            ValueError when hourly is True and there is no hourly resolution available
+        """
+        depths = np.asarray(depths, dtype=np.float64).flatten()
+        if hourly and not self.load.hourly_resolution:
+            raise ValueError("There is no hourly resolution available!")
+
+        # depth dependent parameters (as 2D-arrays, one row per depth)
+        Rb = np.array([self.borehole.get_Rb(H, self.D, self.r_b, self.ground_data.k_s) for H in depths])[:, np.newaxis]
+        Tg = np.array([self._Tg(H) for H in depths])[:, np.newaxis]
+        H = depths[:, np.newaxis]
+
+        if not hourly:
+            # g-values for all the depths
+            g_values = np.array([self.gfunction(self.load.time_L3, depth) for depth in depths])
+            g_value_peak_cooling = np.array([self.gfunction(self.load.peak_cooling_duration, depth)[0]
+                                             for depth in depths])[:, np.newaxis]
+            g_value_peak_heating = np.array([self.gfunction(self.load.peak_heating_duration, depth)[0]
+                                             for depth in depths])[:, np.newaxis]
+
+            # convolution of all the depths at once
+            results = FFTConvolution(self.load.monthly_average_load_simulation_period * 1000)\
+                .convolve(np.diff(g_values, prepend=0, axis=1))
+
+            # calculation the borehole wall temperature for every month i
+            Tb = results / (2 * pi * self.ground_data.k_s) / (H * self.number_of_boreholes) + Tg
+
+            # one row per year (for every depth), so the monthly loads per year are broadcast without copying them
+            Tb = Tb.reshape(depths.size, self.simulation_period, 12)
+            Rb, H = Rb[..., np.newaxis], H[..., np.newaxis]
+            g_value_peak_cooling = g_value_peak_cooling[..., np.newaxis]
+            g_value_peak_heating = g_value_peak_heating[..., np.newaxis]
+
+            # fluid temperatures in peak cooling and peak heating
+            results_peak_cooling = Tb + self.load.baseload_cooling_power_per_year * 1000 \
+                * (Rb / self.number_of_boreholes / H) \
+                + (self.load.peak_cooling_per_year - self.load.baseload_cooling_power_per_year) \
+                * 1000 * (g_value_peak_cooling / self.ground_data.k_s / 2 / pi + Rb) / self.number_of_boreholes / H
+            results_peak_heating = Tb - self.load.baseload_heating_power_per_year * 1000 \
+                * (Rb / self.number_of_boreholes / H) \
+                - (self.load.peak_heating_per_year - self.load.baseload_heating_power_per_year) \
+                * 1000 * (g_value_peak_heating / self.ground_data.k_s / 2 / pi + Rb) / self.number_of_boreholes / H
+
+            return np.min(results_peak_heating, axis=(1, 2)), np.max(results_peak_cooling, axis=(1, 2))
+
+        if self._calculation_setup.load_aggregation:
+            # temporal superposition with the load aggregation scheme of Claesson and Javed
+            hourly_load = self.load.hourly_load_simulation_period
+            time_values = self._load_aggregation.time_values(hourly_load.size)
+            results = np.array([self._load_aggregation.calculate(hourly_load * 1000, self.gfunction(time_values, depth))
+                                for depth in depths])
+        else:
+            # convolution of all the depths at once
+            g_values = np.array([self.gfunction(self.load.time_L4, depth) for depth in depths])
+            results = self.load.convolve_hourly_load(np.diff(g_values, prepend=0, axis=1))
+
+        # calculation the borehole wall temperature for every hour i
+        Tb = results / (2 * pi * self.ground_data.k_s) / (H * self.number_of_boreholes) + Tg
+
+        # now the Tf will be calculated based on
+        # Tf = Tb + Q * R_b
+        # (the hourly load is a view with one row per year, so it is not repeated for every year before the product)
+        temperature_result = self.load.hourly_load_per_year * 1000 \
+            * (Rb / self.number_of_boreholes / H)[..., np.newaxis]
+        temperature_result += Tb.reshape(temperature_result.shape)
+
+        return np.min(temperature_result, axis=(1, 2)), np.max(temperature_result, axis=(1, 2))
+
     def print_temperature_profile(self, legend: bool = True, plot_hourly: bool = False) -> None:
         """
         This function plots the temperature profile for the calculated depth.
@@ -1734,60 +2029,209 @@ class Borefield(BaseClass):
             # calculation the borehole wall temperature for every month i
             Tb = results / (2 * pi * self.ground_data.k_s) / (H * self.number_of_boreholes) + self._Tg(H)
 
+            # one row per year, so the monthly loads per year are broadcast without copying them
+            Tb_per_year = Tb.reshape(self.simulation_period, 12)
+
             # now the Tf will be calculated based on
             # Tf = Tb + Q * R_b
-            results_month_cooling = Tb + self.load.baseload_cooling_power_simulation_period * 1000 \
+            results_month_cooling = Tb_per_year + self.load.baseload_cooling_power_per_year * 1000 \
                                     * (Rb / self.number_of_boreholes / H)
-            results_month_heating = Tb - self.load.baseload_heating_power_simulation_period * 1000 \
+            results_month_heating = Tb_per_year - self.load.baseload_heating_power_per_year * 1000 \
                                     * (Rb / self.number_of_boreholes / H)
 
             # extra summation if the g-function value for the peak is included
             results_peak_cooling = results_month_cooling + (
-                    self.load.peak_cooling_simulation_period - self.load.baseload_cooling_power_simulation_period) * 1000 \
+                    self.load.peak_cooling_per_year - self.load.baseload_cooling_power_per_year) * 1000 \
                                    * (
                                            g_value_peak_cooling / self.ground_data.k_s / 2 / pi + Rb) / self.number_of_boreholes / H
             results_peak_heating = results_month_heating - (
-                    self.load.peak_heating_simulation_period - self.load.baseload_heating_power_simulation_period) * 1000 \
+                    self.load.peak_heating_per_year - self.load.baseload_heating_power_per_year) * 1000 \
                                    * (
                                            g_value_peak_heating / self.ground_data.k_s / 2 / pi + Rb) / self.number_of_boreholes / H
 
             # save temperatures under variable
             self.results = Results(borehole_wall_temp=Tb,
-                                   peak_heating=results_peak_heating,
-                                   peak_cooling=results_peak_cooling,
-                                   monthly_heating=results_month_heating,
-                                   monthly_cooling=results_month_cooling)
+                                   peak_heating=results_peak_heating.ravel(),
+                                   peak_cooling=results_peak_cooling.ravel(),
+                                   monthly_heating=results_month_heating.ravel(),
+                                   monthly_cooling=results_month_cooling.ravel())
 
         if hourly:
             # check for hourly data if this is requested
             if not self.load.hourly_resolution:
                 raise ValueError("There is no hourly resolution available!")
 
-            hourly_load = self.load.hourly_load_simulation_period
+            if self._calculation_setup.load_aggregation:
+                hourly_load = self.load.hourly_load_simulation_period
 
-            # self.g-function is a function that uses the precalculated data to interpolate the correct values of the
-            # g-function. This dataset is checked over and over again and is correct
-            g_values = self.gfunction(self.load.time_L4, H)
+                # the g-function is only needed at the boundaries of the aggregation cells
+                g_values = self.gfunction(self._load_aggregation.time_values(hourly_load.size), H)
 
-            # calculation of needed differences of the g-function values. These are the weight factors in the calculation
-            # of Tb.
-            g_value_differences = np.diff(g_values, prepend=0)
+                # temporal superposition with the load aggregation scheme of Claesson and Javed
+                results = self._load_aggregation.calculate(hourly_load * 1000, g_values)
+            else:
+                # self.g-function is a function that uses the precalculated data to interpolate the correct values of the
+                # g-function. This dataset is checked over and over again and is correct
+                g_values = self.gfunction(self.load.time_L4, H)
 
-            # convolution to get the monthly results
-            results = convolve(hourly_load * 1000, g_value_differences)[:len(hourly_load)]
+                # calculation of needed differences of the g-function values. These are the weight factors in the
+                # calculation of Tb.
+                g_value_differences = np.diff(g_values, prepend=0)
 
-            # calculation the borehole wall temperature for every month i
+                # convolution to get the hourly results
+                # the spectrum of the hourly load is stored in the load object, so only the g-values are transformed
+                results = self.load.convolve_hourly_load(g_value_differences)
+
+            # calculation the borehole wall temperature for every hour i
             Tb = results / (2 * pi * self.ground_data.k_s) / (H * self.number_of_boreholes) + self._Tg(H)
 
             # now the Tf will be calculated based on
             # Tf = Tb + Q * R_b
-            temperature_result = Tb + hourly_load * 1000 * (Rb / self.number_of_boreholes / H)
+            # (the hourly load is a view with one row per year, so it is not repeated for every year before the product)
+            temperature_result = self.load.hourly_load_per_year * 1000 * (Rb / self.number_of_boreholes / H)
+            temperature_result += Tb.reshape(temperature_result.shape)
+            temperature_result = temperature_result.ravel()
 
             # reset other variables
             self.results = Results(borehole_wall_temp=Tb,
                                    peak_heating=temperature_result,
                                    peak_cooling=temperature_result)
 
+    def _calculate_first_and_last_year_temperature_profile(self, H: float = None, hourly: bool = False) -> None:
+        """
+        This function calculates the evolution in the fluid temperature and borehole wall temperature for only the
+        first and the last year of the simulation period. Since the load is the same every year, the influence of all
+        the intermediate years can be aggregated in the g-value differences, so that only 2x12 (monthly) or
+        2x8760 (hourly) values have to be convolved, independent of the length of the simulation period.
+        The results contain the first year followed by the last year.
+
+        Parameters
+        ----------
+        H : float
+            Depth at which the temperatures should be evaluated [m]. If None, than the current depth is taken.
+        hourly : bool
+            True if the temperature evolution should be calculated on an hourly basis.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            ValueError when hourly is True and there is no hourly resolution available
+        """
+        # set Rb* value
+        Rb = self.borehole.get_Rb(H if H is not None else self.H, self.D, self.r_b, self.ground_data.k_s)
+        H = H if H is not None else self.H
+
+        if not hourly:
+            # calculate g-values
+            g_values = self.gfunction(self.load.time_L3, H)
+
+            # the g-function value of the peak with length_peak hours
+            g_value_peak_cooling = self.gfunction(self.load.peak_cooling_duration, H)[0]
+            if self.load.peak_cooling_duration == self.load.peak_heating_duration:
+                g_value_peak_heating = g_value_peak_cooling
+            else:
+                g_value_peak_heating = self.gfunction(self.load.peak_heating_duration, H)[0]
+
+            # convolution to get the monthly results of the first and the last year
+            results = self._convolve_first_and_last_year(self.load.monthly_average_load * 1000,
+                                                         np.diff(g_values, prepend=0))
+
+            # calculation the borehole wall temperature for every month i
+            Tb = results / (2 * pi * self.ground_data.k_s) / (H * self.number_of_boreholes) + self._Tg(H)
+
+            # now the Tf will be calculated based on
+            # Tf = Tb + Q * R_b
+            results_month_cooling = Tb + np.tile(self.load.baseload_cooling_power, 2) * 1000 \
+                                    * (Rb / self.number_of_boreholes / H)
+            results_month_heating = Tb - np.tile(self.load.baseload_heating_power, 2) * 1000 \
+                                    * (Rb / self.number_of_boreholes / H)
+
+            # extra summation if the g-function value for the peak is included
+            results_peak_cooling = results_month_cooling + \
+                np.tile(self.load.peak_cooling - self.load.baseload_cooling_power, 2) * 1000 \
+                * (g_value_peak_cooling / self.ground_data.k_s / 2 / pi + Rb) / self.number_of_boreholes / H
+            results_peak_heating = results_month_heating - \
+                np.tile(self.load.peak_heating - self.load.baseload_heating_power, 2) * 1000 \
+                * (g_value_peak_heating / self.ground_data.k_s / 2 / pi + Rb) / self.number_of_boreholes / H
+
+            # save temperatures under variable
+            self.results = Results(borehole_wall_temp=Tb,
+                                   peak_heating=results_peak_heating,
+                                   peak_cooling=results_peak_cooling,
+                                   monthly_heating=results_month_heating,
+                                   monthly_cooling=results_month_cooling)
+            return
+
+        # check for hourly data if this is requested
+        if not self.load.hourly_resolution:
+            raise ValueError("There is no hourly resolution available!")
+
+        hourly_load = self.load.hourly_cooling_load - self.load.hourly_heating_load
+
+        # calculate g-values
+        g_values = self.gfunction(self.load.time_L4, H)
+
+        # convolution to get the hourly results of the first and the last year
+        results = self._convolve_first_and_last_year(hourly_load * 1000, np.diff(g_values, prepend=0))
+
+        # calculation the borehole wall temperature for every hour i
+        Tb = results / (2 * pi * self.ground_data.k_s) / (H * self.number_of_boreholes) + self._Tg(H)
+
+        # now the Tf will be calculated based on
+        # Tf = Tb + Q * R_b
+        temperature_result = Tb + np.tile(hourly_load, 2) * 1000 * (Rb / self.number_of_boreholes / H)
+
+        # save temperatures under variable
+        self.results = Results(borehole_wall_temp=Tb,
+                               peak_heating=temperature_result,
+                               peak_cooling=temperature_result)
+
+    @staticmethod
+    def _convolve_first_and_last_year(load: np.ndarray, g_value_differences: np.ndarray) -> np.ndarray:
+        """
+        This function convolves a yearly load, which is repeated every year, with the g-value differences over the
+        whole simulation period and returns only the results for the first and the last year.
+        For the last year, the g-value differences of all the previous years are summed (since the load is the same
+        every year), so only convolutions with the length of one year are needed.
+
+        Parameters
+        ----------
+        load : np.ndarray
+            Load for one year [W]
+        g_value_differences : np.ndarray
+            Differences of the g-values for the whole simulation period
+
+        Returns
+        -------
+        np.ndarray
+            Results of the convolution for the first year followed by those for the last year
+        """
+        length_year = load.size
+        simulation_period = g_value_differences.size // length_year
+
+        results = np.zeros(length_year * 2)
+
+        # convolution to get the results for the first year
+        results[:length_year] = convolve(load, g_value_differences[:length_year])[:length_year]
+
+        # sum up the g-value differences of all the years before the last year
+        g_sum_n1 = g_value_differences[:length_year * (simulation_period - 1)]\
+            .reshape(simulation_period - 1, length_year).sum(axis=0)
+        # add the last year
+        g_sum = g_sum_n1 + g_value_differences[length_year * (simulation_period - 1):]
+        # add zero at start and reverse the order
+        g_sum_n2 = np.concatenate((np.array([0]), g_sum_n1[::-1]))[:-1]
+
+        # results for the last year by the influence of the year itself (first term) and the previous years (last term)
+        results[length_year:] = convolve(load, g_sum)[:length_year] + \
+            convolve(load[::-1], g_sum_n2)[:length_year][::-1]
+
+        return results
+
     def set_options_gfunction_calculation(self, options: dict) -> None:
         """
         This function sets the options for the gfunction calculation of pygfunction.
@@ -1805,6 +2249,59 @@ class Borefield(BaseClass):
         """
         self.gfunction_calculation_object.set_options_gfunction_calculation(options)
 
+    def set_gfunction_disk_cache(self, folder: str | Path = None, max_size: float = 100e6) -> None:
+        """
+        This function sets the folder in which the gvalues, calculated with pygfunction, are stored, so they can be
+        reused in later runs of the same project (see GFunctionDiskCache).
+
+        Parameters
+        ----------
+        folder : str, Path
+            Folder of the cache. If None, the disk cache is not used.
+        max_size : float
+            Maximum size of the cache [bytes]. When it is exceeded, the least recently used gvalues are removed.
+
+        Returns
+        -------
+        None
+        """
+        self.gfunction_calculation_object.set_disk_cache(folder, max_size)
+
+    def set_gfunction_dimensionless_cache(self, use_cache: bool = True) -> None:
+        """
+        This function sets whether or not the gvalues are stored in dimensionless coordinates, so they can be reused
+        for other ground thermal diffusivities and borehole spacings (see DimensionlessGFunctionCache).
+        This is useful for parameter studies over the ground properties.
+
+        Parameters
+        ----------
+        use_cache : bool
+            True if the dimensionless cache should be used, False otherwise
+
+        Returns
+        -------
+        None
+        """
+        self.gfunction_calculation_object.set_dimensionless_cache(use_cache)
+
+    def set_gfunction_library(self, library: GFunctionLibrary | str = None) -> None:
+        """
+        This function sets the library with precalculated g-values of standard borefield shapes
+        (see GFunctionLibrary). When the borefield, depth and time values are covered by the library, the g-values
+        are interpolated from it instead of calculated with pygfunction.
+
+        Parameters
+        ----------
+        library : GFunctionLibrary, str
+            Library or the location of a saved library (e.g. GFunctionLibrary.DEFAULT_LIBRARY for the library that
+            is included in GHEtool). If None, no library is used.
+
+        Returns
+        -------
+        None
+        """
+        self.gfunction_library = GFunctionLibrary.load(library) if isinstance(library, (str, Path)) else library
+
     def gfunction(self, time_value: list | float | np.ndarray, H: float = None) -> np.ndarray:
         """
         This function returns the gfunction value.
@@ -1826,6 +2323,7 @@ class Borefield(BaseClass):
         """
         if H is None:
             H = self.H
+        self._gfunction_evaluations += 1
         # when using a variable ground temperature, sometimes no solution can be found
         if not isinstance(self.ground_data, GroundConstantTemperature) and H > Borefield.THRESHOLD_DEPTH_ERROR:
             raise UnsolvableDueToTemperatureGradient
@@ -1841,8 +2339,9 @@ class Borefield(BaseClass):
             """
             # set the correct depth of the borefield
             self._update_borefield_depth(H=H)
-            return self.gfunction_calculation_object.calculate(time_value, self.borefield, self.ground_data.alpha,
-                                                               interpolate=self._calculation_setup.interpolate_gfunctions)
+            return self.gfunction_calculation_object.calculate(
+                time_value, self.borefield, self.ground_data.alpha,
+                interpolate=self._calculation_setup.interpolate_gfunctions, fingerprint=self._borefield_fingerprint)
 
         ## 1 bypass any possible precalculated g-functions
         # if calculate is False, then the gfunctions are calculated jit
@@ -1856,12 +2355,20 @@ class Borefield(BaseClass):
             if self.custom_gfunction.within_range(time_value, H):
                 return self.custom_gfunction.calculate_gfunction(time_value, H)
 
-        ## 3 calculate g-function jit
+        ## 3 use the library of standard borefield shapes when available
+        if self.gfunction_library is not None:
+            gvalues = self.gfunction_library.gvalues(time_value, self.borefield, self.ground_data.alpha, H,
+                                                     self.gfunction_calculation_object.options,
+                                                     self._borefield_fingerprint)
+            if gvalues is not None:
+                return gvalues
+
+        ## 4 calculate g-function jit
         return jit_gfunction_calculation()
 
     def create_custom_dataset(self, time_array: list | np.ndarray = None,
                               depth_array: list | np.ndarray = None,
-                              options: dict = {}) -> None:
+                              options: dict = {}, workers: int = 1, checkpoint: str = None) -> None:
         """
         This function makes a datafile for a given custom borefield and sets it for the borefield object.
         It automatically sets this datafile in the current borefield object so it can be used as a source for
@@ -1875,6 +2382,12 @@ class Borefield(BaseClass):
             List or arrays of depths for which the datafile should be created
         options : dict
             Options for the g-function calculation (check pygfunction.gfunction.gFunction() for more information)
+        workers : int
+            Number of worker processes over which the depths are distributed.
+            If None, the number of processors of the machine is used.
+        checkpoint : str
+            Path of a checkpoint file (.npz) in which the calculated depths are stored, so an interrupted calculation
+            can be resumed. If None, no checkpoint is used.
 
         Returns
         -------
@@ -1883,7 +2396,7 @@ class Borefield(BaseClass):
         Raises
         ------
         ValueError
-            When no borefield or ground data is set
+            When no borefield or ground data is set or when the number of workers is smaller than 1
         """
 
         try:
@@ -1896,7 +2409,7 @@ class Borefield(BaseClass):
             raise ValueError("No ground data is set for which the gfunctions should be calculated")
 
         self.custom_gfunction = CustomGFunction(time_array, depth_array, options)
-        self.custom_gfunction.create_custom_dataset(self.borefield, self.ground_data.alpha)
+        self.custom_gfunction.create_custom_dataset(self.borefield, self.ground_data.alpha, workers, checkpoint)
 
     @property
     def Re(self) -> float:
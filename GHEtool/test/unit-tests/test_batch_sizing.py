@@ -0,0 +1,92 @@
+import copy
+
+import numpy as np
+import pygfunction as gt
+import pytest
+
+from GHEtool import Borefield, Borehole, CalculationSetup, GroundConstantTemperature, GroundFluxTemperature, \
+    SizingScenario, size_batch
+from GHEtool import batch_sizing
+from GHEtool.Validation.cases import load_case
+from GHEtool.VariableClasses.LoadData import MonthlyGeothermalLoadAbsolute
+
+field_1 = gt.boreholes.rectangle_field(6, 6, 6, 6, 100, 4, 0.075)
+field_2 = gt.boreholes.rectangle_field(5, 8, 6, 6, 100, 4, 0.075)
+
+
+def create_scenarios():
+    scenarios = [SizingScenario(GroundConstantTemperature(3, 10), MonthlyGeothermalLoadAbsolute(*load_case(case)),
+                                field)
+                 for field in (field_1, field_2) for case in (1, 2)]
+    scenarios.append(SizingScenario(GroundFluxTemperature(3, 10), MonthlyGeothermalLoadAbsolute(*load_case(1)),
+                                    field_1, CalculationSetup(L3_sizing=True)))
+    # unsolvable due to the temperature gradient
+    borehole = Borehole()
+    borehole.Rb = 0.2
+    scenarios.append(SizingScenario(GroundFluxTemperature(3, 12), MonthlyGeothermalLoadAbsolute(*load_case(1)),
+                                    gt.boreholes.rectangle_field(5, 5, 6, 6, 110, 4, 0.075),
+                                    CalculationSetup(bracketing_sizing=True), borehole))
+    return scenarios
+
+
+def size_scenario(scenario: SizingScenario) -> float:
+    borefield = Borefield(load=scenario.load)
+    borefield.ground_data = scenario.ground_data
+    borefield.set_borefield(copy.deepcopy(scenario.borefield))
+    if scenario.calculation_setup is not None:
+        borefield.calculation_setup(scenario.calculation_setup)
+    return borefield.size(), borefield.limiting_quadrant
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_size_batch(workers):
+    scenarios = create_scenarios()
+    results = size_batch(scenarios, workers=workers)
+    assert results.shape == (6,)
+    for scenario, result in zip(scenarios[:-1], results[:-1]):
+        depth, limiting_quadrant = size_scenario(scenario)
+        # the g-values can be interpolated from the warm g-function cache of the worker
+        assert np.isclose(result["depth"], depth, rtol=0.001)
+        assert result["limiting_quadrant"] == limiting_quadrant
+        assert result["error"] == ""
+    assert np.isnan(results[-1]["depth"])
+    assert results[-1]["error"] == "UnsolvableDueToTemperatureGradient"
+    assert "temperature gradient" in results[-1]["message"]
+    # the scenarios are not changed
+    assert all(borehole.H == 100 for borehole in scenarios[0].borefield)
+
+
+def test_size_batch_geometry():
+    scenarios = create_scenarios()
+    assert scenarios[0].geometry == scenarios[1].geometry == scenarios[4].geometry
+    assert scenarios[0].geometry != scenarios[2].geometry
+    assert len(size_batch([])) == 0
+    with pytest.raises(ValueError):
+        size_batch(scenarios, workers=0)
+
+
+def test_create_chunks(monkeypatch):
+    monkeypatch.setattr(batch_sizing, "CHUNK_SIZE", 2)
+    scenarios = [SizingScenario(GroundConstantTemperature(3, 10), MonthlyGeothermalLoadAbsolute(*load_case(1)),
+                                field_1) for _ in range(5)]
+    scenarios.append(SizingScenario(GroundConstantTemperature(2, 10), MonthlyGeothermalLoadAbsolute(*load_case(1)),
+                                    field_1))
+    chunks = batch_sizing._create_chunks(scenarios)
+    # a single geometry is divided over multiple chunks, per ground diffusivity
+    assert [[index for index, _ in chunk] for chunk in chunks] == [[0, 1], [2, 3], [4], [5]]
+
+    results = size_batch(scenarios, workers=2)
+    assert np.allclose(results["depth"][:5], results["depth"][0], rtol=0.001)
+    assert all(results["error"] == "")
+
+
+def test_gfunction_cache(monkeypatch):
+    monkeypatch.setattr(batch_sizing, "MAX_GFUNCTION_CACHE_SIZE", 1)
+    gfunction = batch_sizing._get_gfunction("a")
+    assert batch_sizing._get_gfunction("a") is gfunction
+    batch_sizing._get_gfunction("b")
+    assert list(batch_sizing._GFUNCTION_CACHE) == ["b"]
+
+    # the cache is cleared after a batch in the current process
+    size_batch(create_scenarios()[:2], workers=1)
+    assert batch_sizing._GFUNCTION_CACHE == {}
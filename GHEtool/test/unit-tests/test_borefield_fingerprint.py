@@ -0,0 +1,44 @@
+import copy
+
+import pygfunction as gt
+
+from GHEtool import Borefield, GroundConstantTemperature
+from GHEtool.VariableClasses import borefield_fingerprint
+
+
+def test_fingerprint():
+    borefield = gt.boreholes.rectangle_field(10, 10, 5, 5, 100, 4, 0.075)
+    assert borefield_fingerprint(borefield) == borefield_fingerprint(copy.deepcopy(borefield))
+    # the depth is neglected
+    assert borefield_fingerprint(borefield) == \
+           borefield_fingerprint(gt.boreholes.rectangle_field(10, 10, 5, 5, 150, 4, 0.075))
+    # the order of the boreholes is taken into account
+    assert borefield_fingerprint(borefield) != borefield_fingerprint(borefield[::-1])
+    assert borefield_fingerprint(borefield) != \
+           borefield_fingerprint(gt.boreholes.rectangle_field(10, 10, 6, 5, 100, 4, 0.075))
+    assert borefield_fingerprint(borefield) != \
+           borefield_fingerprint(gt.boreholes.rectangle_field(10, 10, 5, 5, 100, 2, 0.075))
+    assert borefield_fingerprint(borefield) != \
+           borefield_fingerprint(gt.boreholes.rectangle_field(10, 10, 5, 5, 100, 4, 0.07))
+    assert borefield_fingerprint(borefield) != \
+           borefield_fingerprint(gt.boreholes.rectangle_field(10, 10, 5, 5, 100, 4, 0.075, tilt=0.1))
+    assert borefield_fingerprint([]) == ""
+
+
+def test_fingerprint_borefield():
+    borefield = Borefield()
+    borefield.set_ground_parameters(GroundConstantTemperature(3, 10))
+    assert borefield._borefield_fingerprint == ""
+    borefield.create_rectangular_borefield(5, 5, 6, 6, 100, 1, 0.075)
+    fingerprint = borefield._borefield_fingerprint
+    assert fingerprint == borefield_fingerprint(borefield.borefield)
+    borefield.gfunction(5000, 110)
+    # the same geometry keeps the g-function data
+    borefield.create_rectangular_borefield(5, 5, 6, 6, 120, 1, 0.075)
+    assert borefield._borefield_fingerprint == fingerprint
+    assert borefield.gfunction_calculation_object.depth_array.size == 1
+    borefield.create_rectangular_borefield(5, 6, 6, 6, 120, 1, 0.075)
+    assert borefield._borefield_fingerprint != fingerprint
+    assert borefield.gfunction_calculation_object.depth_array.size == 0
+    borefield.borefield = None
+    assert borefield._borefield_fingerprint == ""
@@ -1,10 +1,11 @@
 import copy
+from concurrent.futures import ThreadPoolExecutor
 
 import pygfunction as gt
 import numpy as np
 import pytest
 
-from GHEtool import FluidData, DoubleUTube, SingleUTube, MultipleUTube
+from GHEtool import FluidData, DoubleUTube, SingleUTube, MultipleUTube, CoaxialPipe
 from GHEtool.VariableClasses import Borehole
 
 fluid_data = FluidData(0.2, 0.568, 998, 4180, 1e-3)
@@ -99,6 +100,111 @@ def test_Rb():
     assert np.isclose(borehole.calculate_Rb(100, 1, 0.075, 3), 0.09483159131195469)
 
 
+def test_Rb_cache():
+    borehole = Borehole()
+    borehole.pipe_data = MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2)
+    borehole.fluid_data = FluidData(0.2, 0.568, 998, 4180, 1e-3)
+    Rb = borehole.get_Rb(100, 1, 0.075, 3)
+    assert np.isclose(Rb, 0.09483159131195469)
+    assert len(borehole._Rb_cache) == 1
+    assert borehole.get_Rb(100, 1, 0.075, 3) == Rb
+    assert len(borehole._Rb_cache) == 1
+    assert np.isclose(borehole.get_Rb(100, 1, 0.075, 2), borehole.calculate_Rb(100, 1, 0.075, 2))
+    assert len(borehole._Rb_cache) == 2
+    # the cache is not compared
+    other = Borehole(FluidData(0.2, 0.568, 998, 4180, 1e-3), MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2))
+    assert borehole == other
+    assert "_Rb_cache" not in borehole.to_dict()
+
+    # changed in place
+    borehole.fluid_data.set_mass_flow_rate(0.3)
+    assert borehole.get_Rb(100, 1, 0.075, 3) != Rb
+    assert len(borehole._Rb_cache) == 3
+    # new data
+    borehole.fluid_data = FluidData(0.2, 0.568, 998, 4180, 1e-3)
+    assert borehole._Rb_cache == {}
+    assert borehole.get_Rb(100, 1, 0.075, 3) == Rb
+    borehole.pipe_data = MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 1)
+    assert borehole._Rb_cache == {}
+    assert not np.isclose(borehole.get_Rb(100, 1, 0.075, 3), Rb)
+
+
+def test_Rb_cache_size(monkeypatch):
+    monkeypatch.setattr(Borehole, "MAX_RB_CACHE_SIZE", 2)
+    borehole = Borehole(FluidData(0.2, 0.568, 998, 4180, 1e-3), MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2))
+    for H in (100, 110, 120):
+        borehole.get_Rb(H, 1, 0.075, 3)
+    assert [key[-1] for key in borehole._Rb_cache] == [110, 120]
+
+
+def test_Rb_cache_threads(monkeypatch):
+    monkeypatch.setattr(Borehole, "MAX_RB_CACHE_SIZE", 2)
+    borehole = Borehole(FluidData(0.2, 0.568, 998, 4180, 1e-3), MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2))
+    depths = np.tile(np.linspace(50, 150, 20), 5)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        Rb = list(executor.map(lambda H: borehole.get_Rb(H, 1, 0.075, 3), depths))
+    assert np.allclose(Rb, [borehole.calculate_Rb(H, 1, 0.075, 3) for H in depths])
+    assert len(borehole._Rb_cache) <= 2
+
+
+def test_Rb_curve():
+    borehole = Borehole(FluidData(0.2, 0.568, 998, 4180, 1e-3), MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2))
+    with pytest.raises(ValueError):
+        borehole.set_Rb_curve([100], 1, 0.075, 3)
+    borehole.set_Rb_curve(np.arange(50, 201, 10), 1, 0.075, 3)
+    # the values in the curve are not stored separately
+    assert borehole._Rb_cache == {}
+    assert np.isclose(borehole.get_Rb(100, 1, 0.075, 3), borehole.calculate_Rb(100, 1, 0.075, 3))
+    assert np.isclose(borehole.get_Rb(123.4, 1, 0.075, 3), borehole.calculate_Rb(123.4, 1, 0.075, 3), rtol=1e-3)
+    assert borehole._Rb_cache == {}
+    # outside the range of the curve or for another ground, the Rb* is calculated
+    assert borehole.get_Rb(250, 1, 0.075, 3) == borehole.calculate_Rb(250, 1, 0.075, 3)
+    assert borehole.get_Rb(123.4, 1, 0.075, 2) == borehole.calculate_Rb(123.4, 1, 0.075, 2)
+    assert len(borehole._Rb_cache) == 2
+    # new data
+    borehole.fluid_data = FluidData(0.3, 0.568, 998, 4180, 1e-3)
+    assert borehole._Rb_curve is None
+    assert borehole.get_Rb(123.4, 1, 0.075, 3) == borehole.calculate_Rb(123.4, 1, 0.075, 3)
+
+    # the curve is not used with a constant Rb*
+    borehole.set_Rb_curve(np.arange(50, 201, 10), 1, 0.075, 3)
+    borehole.Rb = 0.12
+    assert borehole.get_Rb(123.4, 1, 0.075, 3) == 0.12
+
+
+def test_Rb_cache_from_dict():
+    borehole = Borehole(FluidData(0.2, 0.568, 998, 4180, 1e-3), MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2))
+    loaded = Borehole.__new__(Borehole)
+    loaded.from_dict(borehole.to_dict())
+    assert loaded.get_Rb(100, 1, 0.075, 3) == borehole.get_Rb(100, 1, 0.075, 3)
+
+
+@pytest.mark.parametrize("pipe", [SingleUTube(1, 0.015, 0.02, 0.4, 0.05), DoubleUTube(1, 0.015, 0.02, 0.4, 0.05),
+                                  MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 3),
+                                  CoaxialPipe(0.0221, 0.025, 0.0487, 0.055, 0.4, 1, is_inner_inlet=True),
+                                  CoaxialPipe(0.0221, 0.025, 0.0487, 0.055, 0.4, 1, is_inner_inlet=False)])
+def test_calculate_Rb_array(pipe):
+    borehole = Borehole(FluidData(0.2, 0.568, 998, 4180, 1e-3), pipe)
+    depths = np.array([20, 50, 100, 150, 300])
+    assert np.allclose(borehole.calculate_Rb_array(depths, 1, 0.075, 3),
+                       [borehole.calculate_Rb(H, 1, 0.075, 3) for H in depths], rtol=1e-10)
+    assert np.isclose(borehole.calculate_Rb_array(100, 1, 0.075, 3), borehole.calculate_Rb(100, 1, 0.075, 3))
+
+    # time-varying mass flow rate
+    mfr = np.array([0.1, 0.3, 0.1, 0.5])
+    Rb = borehole.calculate_Rb_array(100, 1, 0.075, 3, mfr)
+    for idx, flow in enumerate(mfr):
+        assert np.isclose(Rb[idx], Borehole(FluidData(flow, 0.568, 998, 4180, 1e-3),
+                                            copy.copy(pipe)).calculate_Rb(100, 1, 0.075, 3), rtol=1e-10)
+    # the pipe data is not changed
+    assert borehole.pipe_data == Borehole(FluidData(0.2, 0.568, 998, 4180, 1e-3), copy.copy(pipe)).pipe_data
+    # depths and mass flow rates are broadcast
+    assert borehole.calculate_Rb_array(depths[:, np.newaxis], 1, 0.075, 3, mfr).shape == (5, 4)
+
+    with pytest.raises(ValueError):
+        Borehole().calculate_Rb_array(depths, 1, 0.075, 3)
+
+
 def test_calculate_Rb_no_data():
     borehole = Borehole()
 
@@ -95,4 +95,32 @@ def test_assign_incorrect_variable():
         setup.update_variables(test='test')
         assert False  # pragma: no cover
     except ValueError:
-        assert True
\ No newline at end of file
+        assert True
+
+
+def test_first_and_last_year_sizing():
+    test = CalculationSetup()
+    assert not test.first_and_last_year_sizing
+    test.update_variables(first_and_last_year_sizing=True)
+    assert test.first_and_last_year_sizing
+
+
+def test_load_aggregation():
+    test = CalculationSetup()
+    assert not test.load_aggregation
+    test.update_variables(load_aggregation=True)
+    assert test.load_aggregation
+
+
+def test_bracketing_sizing():
+    test = CalculationSetup()
+    assert not test.bracketing_sizing
+    test.update_variables(bracketing_sizing=True)
+    assert test.bracketing_sizing
+
+
+def test_concurrent_sizing():
+    test = CalculationSetup()
+    assert not test.concurrent_sizing
+    test.update_variables(concurrent_sizing=True)
+    assert test.concurrent_sizing
@@ -1,4 +1,7 @@
 import copy
+import importlib
+import json
+import pickle
 
 import numpy as np
 import pygfunction as gt
@@ -6,6 +9,9 @@ import pytest
 
 from GHEtool.VariableClasses import CustomGFunction, load_custom_gfunction
 
+# the module, since the class has the same name
+custom_gfunction_module = importlib.import_module("GHEtool.VariableClasses.CustomGFunction")
+
 
 @pytest.fixture
 def custom_gfunction():
@@ -67,6 +73,84 @@ def test_create_dataset():
     assert not np.any(custom_gfunction.gvalues_array)
 
 
+def test_create_dataset_parallel():
+    borefield = gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 4, 0.075)
+    time_array = np.array([3600, 3600 * 100, 3600 * 8760, 3600 * 8760 * 10.])
+    depth_array = np.array([50, 100, 150])
+    serial = CustomGFunction(time_array, depth_array, {"method": "equivalent"})
+    serial.create_custom_dataset(borefield, 2. * 10 ** -6)
+    # the borefield is not changed
+    assert borefield[0].H == 100
+    parallel = CustomGFunction(time_array, depth_array, {"method": "equivalent"})
+    parallel.create_custom_dataset(borefield, 2. * 10 ** -6, workers=2)
+    assert np.array_equal(serial.gvalues_array, parallel.gvalues_array)
+    with pytest.raises(ValueError):
+        parallel.create_custom_dataset(borefield, 2. * 10 ** -6, workers=0)
+
+
+def test_stats(caplog):
+    borefield = gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 4, 0.075)
+    custom_gfunction = CustomGFunction(np.array([3600, 3600 * 100, 3600 * 8760]), np.array([50, 100]),
+                                       {"method": "equivalent"})
+    assert not custom_gfunction.within_range(np.array([3600]), 75)
+    custom_gfunction.create_custom_dataset(borefield, 2. * 10 ** -6)
+    assert custom_gfunction.within_range(np.array([3600]), 75)
+    assert not custom_gfunction.within_range(np.array([3600]), 150)
+    custom_gfunction.calculate_gfunction(np.array([3600]), 75)
+    stats = custom_gfunction.stats()
+    assert (stats["hits"], stats["misses"], stats["pygfunction_calls"], stats["stored_depths"]) == (1, 2, 2, 2)
+    assert stats["pygfunction_time"] > 0
+    assert np.isclose(stats["pygfunction_time_per_call"], stats["pygfunction_time"] / 2)
+    # the statistics are not taken into account for the comparison
+    assert custom_gfunction == copy.deepcopy(custom_gfunction)
+    other = copy.deepcopy(custom_gfunction)
+    other.reset_stats()
+    assert other.stats()["hits"] == 0
+    assert custom_gfunction == other
+
+    with caplog.at_level("INFO"):
+        custom_gfunction.stats(log=True)
+    assert "hits: 1" in caplog.text
+
+
+def test_create_dataset_checkpoint(tmp_path, monkeypatch):
+    borefield = gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 4, 0.075)
+    time_array = np.array([3600, 3600 * 100, 3600 * 8760, 3600 * 8760 * 10.])
+    depth_array = np.array([50, 100, 150])
+    checkpoint = str(tmp_path.joinpath("checkpoint.npz"))
+    reference = CustomGFunction(time_array, depth_array, {"method": "equivalent"})
+    reference.create_custom_dataset(borefield, 2. * 10 ** -6)
+
+    # interrupt the calculation after two depths
+    calculate = custom_gfunction_module._calculate_gvalues_at_depth
+    calculated_depths = []
+
+    def interrupted(borefield, alpha, H, time_array, options):
+        if len(calculated_depths) == 2:
+            raise KeyboardInterrupt
+        calculated_depths.append(H)
+        return calculate(borefield, alpha, H, time_array, options)
+
+    monkeypatch.setattr(custom_gfunction_module, "_calculate_gvalues_at_depth", interrupted)
+    custom_gfunction = CustomGFunction(time_array, depth_array, {"method": "equivalent"})
+    with pytest.raises(KeyboardInterrupt):
+        custom_gfunction.create_custom_dataset(borefield, 2. * 10 ** -6, checkpoint=checkpoint)
+
+    # resume, so only the last depth is calculated
+    calculated_depths.clear()
+    custom_gfunction = CustomGFunction(time_array, depth_array, {"method": "equivalent"})
+    custom_gfunction.create_custom_dataset(borefield, 2. * 10 ** -6, checkpoint=checkpoint)
+    assert calculated_depths == [150]
+    assert np.array_equal(custom_gfunction.gvalues_array, reference.gvalues_array)
+
+    # a checkpoint of another alpha is not used
+    calculated_depths.clear()
+    custom_gfunction = CustomGFunction(time_array, depth_array, {"method": "equivalent"})
+    with pytest.raises(KeyboardInterrupt):
+        custom_gfunction.create_custom_dataset(borefield, 3. * 10 ** -6, checkpoint=checkpoint)
+    assert calculated_depths == [50, 100]
+
+
 def test_dump_dataset(custom_gfunction):
     custom_gfunction.dump_custom_dataset("", "test")
 
@@ -136,3 +220,47 @@ def test_gfunction_calculation(custom_gfunction):
     loaded_custom_gfunction = load_custom_gfunction("test.gvalues")
     assert np.isclose(0.03586207, loaded_custom_gfunction.calculate_gfunction(4000, 100, True)[0])
     assert np.allclose(np.array([0.03586207, 0.1343308]), loaded_custom_gfunction.calculate_gfunction([4000, 8000], 100, True))
+
+
+def test_save_custom_dataset(tmp_path):
+    borefield = gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 4, 0.075)
+    custom_gfunction = CustomGFunction(np.array([3600, 3600 * 100, 3600 * 8760, 3600 * 8760 * 10.]),
+                                       np.array([50, 100, 150]), {"method": "equivalent"})
+    custom_gfunction.create_custom_dataset(borefield, 2. * 10 ** -6)
+    path = str(tmp_path.joinpath("dataset.gvalues"))
+    custom_gfunction.save_custom_dataset(path)
+
+    with open(path, "rb") as file:
+        preamble = np.frombuffer(file.read(custom_gfunction_module.DATASET_PREAMBLE.itemsize),
+                                 dtype=custom_gfunction_module.DATASET_PREAMBLE)[0]
+        header = json.loads(file.read(int(preamble["header_length"])))
+    assert preamble["magic"] == b"GHEGFUNC"
+    assert preamble["version"] == 1
+    assert (custom_gfunction_module.DATASET_PREAMBLE.itemsize + preamble["header_length"]) % 64 == 0
+    assert header["alpha"] == 2. * 10 ** -6
+    assert header["shape"] == [3, 4]
+
+    for mmap in (True, False):
+        loaded = load_custom_gfunction(path, mmap)
+        assert isinstance(loaded.gvalues_array, np.memmap) == mmap
+        assert loaded == custom_gfunction
+        assert np.array_equal(loaded.calculate_gfunction([4000, 8000], 120),
+                              custom_gfunction.calculate_gfunction([4000, 8000], 120))
+        # the loaded dataset can be sent to other processes
+        assert pickle.loads(pickle.dumps(loaded)) == custom_gfunction
+
+    # changes to a memory-mapped dataset are not written to the file
+    loaded = load_custom_gfunction(path)
+    loaded.gvalues_array[0, 0] = 100
+    assert load_custom_gfunction(path) == custom_gfunction
+
+
+def test_load_custom_dataset_newer_version(tmp_path):
+    custom_gfunction = CustomGFunction(np.array([3600, 7200.]), np.array([50, 100]))
+    path = str(tmp_path.joinpath("dataset.gvalues"))
+    custom_gfunction.save_custom_dataset(path)
+    with open(path, "r+b") as file:
+        file.seek(8)
+        file.write(np.array(2, dtype="<u4").tobytes())
+    with pytest.raises(ValueError):
+        load_custom_gfunction(path)
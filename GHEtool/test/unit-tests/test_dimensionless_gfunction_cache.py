@@ -0,0 +1,111 @@
+import numpy as np
+import pygfunction as gt
+
+from GHEtool import Borefield, GroundConstantTemperature
+from GHEtool.VariableClasses import DimensionlessGFunctionCache, GFunction
+
+borefield = gt.boreholes.rectangle_field(5, 5, 6, 6, 100, 4, 0.075)
+time_values = np.array([3600, 3600 * 100, 3600 * 8760, 3600 * 8760 * 5, 3600 * 8760 * 20.])
+options = {"method": "equivalent"}
+
+
+def test_dimensionless_geometry():
+    key, spacing = DimensionlessGFunctionCache.dimensionless_geometry(borefield, options)
+    assert np.isclose(spacing, 0.06)
+    # other spacing, same shape
+    key_other, spacing_other = DimensionlessGFunctionCache.dimensionless_geometry(
+        gt.boreholes.rectangle_field(5, 5, 7, 7, 100, 4, 0.075), options)
+    assert key_other == key
+    assert np.isclose(spacing_other, 0.07)
+    # scaled borefield
+    assert DimensionlessGFunctionCache.dimensionless_geometry(
+        gt.boreholes.rectangle_field(5, 5, 12, 12, 200, 8, 0.15), options) == (key, spacing)
+    # other shape, other burial depth and other options
+    assert DimensionlessGFunctionCache.dimensionless_geometry(
+        gt.boreholes.rectangle_field(5, 4, 6, 6, 100, 4, 0.075), options)[0] != key
+    assert DimensionlessGFunctionCache.dimensionless_geometry(
+        gt.boreholes.rectangle_field(5, 5, 6, 6, 100, 5, 0.075), options)[0] != key
+    assert DimensionlessGFunctionCache.dimensionless_geometry(borefield, {"method": "similarities"})[0] != key
+    # single borehole
+    assert DimensionlessGFunctionCache.dimensionless_geometry(borefield[:1], options)[1] == 0
+    # boreholes with different depths
+    assert DimensionlessGFunctionCache.dimensionless_geometry(
+        [gt.boreholes.Borehole(100, 4, 0.075, 0, 0), gt.boreholes.Borehole(110, 4, 0.075, 6, 0)], options) is None
+
+
+def test_other_alpha():
+    cache = DimensionlessGFunctionCache()
+
+    def calculate(alpha):
+        return lambda time_values: gt.gfunction.gFunction(borefield, alpha, time_values).gFunc
+
+    gvalues = cache.gvalues(borefield, 1e-6, time_values, options, calculate(1e-6))
+    assert np.allclose(gvalues, gt.gfunction.gFunction(borefield, 1e-6, time_values).gFunc, rtol=0.015)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    def not_allowed(time_values):
+        raise AssertionError("the g-values should be interpolated")  # pragma: no cover
+
+    for alpha in (0.8e-6, 1.5e-6):
+        gvalues = cache.gvalues(borefield, alpha, time_values, options, not_allowed)
+        assert np.allclose(gvalues, gt.gfunction.gFunction(borefield, alpha, time_values).gFunc, rtol=0.015)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # outside the stored range, the range is extended
+    cache.gvalues(borefield, 1e-5, time_values, options, calculate(1e-5))
+    assert cache.misses == 2
+    cache.gvalues(borefield, 1e-6, time_values, options, not_allowed)
+    assert cache.hits == 3
+
+    cache.clear()
+    assert cache.data == {}
+
+
+def test_other_spacing():
+    cache = DimensionlessGFunctionCache()
+    for spacing in (6, 6.5):
+        field = gt.boreholes.rectangle_field(5, 5, spacing, spacing, 100, 4, 0.075)
+        cache.gvalues(field, 1e-6, time_values, options,
+                      lambda time_values: gt.gfunction.gFunction(field, 1e-6, time_values).gFunc)
+    field = gt.boreholes.rectangle_field(5, 5, 6.2, 6.2, 100, 4, 0.075)
+    gvalues = cache.gvalues(field, 1.2e-6, time_values, options, lambda time_values: None)
+    assert np.allclose(gvalues, gt.gfunction.gFunction(field, 1.2e-6, time_values).gFunc, rtol=0.015)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # the stored spacings are too far from each other
+    cache.threshold_spacing_interpolation = 0.05
+    field = gt.boreholes.rectangle_field(5, 5, 6.3, 6.3, 100, 4, 0.075)
+    cache.gvalues(field, 1.2e-6, time_values, options,
+                  lambda time_values: gt.gfunction.gFunction(field, 1.2e-6, time_values).gFunc)
+    assert cache.misses == 3
+
+
+def test_gfunction_with_dimensionless_cache():
+    gfunc = GFunction()
+    gfunc.set_dimensionless_cache()
+    gvalues = gfunc.calculate(time_values, borefield, 1e-6)
+    gfunc.calculate(time_values, borefield, 1.2e-6)
+    assert (gfunc.dimensionless_cache.hits, gfunc.dimensionless_cache.misses) == (1, 1)
+    assert np.array_equal(gfunc.calculate(time_values, borefield, 1e-6), gvalues)
+    gfunc.set_dimensionless_cache(False)
+    assert gfunc.dimensionless_cache is None
+
+
+def test_borefield_sizing_with_dimensionless_cache():
+    borefield_ghe = Borefield()
+    borefield_ghe.set_borefield(gt.boreholes.rectangle_field(10, 10, 6, 6, 110, 4, 0.075))
+    borefield_ghe.set_Rb(0.12)
+    borefield_ghe.load.peak_heating = [160., 142, 102., 55., 0, 0, 0, 0, 40.4, 85., 119., 136.]
+    borefield_ghe.load.peak_cooling = [0, 0, 34., 69., 133., 187., 213., 240., 160., 37., 0, 0]
+    borefield_ghe.load.baseload_heating = [46500., 44400., 37500., 29700., 19200., 0, 0, 0, 18300., 26100., 35100.,
+                                           43200.]
+    borefield_ghe.load.baseload_cooling = [4000., 8000., 8000., 8000., 12000., 16000., 32000., 32000., 16000.,
+                                           12000., 8000., 4000.]
+    depths = []
+    for use_cache in (False, True):
+        borefield_ghe.set_gfunction_dimensionless_cache(use_cache)
+        for conductivity in (2.5, 3):
+            borefield_ghe.set_ground_parameters(GroundConstantTemperature(conductivity, 10))
+            depths.append(borefield_ghe.size())
+    assert np.allclose(depths[:2], depths[2:], rtol=0.01)
+    assert borefield_ghe.gfunction_calculation_object.dimensionless_cache.hits > 0
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from scipy.signal import convolve
+
+from GHEtool.VariableClasses import FFTConvolution
+
+signal = np.sin(np.linspace(0, 20, 1000)) * 100
+kernel = np.diff(np.log(np.arange(1, 1002)))
+
+
+def test_convolve():
+    convolution = FFTConvolution(signal)
+    assert convolution.is_set
+    assert convolution.signal_length == 1000
+    assert np.allclose(convolution.convolve(kernel), convolve(signal, kernel)[:1000])
+    assert np.allclose(convolution.convolve(kernel[:10]), convolve(signal, kernel[:10])[:1000])
+
+
+def test_convolve_2D():
+    convolution = FFTConvolution(signal)
+    kernels = np.vstack((kernel, kernel * 2))
+    result = convolution.convolve(kernels)
+    assert result.shape == (2, 1000)
+    assert np.allclose(result[0], convolve(signal, kernel)[:1000])
+    assert np.allclose(result[1], convolve(signal, kernel * 2)[:1000])
+
+
+def test_errors():
+    convolution = FFTConvolution()
+    assert not convolution.is_set
+    with pytest.raises(ValueError):
+        convolution.convolve(kernel)
+    convolution.set_signal(signal[:10])
+    with pytest.raises(ValueError):
+        convolution.convolve(kernel)
+
+
+def test_clear():
+    convolution = FFTConvolution(signal)
+    convolution.clear()
+    assert not convolution.is_set
+    assert convolution.signal_length == 0
@@ -6,7 +6,7 @@ import pygfunction as gt
 from pytest import raises
 
 from GHEtool import Borefield
-from GHEtool.VariableClasses import FIFO, GFunction
+from GHEtool.VariableClasses import FIFO, GFunction, borefield_fingerprint
 
 depth_array = np.array([1, 5, 6])
 depth_array_empty = np.array([])
@@ -358,9 +358,74 @@ def test_no_extrapolation():
 
     assert np.array_equal(gfunc.previous_gfunctions,
                           gt.gfunction.gFunction(borefield, alpha, gfunc.time_array).gFunc)
-    # these should equal since there is no extrapolation
-    assert np.array_equal(gfunc.calculate(borefield_ghe.load.time_L3[:20], borefield, alpha),
-                          gt.gfunction.gFunction(borefield, alpha, borefield_ghe.load.time_L3[:20]).gFunc)
+    # within the stored depths, the gvalues are interpolated like without extrapolation
+    gvalues = gfunc.calculate(borefield_ghe.load.time_L3[:20], borefield, alpha)
+    gfunc.no_extrapolation = True
+    assert np.array_equal(gvalues, gfunc.calculate(borefield_ghe.load.time_L3[:20], borefield, alpha))
+
+
+def test_extrapolation():
+    gfunc = GFunction()
+    alpha = 0.00005
+    time_values = borefield_ghe.load.time_L3[:120]
+    borefield_extrapolation = copy.deepcopy(borefield)
+    gfunc.no_extrapolation = False
+    for depth in (90, 100, 110):
+        _change_borefield_depth(borefield_extrapolation, depth)
+        gfunc.calculate(time_values, borefield_extrapolation, alpha)
+    assert gfunc.misses == 3
+
+    # extrapolated
+    _change_borefield_depth(borefield_extrapolation, 120)
+    gvalues = gfunc.calculate(time_values, borefield_extrapolation, alpha)
+    assert (gfunc.hits, gfunc.misses) == (1, 3)
+    assert np.allclose(gvalues, GFunction().calculate(time_values, borefield_extrapolation, alpha), rtol=0.002)
+
+    # too far from the stored depths, so it is calculated
+    _change_borefield_depth(borefield_extrapolation, 130)
+    gfunc.calculate(time_values, borefield_extrapolation, alpha)
+    assert gfunc.misses == 4
+
+    # not enough depths stored
+    gfunc.remove_previous_data()
+    _change_borefield_depth(borefield_extrapolation, 100)
+    gfunc.calculate(time_values, borefield_extrapolation, alpha)
+    _change_borefield_depth(borefield_extrapolation, 110)
+    gfunc.calculate(time_values, borefield_extrapolation, alpha)
+    assert not np.any(gfunc.interpolate_gfunctions(gfunc.time_array, 115, alpha, borefield_extrapolation))
+
+
+def test_stats(caplog):
+    gfunc = GFunction()
+    alpha = 0.00005
+    time_values = borefield_ghe.load.time_L3[:120]
+    borefield_stats = copy.deepcopy(borefield)
+    gfunc.no_extrapolation = False
+    for depth in (90, 100, 110, 105, 120):
+        _change_borefield_depth(borefield_stats, depth)
+        gfunc.calculate(time_values, borefield_stats, alpha)
+    stats = gfunc.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 3)
+    assert (stats["interpolations"], stats["extrapolations"], stats["loop_breaks"]) == (1, 1, 0)
+    assert stats["pygfunction_calls"] == 3
+    assert stats["pygfunction_time"] > 0
+    assert np.isclose(stats["pygfunction_time_per_call"], stats["pygfunction_time"] / 3)
+    assert stats["stored_depths"] == 3
+    assert (stats["stored_data"], stats["stored_data_size"]) == (0, 0)
+    assert (stats["dimensionless_cache_hits"], stats["dimensionless_cache_misses"]) == (0, 0)
+
+    # the FIFO list breaks the loop between 111 and 112 m
+    for depth in (111, 112, 111):
+        _change_borefield_depth(borefield_stats, depth)
+        gfunc.calculate(time_values, borefield_stats, alpha)
+    assert gfunc.stats()["loop_breaks"] == 1
+
+    with caplog.at_level("INFO"):
+        gfunc.stats(log=True)
+    assert "pygfunction_calls: 4" in caplog.text
+    gfunc.reset_stats()
+    assert gfunc.stats()["hits"] == gfunc.stats()["pygfunction_calls"] == 0
+    assert gfunc.stats()["stored_depths"] == 4
 
 
 def test_floating_number():
@@ -424,3 +489,140 @@ def test_stuck_in_loop():
     for bor in borefield:
         bor.H = 110.5
     assert np.allclose(temp, gfunc.calculate(time_values, borefield, alpha))
+
+
+def test_same_depth_not_stored_twice():
+    gfunc = GFunction()
+    gvalues = np.array([0.1, 0.2, 0.3, 0.4])
+    assert gfunc.set_new_calculated_data(time_value_array, 100, gvalues, borefield, 2)
+    assert not gfunc.set_new_calculated_data(time_value_array, 100, gvalues, borefield, 2)
+    assert np.array_equal(gfunc.depth_array, np.array([100]))
+
+
+def test_other_time_values_not_mixed():
+    gfunc = GFunction()
+    gfunc.set_new_calculated_data(time_value_array, 100, np.array([0.1, 0.2, 0.3, 0.4]), borefield, 2)
+    # same length and range, but other time values, so the previous data can not be reused
+    assert gfunc.set_new_calculated_data(np.array([1, 200, 2000, 10000]), 110, np.array([0.1, 0.3, 0.4, 0.5]),
+                                         borefield, 2)
+    assert np.array_equal(gfunc.depth_array, np.array([110]))
+    assert np.array_equal(gfunc.time_array, np.array([1, 200, 2000, 10000]))
+
+
+def test_copy_and_threads():
+    gfunc = GFunction()
+    gfunc.set_new_calculated_data(time_value_array, 100, np.array([0.1, 0.2, 0.3, 0.4]), borefield, 2)
+    gfunc_copy = copy.deepcopy(gfunc)
+    assert np.array_equal(gfunc_copy.depth_array, gfunc.depth_array)
+    assert gfunc_copy._lock is not gfunc._lock
+
+
+def test_fork_and_join():
+    gfunc = GFunction()
+    alpha = 0.00005
+    time_values = borefield_ghe.load.time_L3[:120]
+    borefield_fork = copy.deepcopy(borefield)
+    _change_borefield_depth(borefield_fork, 100)
+    gfunc.calculate(time_values, borefield_fork, alpha)
+    forks = gfunc._fork(2)
+    assert forks[0].fifo_list is not forks[1].fifo_list and forks[0].fifo_list is not gfunc.fifo_list
+
+    _change_borefield_depth(borefield_fork, 120)
+    gvalues = [fork.calculate(time_values, borefield_fork, alpha) for fork in forks]
+    # the g-values are only calculated once, but every copy stores them in its own data
+    assert np.array_equal(gvalues[0], gvalues[1])
+    assert [fork.stats()["pygfunction_calls"] for fork in forks] == [1, 0]
+    assert all(np.array_equal(fork.depth_array, np.array([100, 120])) for fork in forks)
+    assert np.array_equal(gfunc.depth_array, np.array([100]))
+
+    gfunc._join(forks)
+    assert np.array_equal(gfunc.depth_array, np.array([100, 120]))
+    assert (gfunc.stats()["misses"], gfunc.stats()["pygfunction_calls"]) == (3, 2)
+
+
+def test_stored_data_of_previous_borefields():
+    gfunc = GFunction()
+    alpha = 0.00005
+    time_values = borefield_ghe.load.time_L3[:12]
+    borefield_1 = gt.boreholes.rectangle_field(5, 5, 5, 5, 100, 1, 0.075)
+    borefield_2 = gt.boreholes.rectangle_field(4, 4, 5, 5, 100, 1, 0.075)
+
+    gvalues_1 = gfunc.calculate(time_values, borefield_1, alpha)
+    gvalues_2 = gfunc.calculate(time_values, borefield_2, alpha)
+    assert (gfunc.hits, gfunc.misses) == (0, 2)
+    assert len(gfunc.stored_data) == 1
+
+    # switching back to the first borefield does not need a new calculation
+    assert np.array_equal(gfunc.calculate(time_values, borefield_1, alpha), gvalues_1)
+    assert np.array_equal(gfunc.calculate(time_values, borefield_2, alpha), gvalues_2)
+    assert (gfunc.hits, gfunc.misses) == (2, 2)
+
+    # other alpha or options are stored separately
+    gfunc.calculate(time_values, borefield_2, alpha * 2)
+    assert gfunc.misses == 3
+    gfunc.set_options_gfunction_calculation({"method": "similarities"})
+    assert gfunc.depth_array.size == 0
+    gfunc.calculate(time_values, borefield_2, alpha * 2)
+    assert gfunc.misses == 4
+    assert len(gfunc.stored_data) == 3
+
+    # the least recently used data is removed when the maximum size is exceeded
+    gfunc.max_stored_data_size = gfunc.stored_data_size
+    gfunc.set_options_gfunction_calculation({"method": "equivalent"})
+    assert len(gfunc.stored_data) == 3
+    assert GFunction._key(borefield_fingerprint(borefield_1), alpha, {"method": "equivalent"}) not in gfunc.stored_data
+    assert gfunc.stored_data_size <= gfunc.max_stored_data_size
+
+    gfunc.clear_stored_data()
+    assert len(gfunc.stored_data) == 0
+    assert gfunc.depth_array.size == 0
+
+
+def test_adaptive_interpolation():
+    gfunc = GFunction()
+    gfunc.interpolation_tolerance = 0.005
+    alpha = 0.00005
+    time_values = borefield_ghe.load.time_L3[:120]
+    borefield_adaptive = copy.deepcopy(borefield)
+    for depth in (90, 110):
+        _change_borefield_depth(borefield_adaptive, depth)
+        gfunc.calculate(time_values, borefield_adaptive, alpha)
+
+    # no third depth to estimate the error, although the depths are closer than threshold_depth_interpolation
+    assert not np.any(gfunc.interpolate_gfunctions(time_values, 100, alpha, borefield_adaptive))
+
+    _change_borefield_depth(borefield_adaptive, 120)
+    gfunc.calculate(time_values, borefield_adaptive, alpha)
+    _change_borefield_depth(borefield_adaptive, 100)
+    gvalues = gfunc.calculate(time_values, borefield_adaptive, alpha)
+    assert (gfunc.hits, gfunc.misses) == (1, 3)
+    assert np.allclose(gvalues, GFunction().calculate(time_values, borefield_adaptive, alpha), rtol=0.005)
+
+    # the estimated error is too large
+    gfunc.interpolation_tolerance = 1e-5
+    _change_borefield_depth(borefield_adaptive, 101)
+    gfunc.calculate(time_values, borefield_adaptive, alpha)
+    assert gfunc.misses == 4
+
+    # time values that are not in the stored data are not interpolated
+    assert not np.any(gfunc.interpolate_gfunctions(time_values[:-1] + 1, 100, alpha, borefield_adaptive))
+
+
+def test_adaptive_interpolation_keeps_data_of_other_time_values():
+    gfunc = GFunction()
+    gfunc.interpolation_tolerance = 0.005
+    alpha = 0.00005
+    time_values_1 = borefield_ghe.load.time_L3[:120]
+    time_values_2 = np.array([21600, 2649600, 21045600.])
+    borefield_adaptive = copy.deepcopy(borefield)
+    for depth in (90, 110, 120):
+        _change_borefield_depth(borefield_adaptive, depth)
+        gfunc.calculate(time_values_1, borefield_adaptive, alpha)
+        gfunc.calculate(time_values_2, borefield_adaptive, alpha)
+    assert len(gfunc.stored_data) == 1
+    assert gfunc.misses == 6
+
+    _change_borefield_depth(borefield_adaptive, 100)
+    gfunc.calculate(time_values_1, borefield_adaptive, alpha)
+    gfunc.calculate(time_values_2, borefield_adaptive, alpha)
+    assert (gfunc.hits, gfunc.misses) == (2, 6)
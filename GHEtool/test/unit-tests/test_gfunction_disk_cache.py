@@ -0,0 +1,89 @@
+import copy
+import os
+
+import numpy as np
+import pygfunction as gt
+import pytest
+
+from GHEtool import Borefield, GroundConstantTemperature
+from GHEtool.VariableClasses import GFunction, GFunctionDiskCache
+
+borefield = gt.boreholes.rectangle_field(5, 5, 5, 5, 100, 1, 0.075)
+time_values = np.array([3600, 3600 * 100, 3600 * 8760, 3600 * 8760 * 20.])
+alpha = 2 * 10 ** -6
+options = {"method": "equivalent"}
+
+
+def test_key():
+    key = GFunctionDiskCache.key(borefield, alpha, time_values, options)
+    assert key == GFunctionDiskCache.key(copy.deepcopy(borefield), alpha, time_values, dict(options))
+    assert key != GFunctionDiskCache.key(gt.boreholes.rectangle_field(5, 5, 5, 5, 110, 1, 0.075), alpha, time_values,
+                                         options)
+    assert key != GFunctionDiskCache.key(gt.boreholes.rectangle_field(5, 5, 6, 5, 100, 1, 0.075), alpha, time_values,
+                                         options)
+    assert key != GFunctionDiskCache.key(borefield, alpha * 1.01, time_values, options)
+    assert key != GFunctionDiskCache.key(borefield, alpha, time_values[:-1], options)
+    assert key != GFunctionDiskCache.key(borefield, alpha, time_values, {"method": "similarities"})
+
+
+def test_store_load(tmp_path):
+    cache = GFunctionDiskCache(tmp_path.joinpath("cache"))
+    assert cache.load("test") is None
+    cache.store("test", np.array([1., 2., 3.]))
+    assert np.array_equal(cache.load("test"), np.array([1., 2., 3.]))
+    assert cache.size > 0
+    # no temporary files are left
+    assert len(os.listdir(cache.folder)) == 1
+    cache.clear()
+    assert cache.load("test") is None
+    assert cache.size == 0
+
+
+def test_eviction(tmp_path):
+    cache = GFunctionDiskCache(tmp_path)
+    cache.store("first", np.zeros(100))
+    file_size = cache.size
+    cache.max_size = 2.5 * file_size
+    cache.store("second", np.zeros(100))
+    # first is used more recently than second
+    os.utime(cache._path("second"), (1, 1))
+    assert cache.load("first") is not None
+    cache.store("third", np.zeros(100))
+    assert cache.load("second") is None
+    assert cache.load("first") is not None
+    assert cache.load("third") is not None
+    assert cache.size <= cache.max_size
+
+
+def test_gfunction_with_disk_cache(tmp_path, monkeypatch):
+    gfunc = GFunction()
+    gfunc.set_disk_cache(tmp_path)
+    gvalues = gfunc.calculate(time_values, borefield, alpha)
+    assert np.allclose(gvalues, gt.gfunction.gFunction(borefield, alpha, time_values).gFunc)
+    assert len(os.listdir(tmp_path)) == 1
+
+    # a new object (e.g. in another process) does not need pygfunction anymore
+    def gfunction_not_allowed(*args, **kwargs):
+        raise AssertionError("pygfunction should not be called")  # pragma: no cover
+
+    monkeypatch.setattr(gt.gfunction, "gFunction", gfunction_not_allowed)
+    gfunc = GFunction()
+    gfunc.set_disk_cache(tmp_path)
+    assert np.array_equal(gfunc.calculate(time_values, borefield, alpha), gvalues)
+
+    gfunc.set_disk_cache(None)
+    assert gfunc.disk_cache is None
+
+
+def test_borefield_disk_cache(tmp_path):
+    borefield_ghe = Borefield()
+    borefield_ghe.set_borefield(copy.deepcopy(borefield))
+    borefield_ghe.set_ground_parameters(GroundConstantTemperature(3, 10))
+    borefield_ghe.set_gfunction_disk_cache(tmp_path, max_size=1e6)
+    gvalues = borefield_ghe.gfunction(time_values)
+    assert borefield_ghe.gfunction_calculation_object.disk_cache.max_size == 1e6
+    assert len(os.listdir(tmp_path)) == 1
+
+    borefield_ghe.gfunction_calculation_object.remove_previous_data()
+    assert np.array_equal(borefield_ghe.gfunction(time_values), gvalues)
+    assert len(os.listdir(tmp_path)) == 1
@@ -0,0 +1,87 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+from scipy import interpolate
+
+from GHEtool.VariableClasses import CustomGFunction, GFunction, GFunctionInterpolator
+from GHEtool.VariableClasses.CustomGFunction import _timeValues
+
+depth_array = np.array([50., 100., 150., 200.])
+time_array = _timeValues()
+# g-function like table, almost linear in log-time
+gvalues = np.array([np.log(time_array / 3600) * (1 + depth / 1000) + depth / 100 for depth in depth_array])
+
+
+def test_same_as_interpn():
+    interpolator = GFunctionInterpolator(depth_array, time_array, gvalues)
+    time_values = np.linspace(time_array[0], time_array[-1], 1000)
+    for depth in (50, 75.3, 100, 199.9, 200):
+        assert np.allclose(interpolator(depth, time_values),
+                           interpolate.interpn((depth_array, time_array), gvalues,
+                                               np.array([[depth, t] for t in time_values])))
+    assert np.allclose(interpolator(120, 36000.), interpolate.interpn((depth_array, time_array), gvalues,
+                                                                      np.array([120, 36000.])))
+    # only one depth
+    interpolator = GFunctionInterpolator(depth_array[:1], time_array, gvalues[0])
+    assert np.allclose(interpolator(50, time_values), np.interp(time_values, time_array, gvalues[0]))
+
+
+def test_log_time_and_cubic():
+    coarse = GFunctionInterpolator(depth_array, time_array[::2], gvalues[:, ::2], time_method="log")
+    linear = GFunctionInterpolator(depth_array, time_array[::2], gvalues[:, ::2])
+    exact = gvalues[1, 1:-1:2]
+    error_log = np.max(np.abs(coarse(100, time_array[1:-1:2]) - exact))
+    error_linear = np.max(np.abs(linear(100, time_array[1:-1:2]) - exact))
+    assert error_log < 1e-10 < error_linear
+
+    cubic = GFunctionInterpolator(depth_array, time_array, gvalues, depth_method="cubic")
+    assert np.allclose(cubic(100, time_array), gvalues[1])
+    assert np.allclose(cubic(125, time_array), np.log(time_array / 3600) * 1.125 + 1.25)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        GFunctionInterpolator(depth_array, time_array, gvalues, depth_method="quadratic")
+    with pytest.raises(ValueError):
+        GFunctionInterpolator(depth_array, time_array, gvalues, time_method="sqrt")
+    interpolator = GFunctionInterpolator(depth_array, time_array, gvalues)
+    with pytest.raises(ValueError):
+        interpolator(201, time_array)
+    with pytest.raises(ValueError):
+        interpolator(100, time_array[-1] * 2)
+    with pytest.raises(ValueError):
+        interpolator(100, time_array[0] / 2)
+
+
+def test_is_up_to_date():
+    interpolator = GFunctionInterpolator(depth_array, time_array, gvalues)
+    assert interpolator.is_up_to_date(depth_array, time_array, gvalues)
+    assert not interpolator.is_up_to_date(depth_array, time_array, copy.copy(gvalues))
+
+
+def test_gfunction_interpolator():
+    gfunc = GFunction()
+    gfunc.depth_array = depth_array
+    gfunc.time_array = time_array
+    gfunc.previous_gfunctions = gvalues
+    interpolator = gfunc._get_interpolator()
+    # the interpolator is only recreated when the data changes
+    assert gfunc._get_interpolator() is interpolator
+    gfunc.time_interpolation = "log"
+    assert gfunc._get_interpolator() is not interpolator
+    interpolator = gfunc._get_interpolator()
+    gfunc.previous_gfunctions = np.insert(gvalues, 2, gvalues[1], 0)
+    gfunc.depth_array = np.insert(depth_array, 2, 120)
+    assert gfunc._get_interpolator() is not interpolator
+
+
+def test_custom_gfunction_interpolator():
+    custom_gfunction = CustomGFunction(time_array, depth_array)
+    custom_gfunction.gvalues_array = gvalues
+    assert np.allclose(custom_gfunction.calculate_gfunction(time_array, 100), gvalues[1])
+    assert custom_gfunction._interpolator is not None
+    # the interpolator is not pickled
+    assert "_interpolator" not in pickle.loads(pickle.dumps(custom_gfunction)).__dict__
+    assert custom_gfunction == pickle.loads(pickle.dumps(custom_gfunction))
@@ -0,0 +1,144 @@
+import json
+
+import numpy as np
+import pygfunction as gt
+import pytest
+
+from GHEtool import Borefield, GroundConstantTemperature
+from GHEtool.VariableClasses import GFunctionLibrary, borefield_shape_fingerprint, build_standard_library
+
+alpha = 2e-6
+time_values = np.array([3600 * 6, 3600 * 24 * 30, 3600 * 8760, 3600 * 8760 * 20])
+log_time = np.round(np.arange(-11, 3.5, 0.25), 10)
+
+
+@pytest.fixture(scope="module")
+def library():
+    library = GFunctionLibrary(log_time=log_time)
+    library.add_shape("rectangle_field(2, 3)", gt.boreholes.rectangle_field(2, 3, 1, 1, 100, 1, 0.05),
+                      spacing_ratios=[0.05, 0.07], burial_ratios=[0.02, 0.04])
+    library.add_shape("single borehole", gt.boreholes.rectangle_field(1, 1, 1, 1, 100, 1, 0.05),
+                      burial_ratios=[0.02, 0.04])
+    return library
+
+
+def test_shape_fingerprint():
+    borefield = gt.boreholes.rectangle_field(3, 4, 5, 5, 100, 4, 0.075)
+    assert borefield_shape_fingerprint(borefield) == (borefield_shape_fingerprint(borefield)[0], 5)
+    # scaled borefields have the same shape
+    assert borefield_shape_fingerprint(gt.boreholes.rectangle_field(3, 4, 7, 7, 150, 1, 0.07)) == \
+           (borefield_shape_fingerprint(borefield)[0], 7)
+    assert borefield_shape_fingerprint(borefield)[0] != \
+           borefield_shape_fingerprint(gt.boreholes.rectangle_field(4, 3, 5, 5, 100, 4, 0.075))[0]
+    assert borefield_shape_fingerprint(borefield)[0] != \
+           borefield_shape_fingerprint(gt.boreholes.rectangle_field(3, 4, 5, 6, 100, 4, 0.075))[0]
+    assert borefield_shape_fingerprint(gt.boreholes.rectangle_field(1, 1, 5, 5, 100, 4, 0.075))[1] == 0
+
+
+def test_library_gvalues(library):
+    assert library.index == ["rectangle_field(2, 3)", "single borehole"]
+    # in between the grid points and with another radius
+    borefield = gt.boreholes.rectangle_field(2, 3, 7.5, 7.5, 125, 3.5, 0.07)
+    exact = gt.gfunction.gFunction(borefield, alpha, time_values, options=library.options, method="equivalent").gFunc
+    assert np.allclose(library.gvalues(time_values, borefield, alpha), exact, rtol=0.02)
+    # the depth can differ from the depth of the boreholes
+    borefield = gt.boreholes.rectangle_field(2, 3, 6, 6, 100, 3, 0.07)
+    assert np.allclose(library.gvalues(time_values, borefield, alpha, H=120),
+                       library.gvalues(time_values, gt.boreholes.rectangle_field(2, 3, 6, 6, 120, 3, 0.07), alpha))
+
+    borehole = gt.boreholes.rectangle_field(1, 1, 6, 6, 110, 3, 0.07)
+    exact = gt.gfunction.gFunction(borehole, alpha, time_values, options=library.options, method="equivalent").gFunc
+    assert np.allclose(library.gvalues(time_values, borehole, alpha), exact, rtol=0.02)
+
+
+def test_library_not_available(library):
+    borefield = gt.boreholes.rectangle_field(2, 3, 6, 6, 100, 3, 0.07)
+    assert library.gvalues(time_values, borefield, alpha) is not None
+    # B/H, D/H and time values out of range
+    assert library.gvalues(time_values, gt.boreholes.rectangle_field(2, 3, 8, 8, 100, 3, 0.07), alpha) is None
+    assert library.gvalues(time_values, gt.boreholes.rectangle_field(2, 3, 6, 6, 100, 5, 0.07), alpha) is None
+    assert library.gvalues(time_values * 1000, borefield, alpha) is None
+    # other shapes and options
+    assert library.gvalues(time_values, gt.boreholes.rectangle_field(3, 2, 6, 6, 100, 3, 0.07), alpha) is None
+    assert library.gvalues(time_values, borefield, alpha, options={"method": "similarities"}) is None
+    assert library.gvalues(time_values, [], alpha) is None
+    # boreholes with another depth, buried depth or radius
+    for parameter in ("H", "D", "r_b"):
+        borefield = gt.boreholes.rectangle_field(2, 3, 6, 6, 100, 3, 0.07)
+        setattr(borefield[-1], parameter, getattr(borefield[-1], parameter) * 1.1)
+        assert library.gvalues(time_values, borefield, alpha) is None
+
+
+def test_library_shape_cache(library):
+    borefield = gt.boreholes.rectangle_field(2, 3, 6, 6, 100, 3, 0.07)
+    gvalues = library.gvalues(time_values, borefield, alpha, fingerprint="test")
+    assert library._shape_cache["test"] == borefield_shape_fingerprint(borefield)
+    assert np.array_equal(library.gvalues(time_values, borefield, alpha, fingerprint="test"), gvalues)
+    library._shape_cache.clear()
+
+
+def test_save_load_library(library, tmp_path):
+    library.save(tmp_path / "library.npz")
+    loaded = GFunctionLibrary.load(tmp_path / "library.npz")
+    assert loaded.index == library.index
+    assert loaded.options == library.options
+    assert loaded.radius_ratio == library.radius_ratio
+    assert np.array_equal(loaded.log_time, library.log_time)
+    borefield = gt.boreholes.rectangle_field(2, 3, 6, 6, 100, 3, 0.07)
+    assert np.array_equal(loaded.gvalues(time_values, borefield, alpha), library.gvalues(time_values, borefield, alpha))
+
+
+def test_load_library_newer_version(library, tmp_path):
+    library.save(tmp_path / "library.npz")
+    with np.load(tmp_path / "library.npz") as data:
+        arrays = {key: data[key] for key in data.files}
+    index = json.loads(str(arrays["index"]))
+    index["version"] = GFunctionLibrary.VERSION + 1
+    arrays["index"] = json.dumps(index)
+    np.savez_compressed(tmp_path / "library.npz", **arrays)
+    with pytest.raises(ValueError):
+        GFunctionLibrary.load(tmp_path / "library.npz")
+
+
+def test_default_library():
+    library = GFunctionLibrary.load_default()
+    assert "rectangle_field(4, 4)" in library.index
+    borefield = gt.boreholes.rectangle_field(2, 2, 6, 6, 110, 3, 0.07)
+    exact = gt.gfunction.gFunction(borefield, alpha, time_values, options=library.options, method="equivalent").gFunc
+    assert np.allclose(library.gvalues(time_values, borefield, alpha), exact, rtol=0.02)
+
+
+def test_build_standard_library():
+    library = build_standard_library([1, 2], spacing_ratios=[0.05], burial_ratios=[0.02])
+    # the L-shaped field of 2 x 2 boreholes is the only shape that is not a rectangular field
+    assert library.index == ["rectangle_field(1, 1)", "rectangle_field(1, 2)", "rectangle_field(2, 1)",
+                             "rectangle_field(2, 2)", "L_shaped_field(2, 2)"]
+
+
+def test_borefield_gfunction_library(library, tmp_path, monkeypatch):
+    borefield = Borefield()
+    borefield.set_ground_parameters(GroundConstantTemperature(3, 10))
+    borefield.set_borefield(gt.boreholes.rectangle_field(2, 3, 6, 6, 100, 3, 0.07))
+    exact = borefield.gfunction(time_values)
+    borefield.gfunction_calculation_object.remove_previous_data()
+    library.save(tmp_path / "library.npz")
+    borefield.set_gfunction_library(str(tmp_path / "library.npz"))
+    assert borefield.gfunction_library.index == library.index
+
+    def gfunction_not_allowed(*args, **kwargs):
+        raise AssertionError("pygfunction should not be called")  # pragma: no cover
+
+    with monkeypatch.context() as patch:
+        patch.setattr(gt.gfunction, "gFunction", gfunction_not_allowed)
+        assert np.allclose(borefield.gfunction(time_values), exact, rtol=0.02)
+        assert np.array_equal(borefield.gfunction(time_values, H=110),
+                              library.gvalues(time_values, borefield.borefield, borefield.ground_data.alpha, H=110))
+
+    # borefields that are not in the library are calculated with pygfunction
+    borefield.set_gfunction_library(library)
+    borefield.set_borefield(gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 3, 0.07))
+    assert library.gvalues(time_values, borefield.borefield, borefield.ground_data.alpha) is None
+    assert np.all(borefield.gfunction(time_values) > 0)
+
+    borefield.set_gfunction_library(None)
+    assert borefield.gfunction_library is None
@@ -1,6 +1,8 @@
 import pytest
 
 import numpy as np
+import pandas as pd
+from scipy.signal import convolve
 
 from GHEtool import FOLDER
 from GHEtool.VariableClasses import HourlyGeothermalLoad, HourlyGeothermalLoadMultiYear, MonthlyGeothermalLoadAbsolute
@@ -47,6 +49,57 @@ def test_resample_to_monthly():
                                               275892., 276088., 258920., 276144., 258880., 276200.]))
 
 
+def test_resample_to_monthly_calendar():
+    load = HourlyGeothermalLoad()
+    load.all_months_equal = False
+    hourly_load = np.random.default_rng(0).random(8760)
+    df = pd.DataFrame(hourly_load, index=HourlyGeothermalLoad.HOURS_SERIES, columns=['load'])
+    peak, baseload = load.resample_to_monthly(hourly_load)
+    assert np.array_equal(peak, np.array(df.resample('M').max()['load']))
+    assert np.allclose(baseload, np.array(df.resample('M').sum()['load']))
+
+
+def test_aggregates_cache():
+    load = HourlyGeothermalLoad(np.repeat(np.linspace(0, 11, 12), 730), np.ones(8760))
+    peak_heating = load.peak_heating
+    assert load.peak_heating is peak_heating
+    assert load.baseload_heating is load._resample_hourly_load(True)[1]
+    assert not peak_heating.flags.writeable
+    # the cache is invalidated when the load, the domestic hot water or the month definition changes
+    load.hourly_heating_load = np.repeat(np.linspace(1, 12, 12), 730)
+    assert np.array_equal(load.peak_heating, np.linspace(1, 12, 12))
+    load.dhw = 8760
+    assert np.array_equal(load.peak_heating, np.linspace(2, 13, 12))
+    load.all_months_equal = False
+    assert np.isclose(np.sum(load.baseload_heating), np.sum(load.hourly_heating_load))
+    assert np.array_equal(load.peak_cooling, np.ones(12))
+    load.hourly_cooling_load = np.ones(8760) * 2
+    assert np.array_equal(load.peak_cooling, np.ones(12) * 2)
+
+    load = HourlyGeothermalLoadMultiYear(np.zeros(8760 * 2), np.ones(8760 * 2))
+    assert np.array_equal(load.baseload_cooling, np.ones(12) * 730)
+    load.hourly_cooling_load = np.ones(8760 * 2) * 2
+    assert np.array_equal(load.baseload_cooling, np.ones(12) * 1460)
+
+
+def test_load_not_changed_in_place():
+    for load_class, length in ((HourlyGeothermalLoad, 8760), (HourlyGeothermalLoadMultiYear, 8760 * 2)):
+        cooling = np.ones(length)
+        load = load_class(np.zeros(length), cooling)
+        assert np.array_equal(load.peak_cooling, np.ones(12))
+        # the load is copied, so changing the original array does not change the (cached) values
+        cooling[5] = 100
+        assert np.array_equal(load.hourly_cooling_load_simulation_period, np.ones(load.simulation_period * 8760))
+        assert np.array_equal(load.peak_cooling, np.ones(12))
+        with pytest.raises(ValueError):
+            load._hourly_cooling_load[5] = 100
+        assert load._hourly_cooling_load.dtype == np.float64
+    # read-only arrays that cannot be changed are not copied
+    cooling = np.ones(8760)
+    cooling.flags.writeable = False
+    assert HourlyGeothermalLoad(np.zeros(8760), cooling).hourly_cooling_load is cooling
+
+
 def test_baseload_heating():
     load = HourlyGeothermalLoad()
     assert np.array_equal(load.baseload_heating, np.zeros(12))
@@ -95,6 +148,24 @@ def test_load_simulation_period():
                           np.tile(-np.linspace(0, 8759, 8760)+np.linspace(50, 8759, 8760), load.simulation_period))
 
 
+def test_load_per_year():
+    load = HourlyGeothermalLoad(np.linspace(0, 8759, 8760), np.linspace(50, 8759, 8760), simulation_period=3)
+    assert load.hourly_load_per_year.shape == (3, 8760)
+    assert load.hourly_load_per_year.strides[0] == 0
+    assert not load.hourly_load_per_year.flags.writeable
+    assert np.array_equal(load.hourly_load_per_year.ravel(), load.hourly_load_simulation_period)
+    assert np.array_equal(load.hourly_heating_load_per_year[2], load.hourly_heating_load)
+    assert np.array_equal(load.hourly_cooling_load_per_year[1], load.hourly_cooling_load)
+
+    load = HourlyGeothermalLoadMultiYear(np.arange(8760 * 2), np.ones(8760 * 2))
+    heating_per_year = load.hourly_heating_load_per_year
+    assert np.shares_memory(heating_per_year, load._hourly_heating_load)
+    assert not heating_per_year.flags.writeable
+    assert np.array_equal(heating_per_year[1], np.arange(8760, 8760 * 2))
+    assert np.array_equal(load.hourly_load_per_year.ravel(), load.hourly_load_simulation_period)
+    assert np.array_equal(load.hourly_load_simulation_period, np.ones(8760 * 2) - np.arange(8760 * 2))
+
+
 def test_set_hourly_values():
     load = HourlyGeothermalLoad()
     try:
@@ -108,6 +179,28 @@ def test_set_hourly_values():
     except ValueError:
         assert True
 
+
+def test_convolve_hourly_load():
+    load = HourlyGeothermalLoad(simulation_period=3)
+    load.hourly_heating_load = np.linspace(0, 8759, 8760)
+    g_value_differences = np.diff(np.log(np.arange(1, 8760 * 3 + 2)))
+    assert np.allclose(load.convolve_hourly_load(g_value_differences),
+                       convolve(load.hourly_load_simulation_period * 1000, g_value_differences)[:8760 * 3])
+    assert load._convolution.is_set
+    # the spectrum is deleted when the load changes
+    load.hourly_cooling_load = np.linspace(50, 8759, 8760)
+    assert not load._convolution.is_set
+    assert np.allclose(load.convolve_hourly_load(g_value_differences),
+                       convolve(load.hourly_load_simulation_period * 1000, g_value_differences)[:8760 * 3])
+    # the spectrum is recalculated when the simulation period or the dhw changes
+    load.simulation_period = 2
+    assert np.allclose(load.convolve_hourly_load(g_value_differences[:8760 * 2]),
+                       convolve(load.hourly_load_simulation_period * 1000, g_value_differences[:8760 * 2])[:8760 * 2])
+    load.dhw = 8760
+    assert np.allclose(load.convolve_hourly_load(g_value_differences[:8760 * 2]),
+                       convolve(load.hourly_load_simulation_period * 1000, g_value_differences[:8760 * 2])[:8760 * 2])
+
+
 ### continue for multi year
 def test_checks_multiyear():
     load = HourlyGeothermalLoadMultiYear()
@@ -159,6 +252,32 @@ def test_set_hourly_values_multi_year():
         assert True
 
 
+def test_per_year_multi_year():
+    heating = np.concatenate((np.repeat(np.linspace(0, 11, 12), 730), 2 * np.repeat(np.linspace(0, 11, 12), 730)))
+    load = HourlyGeothermalLoadMultiYear(heating, np.ones(8760 * 2))
+    assert np.array_equal(load.peak_heating_per_year, np.array([np.linspace(0, 11, 12), np.linspace(0, 22, 12)]))
+    assert np.array_equal(load.baseload_heating_per_year, load.peak_heating_per_year * 730)
+    assert np.array_equal(load.baseload_heating_power_per_year, load.peak_heating_per_year)
+    assert np.array_equal(load.peak_cooling_per_year, np.ones((2, 12)))
+    assert np.array_equal(load.monthly_average_load_per_year, 1 - load.peak_heating_per_year)
+    assert np.array_equal(load.peak_heating_simulation_period, load.peak_heating_per_year.ravel())
+    assert np.array_equal(load.monthly_average_load_simulation_period, load.monthly_average_load_per_year.ravel())
+    # the yearly mean profile is used for the monthly values of one year
+    assert np.array_equal(load.peak_heating, np.mean(load.peak_heating_per_year, axis=0))
+
+    # cached until the load or the month definition changes
+    assert load.peak_heating_per_year is load.peak_heating_per_year
+    assert load.hourly_heating_load is load.hourly_heating_load
+    assert not load.hourly_heating_load.flags.writeable
+    load.all_months_equal = False
+    assert np.isclose(np.sum(load.baseload_heating_per_year), np.sum(heating))
+    assert load.peak_heating_per_year[1, 1] == 2 and load.peak_heating_per_year[1, 2] == 4
+    load.hourly_heating_load = np.ones(8760 * 3)
+    assert load.simulation_period == 3
+    assert np.array_equal(load.hourly_heating_load, np.ones(8760))
+    assert np.array_equal(load.peak_heating_per_year, np.ones((3, 12)))
+
+
 def test_dhw():
     load = HourlyGeothermalLoad()
     assert load.dhw == 0.
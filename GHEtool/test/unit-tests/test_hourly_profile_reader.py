@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from GHEtool import FOLDER
+from GHEtool.VariableClasses import HourlyGeothermalLoad, HourlyGeothermalLoadMultiYear, read_hourly_profile, \
+    clear_hourly_profile_cache
+from GHEtool.VariableClasses.LoadData import HourlyProfileReader
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_hourly_profile_cache()
+    yield
+    clear_hourly_profile_cache()
+
+
+@pytest.mark.parametrize("file_name, header, separator, decimal_seperator", [
+    ("Examples/hourly_profile.csv", True, ";", "."),
+    ("Examples/hourly_profile_comma_as_sep.csv", True, ",", "."),
+    ("test/methods/hourly_data/hourly_profile_without_header.csv", False, ";", "."),
+    ("test/methods/hourly_data/problem_data.csv", True, ";", ","),
+    ("test/methods/hourly_data/swimming_pool.csv", True, ";", ".")])
+def test_read_csv(file_name, header, separator, decimal_seperator):
+    df = pd.read_csv(FOLDER.joinpath(file_name), sep=separator, header=0 if header else None,
+                     decimal=decimal_seperator)
+    heating, cooling = read_hourly_profile(FOLDER.joinpath(file_name), header, separator, decimal_seperator, (1, 0))
+    assert np.array_equal(heating, df.iloc[:, 1])
+    assert np.array_equal(cooling, df.iloc[:, 0])
+    assert heating.flags.c_contiguous
+
+
+def test_read_csv_in_chunks(tmp_path, monkeypatch):
+    profile = np.random.default_rng(0).random((8760 * 3 + 100, 3)) * 100
+    np.savetxt(tmp_path / "profile.csv", profile, delimiter=";", header="a;b;c", comments="")
+    monkeypatch.setattr(HourlyProfileReader, "CHUNK_SIZE", 1000)
+    columns = read_hourly_profile(str(tmp_path / "profile.csv"), columns=(2, 0, 2), cache=False)
+    assert np.allclose(columns[0], profile[:, 2])
+    assert np.allclose(columns[1], profile[:, 0])
+    assert np.array_equal(columns[0], columns[2])
+
+
+def test_cache(tmp_path):
+    np.savetxt(tmp_path / "profile.csv", np.ones((8760, 2)), delimiter=";")
+    heating, cooling = read_hourly_profile(str(tmp_path / "profile.csv"), header=False)
+    assert read_hourly_profile(str(tmp_path / "profile.csv"), header=False)[0] is heating
+    assert not heating.flags.writeable
+    # other options are parsed again
+    assert read_hourly_profile(str(tmp_path / "profile.csv"), header=False, columns=(1, 0))[0] is not heating
+    assert read_hourly_profile(str(tmp_path / "profile.csv"), header=False, cache=False)[0] is not heating
+    # a changed file is parsed again
+    np.savetxt(tmp_path / "profile.csv", np.ones((8760, 2)) * 2, delimiter=";")
+    os.utime(tmp_path / "profile.csv", ns=(0, os.stat(tmp_path / "profile.csv").st_mtime_ns + 10 ** 9))
+    assert np.array_equal(read_hourly_profile(str(tmp_path / "profile.csv"), header=False)[0], np.ones(8760) * 2)
+    clear_hourly_profile_cache()
+    assert HourlyProfileReader._profile_cache == {}
+
+
+def test_cache_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(HourlyProfileReader, "MAX_CACHE_SIZE", 2)
+    np.savetxt(tmp_path / "profile.csv", np.ones((10, 3)), delimiter=";")
+    for columns in ((0, 1), (1, 2), (0, 2)):
+        read_hourly_profile(str(tmp_path / "profile.csv"), header=False, columns=columns)
+    assert len(HourlyProfileReader._profile_cache) == 2
+    assert [key[-1] for key in HourlyProfileReader._profile_cache] == [(1, 2), (0, 2)]
+
+
+def test_save_and_load_binary(tmp_path):
+    load = HourlyGeothermalLoadMultiYear(np.arange(8760 * 2), np.ones(8760 * 2))
+    load.save_hourly_profile(str(tmp_path / "profile.npy"))
+    heating, cooling = read_hourly_profile(str(tmp_path / "profile.npy"))
+    assert isinstance(heating, np.memmap)
+    assert heating.flags.c_contiguous
+    new_load = HourlyGeothermalLoadMultiYear()
+    new_load.load_hourly_profile(str(tmp_path / "profile.npy"))
+    assert np.array_equal(new_load.hourly_heating_load_simulation_period, np.arange(8760 * 2))
+    assert np.array_equal(new_load.hourly_cooling_load_simulation_period, np.ones(8760 * 2))
+    assert new_load.simulation_period == 2
+    # the memory-mapped profile is not copied in the load
+    assert isinstance(new_load._hourly_heating_load, np.memmap)
+
+    np.savez(tmp_path / "profile.npz", np.column_stack((np.ones(8760), np.zeros(8760))))
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(str(tmp_path / "profile.npz"), col_heating=1, col_cooling=0)
+    assert np.array_equal(load.hourly_heating_load, np.zeros(8760))
+    assert np.array_equal(load.hourly_cooling_load, np.ones(8760))
+
+    np.save(tmp_path / "single.npy", np.ones(8760))
+    assert np.array_equal(read_hourly_profile(str(tmp_path / "single.npy"), columns=(0,))[0], np.ones(8760))
+    np.save(tmp_path / "wrong.npy", np.ones((8760, 2, 2)))
+    with pytest.raises(ValueError):
+        read_hourly_profile(str(tmp_path / "wrong.npy"))
+
+
+def test_save_over_memory_mapped_profile(tmp_path):
+    HourlyGeothermalLoad(np.ones(8760), np.ones(8760)).save_hourly_profile(str(tmp_path / "profile.npy"))
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(str(tmp_path / "profile.npy"))
+    assert np.array_equal(load.peak_heating, np.ones(12))
+    # the file is replaced, so the memory-mapped profile of the first load does not change
+    HourlyGeothermalLoad(np.ones(8760) * 5, np.ones(8760) * 5).save_hourly_profile(str(tmp_path / "profile.npy"))
+    HourlyGeothermalLoadMultiYear(np.ones(8760 * 2) * 3, np.ones(8760 * 2)).save_hourly_profile(
+        str(tmp_path / "profile"))
+    assert np.array_equal(load.hourly_heating_load, np.ones(8760))
+    assert np.array_equal(load.peak_heating, np.ones(12))
+    assert np.array_equal(read_hourly_profile(str(tmp_path / "profile.npy"))[0], np.ones(8760 * 2) * 3)
+    assert [path.name for path in tmp_path.iterdir()] == ["profile.npy"]
+
+
+def test_file_not_found():
+    with pytest.raises(FileNotFoundError):
+        read_hourly_profile("not_existing.csv")
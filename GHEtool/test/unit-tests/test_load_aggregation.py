@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from scipy.signal import convolve
+
+from GHEtool.VariableClasses import LoadAggregation
+
+load = np.tile(np.sin(np.linspace(0, 2 * np.pi, 8760)) * 100, 5)
+
+
+def gfunction(time):
+    return np.log1p(time / 3600 / 50)
+
+
+def test_time_values():
+    aggregation = LoadAggregation()
+    time_values = aggregation.time_values(8760 * 5)
+    assert np.array_equal(time_values[:6], np.array([1, 2, 3, 4, 5, 7]) * 3600.)
+    assert time_values[-1] >= 8760 * 5 * 3600
+    assert np.all(np.diff(time_values) > 0)
+
+
+def test_calculate():
+    aggregation = LoadAggregation()
+    g_values = gfunction(aggregation.time_values(load.size))
+    result = convolve(load, np.diff(gfunction(np.arange(1, load.size + 1) * 3600.), prepend=0))[:load.size]
+    assert np.allclose(aggregation.calculate(load, g_values), result, atol=0.01 * np.max(np.abs(result)))
+    # the first five hours are calculated exactly
+    assert np.allclose(aggregation.calculate(load, g_values)[:5], result[:5])
+
+    # shorter load
+    g_values = gfunction(aggregation.time_values(100))
+    assert np.allclose(aggregation.calculate(load[:100], g_values), result[:100], atol=0.01 * np.max(np.abs(result)))
+
+
+def test_errors():
+    aggregation = LoadAggregation()
+    with pytest.raises(ValueError):
+        aggregation.calculate(load, np.ones(10))
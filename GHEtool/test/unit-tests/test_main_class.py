@@ -5,11 +5,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pygfunction as gt
 import pytest
+from scipy.signal import convolve
 
 from GHEtool import GroundConstantTemperature, GroundFluxTemperature, FluidData, DoubleUTube, Borefield, CalculationSetup, FOLDER, MultipleUTube
 from GHEtool.logger import ghe_logger
 from GHEtool.Validation.cases import load_case
-from GHEtool.VariableClasses.LoadData import MonthlyGeothermalLoadAbsolute, HourlyGeothermalLoad
+from GHEtool.VariableClasses.LoadData import MonthlyGeothermalLoadAbsolute, HourlyGeothermalLoad, \
+    HourlyGeothermalLoadMultiYear
 from GHEtool.VariableClasses.BaseClass import UnsolvableDueToTemperatureGradient
 
 data = GroundConstantTemperature(3, 10)
@@ -201,6 +203,20 @@ def test_set_Rb():
     assert borefield.Rb == borefield.borehole._Rb
 
 
+def test_set_Rb_curve():
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.set_fluid_parameters(fluidData)
+    borefield.set_pipe_parameters(pipeData)
+    borefield.set_Rb_curve(np.arange(50, 151, 10))
+    assert borefield.borehole._Rb_curve is not None
+    borefield.H = 123.4
+    assert np.isclose(borefield.Rb, borefield.borehole.calculate_Rb(123.4, borefield.D, borefield.r_b,
+                                                                   borefield.ground_data.k_s), rtol=1e-3)
+    assert borefield.borehole._Rb_cache == {}
+
+
 def test_ground_data_custom_gfunction():
     borefield = Borefield(borefield=copy.deepcopy(borefield_gt))
     assert borefield.ground_data == GroundConstantTemperature()
@@ -511,6 +527,8 @@ def test_size_L4():
     assert borefield.calculate_quadrant() == 3
     # quadrant 4
     borefield.borefield = copy.deepcopy(borefield_gt)
+    # the g-values of the same borefield are kept, so start without them to have the same result as a new borefield
+    borefield.gfunction_calculation_object.clear_stored_data()
     load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
     borefield.load = load
 
@@ -972,3 +990,236 @@ def test_deep_sizing(case, result):
 
     # methods should more or less lead to the same results, 1% diff taken as a reference
     assert np.allclose(result, borefield._size_based_on_temperature_profile(10, deep_sizing=False)[0], rtol=0.01)
+
+
+def test_calculate_first_and_last_year_temperature_profile():
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(data_ground_flux)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    for hourly, length in ((False, 12), (True, 8760)):
+        borefield._calculate_temperature_profile(110, hourly=hourly)
+        results = copy.deepcopy(borefield.results)
+        borefield._calculate_first_and_last_year_temperature_profile(110, hourly=hourly)
+        assert len(borefield.results.Tb) == 2 * length
+        assert np.allclose(borefield.results.Tb[:length], results.Tb[:length])
+        assert np.allclose(borefield.results.Tb[length:], results.Tb[-length:])
+        assert np.allclose(borefield.results.peak_cooling[:length], results.peak_cooling[:length])
+        assert np.allclose(borefield.results.peak_cooling[length:], results.peak_cooling[-length:])
+        assert np.allclose(borefield.results.peak_heating[:length], results.peak_heating[:length])
+        assert np.allclose(borefield.results.peak_heating[length:], results.peak_heating[-length:])
+
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    try:
+        borefield._calculate_first_and_last_year_temperature_profile(110, hourly=True)
+        assert False  # pragma: no cover
+    except ValueError:
+        assert True
+
+
+def test_convolve_first_and_last_year():
+    load = np.array([1., -2., 3., 0.5])
+    g_value_differences = np.linspace(1, 0.1, 20)
+    result = convolve(np.tile(load, 5), g_value_differences)[:20]
+    assert np.allclose(Borefield._convolve_first_and_last_year(load, g_value_differences),
+                       np.concatenate((result[:4], result[-4:])))
+    # only one year
+    assert np.allclose(Borefield._convolve_first_and_last_year(load, g_value_differences[:4]),
+                       np.tile(result[:4], 2))
+
+
+def test_size_first_and_last_year_sizing():
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(ground_data_constant)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    depth_L3 = borefield.size_L3(100)
+    depth_L4 = borefield.size_L4(100)
+    borefield.calculation_setup(first_and_last_year_sizing=True)
+    assert np.isclose(depth_L3, borefield.size_L3(100))
+    assert np.isclose(depth_L4, borefield.size_L4(100))
+    assert np.isclose(borefield.size_L4(100, quadrant_sizing=2), borefield.H)
+    assert len(borefield.results.peak_cooling) == 2 * 8760
+
+
+def test_load_aggregation():
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(ground_data_constant)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculate_temperatures(110, hourly=True)
+    results = copy.deepcopy(borefield.results)
+    depth = borefield.size_L4(100)
+    borefield.calculation_setup(load_aggregation=True)
+    borefield.calculate_temperatures(110, hourly=True)
+    assert np.allclose(borefield.results.Tb, results.Tb, atol=0.01)
+    assert np.allclose(borefield.results.peak_cooling, results.peak_cooling, atol=0.01)
+    assert np.allclose(borefield.results.peak_heating, results.peak_heating, atol=0.01)
+    assert np.isclose(borefield.size_L4(100), depth, rtol=0.001)
+
+
+def test_temperature_profile_multi_year():
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(data_ground_flux)
+    load = HourlyGeothermalLoad(simulation_period=2)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    borefield.calculate_temperatures(100)
+    periodic = borefield.results.peak_cooling
+
+    # the second year has a higher cooling load
+    borefield.load = HourlyGeothermalLoadMultiYear(np.tile(load.hourly_heating_load, 2),
+                                                   np.concatenate((load.hourly_cooling_load,
+                                                                   load.hourly_cooling_load * 1.5)))
+    borefield.calculate_temperatures(100)
+    assert np.allclose(borefield.results.peak_cooling[:12], periodic[:12])
+    assert np.all(borefield.results.peak_cooling[12:] >= periodic[12:])
+    assert np.max(borefield.results.peak_cooling[12:]) > np.max(periodic[12:])
+
+
+def test_temperature_envelope():
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(data_ground_flux)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    depths = [80, 120, 160]
+
+    for hourly in (False, True):
+        minimum, maximum = borefield.temperature_envelope(depths, hourly=hourly)
+        assert len(minimum) == len(maximum) == 3
+        for i, depth in enumerate(depths):
+            borefield.calculate_temperatures(depth, hourly=hourly)
+            assert np.isclose(minimum[i], np.min(borefield.results.peak_heating))
+            assert np.isclose(maximum[i], np.max(borefield.results.peak_cooling))
+
+    borefield.calculation_setup(load_aggregation=True)
+    minimum_agg, maximum_agg = borefield.temperature_envelope(depths, hourly=True)
+    assert np.allclose(minimum_agg, minimum, atol=0.01)
+    assert np.allclose(maximum_agg, maximum, atol=0.01)
+
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    with pytest.raises(ValueError):
+        borefield.temperature_envelope(depths, hourly=True)
+
+
+@pytest.mark.parametrize("ground_data, case", [(ground_data_constant, 1), (ground_data_constant, 2),
+                                               (data_ground_flux, 3), (data_ground_flux, 4)])
+def test_bracketing_sizing(ground_data, case):
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(ground_data)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(case))
+
+    bracketing = copy.deepcopy(borefield)
+    bracketing.calculation_setup(bracketing_sizing=True)
+
+    depth_L2 = borefield.size_L2(100)
+    depth_L3 = borefield.size_L3(100)
+    # no statistics for the proportional update
+    assert borefield.sizing_statistics is None
+    assert np.isclose(bracketing.size_L2(100), depth_L2, rtol=0.005)
+    assert np.isclose(bracketing.size_L3(100), depth_L3, rtol=0.005)
+    # the bracketing sizing needs no more g-function evaluations when the proportional update converges
+    assert bracketing._gfunction_evaluations <= borefield._gfunction_evaluations
+    assert bracketing.sizing_statistics.iterations > 0
+    assert bracketing.sizing_statistics.gfunction_evaluations >= bracketing.sizing_statistics.iterations
+    assert abs(bracketing.sizing_statistics.residual) < 0.05
+
+
+def test_bracketing_sizing_cycling():
+    borefield = Borefield()
+    borefield.H = 60
+    # the proportional update cycles between 60 m and 140 m around the solution of 100 m
+    depth = borefield._find_depth(lambda: (200 - borefield.H, (100 - borefield.H) / 10))
+    assert np.isclose(depth, 100)
+    assert borefield.sizing_statistics.iterations <= 5
+    assert borefield.sizing_statistics.gfunction_evaluations == 0
+    assert np.isclose(borefield.sizing_statistics.residual, 0)
+
+
+def test_bracketing_sizing_no_solution():
+    borefield = Borefield()
+    borefield.create_rectangular_borefield(10, 5, 7, 7, 100, 0.75)
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    borefield.calculation_setup(bracketing_sizing=True)
+    assert borefield._size_based_on_temperature_profile(10) == (0, False)
+
+    borefield = Borefield(load=MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    borefield.set_ground_parameters(GroundFluxTemperature(3, 12))
+    borefield.set_borefield(gt.boreholes.rectangle_field(5, 5, 6, 6, 110, 4, 0.075))
+    borefield.set_Rb(0.2)
+    borefield.calculation_setup(bracketing_sizing=True)
+    with pytest.raises(UnsolvableDueToTemperatureGradient):
+        borefield.size_L2(100)
+
+
+@pytest.mark.parametrize("ground_data, case", [(ground_data_constant, 1), (ground_data_constant, 2),
+                                               (data_ground_flux, 3), (data_ground_flux, 4)])
+def test_concurrent_sizing(ground_data, case):
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(ground_data)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(case))
+
+    depth_L2 = borefield.size_L2(100)
+    quadrant_L2 = borefield.limiting_quadrant
+    depth_L3 = borefield.size_L3(100)
+    quadrant_L3 = borefield.limiting_quadrant
+
+    borefield.calculation_setup(concurrent_sizing=True)
+    assert np.isclose(borefield.size_L2(100), depth_L2, rtol=0.005)
+    assert borefield.limiting_quadrant == quadrant_L2
+    assert np.isclose(borefield.size_L3(100), depth_L3, rtol=0.005)
+    assert borefield.limiting_quadrant == quadrant_L3
+    # the results correspond with the limiting quadrant
+    if quadrant_L3 in (1, 2):
+        assert np.isclose(np.max(borefield.results.peak_cooling), borefield.Tf_max, atol=0.1)
+    else:
+        assert np.isclose(np.min(borefield.results.peak_heating), borefield.Tf_min, atol=0.1)
+
+
+@pytest.mark.parametrize("case", [3, 4])
+def test_concurrent_sizing_repeatable(case):
+    def size() -> tuple:
+        borefield = Borefield()
+        borefield.borefield = copy.deepcopy(borefield_gt)
+        borefield.set_ground_parameters(data_ground_flux)
+        borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(case))
+        borefield.calculation_setup(concurrent_sizing=True)
+        return borefield.size_L2(100), borefield.size_L3(100)
+
+    depths = size()
+    # the quadrants do not influence each other, so the results are exactly the same for every run
+    for _ in range(3):
+        assert size() == depths
+
+
+def test_concurrent_sizing_state():
+    borefield = Borefield(load=MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.set_pipe_parameters(pipeData)
+    borefield.set_fluid_parameters(fluidData)
+
+    results = borefield._size_quadrants_concurrently(lambda other: other.borehole, lambda other: other.borehole)
+    boreholes = [future.result() for future, _ in results]
+    assert boreholes[0] is not boreholes[1]
+    assert all(borehole is not borefield.borehole and borehole == borefield.borehole for borehole in boreholes)
+    for _, other in results:
+        assert other.borefield is not borefield.borefield
+        assert other.gfunction_calculation_object is not borefield.gfunction_calculation_object
+        # shared on purpose
+        assert other.load is borefield.load
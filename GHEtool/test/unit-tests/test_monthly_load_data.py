@@ -141,6 +141,22 @@ def test_monthly_average_load():
     assert np.isclose(np.sum(np.multiply(load.baseload_heating_power, load.UPM)), 500 * 12)
 
 
+def test_load_per_year():
+    load = MonthlyGeothermalLoadAbsolute()
+    load.baseload_cooling = np.linspace(100, 1200, 12)
+    load.baseload_heating = np.ones(12) * 500
+    load.simulation_period = 5
+    for name in ('baseload_cooling', 'baseload_heating', 'peak_cooling', 'peak_heating', 'baseload_cooling_power',
+                 'baseload_heating_power', 'monthly_average_load'):
+        per_year = getattr(load, f'{name}_per_year')
+        assert per_year.shape == (5, 12)
+        assert np.array_equal(per_year, np.tile(getattr(load, name), (5, 1)))
+        assert np.array_equal(getattr(load, f'{name}_simulation_period'), per_year.ravel())
+        # the values of one year are not copied
+        assert per_year.strides[0] == 0
+        assert not per_year.flags.writeable
+
+
 def test_params_last_year():
     load = MonthlyGeothermalLoadAbsolute(*load_case(2))
     assert np.array_equal(load._calculate_last_year_params(False),
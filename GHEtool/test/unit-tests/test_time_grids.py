@@ -0,0 +1,49 @@
+import numpy as np
+import pygfunction as gt
+import pytest
+
+from GHEtool import Borefield
+from GHEtool.VariableClasses import claesson_javed_time_values, hourly_time_values, monthly_time_values, _timeValues
+
+
+def test_claesson_javed_time_values():
+    time_values = claesson_javed_time_values(3600., 20 * 8760 * 3600.)
+    assert np.array_equal(time_values,
+                          gt.load_aggregation.ClaessonJaved(3600., 20 * 8760 * 3600.).get_times_for_simulation())
+    assert claesson_javed_time_values(3600., 20 * 8760 * 3600.) is time_values
+    with pytest.raises(ValueError):
+        time_values[0] = 0
+    # the old helper returns a copy that can be modified
+    copy = _timeValues(3600., 20 * 8760 * 3600.)
+    copy[0] = 0
+    assert time_values[0] != 0
+
+
+def test_monthly_time_values():
+    UPM = np.array([744, 672, 744, 720, 744, 720, 744, 744, 720, 744, 720, 744])
+    time_values = monthly_time_values(UPM, 2)
+    assert np.array_equal(time_values, np.cumsum(np.tile(UPM, 2) * 3600))
+    assert time_values.dtype == np.cumsum(np.tile(UPM, 2) * 3600).dtype
+    assert monthly_time_values(UPM.copy(), 2) is time_values
+    assert monthly_time_values(UPM, 3) is not time_values
+    assert not time_values.flags.writeable
+
+
+def test_hourly_time_values():
+    time_values = hourly_time_values(2)
+    assert np.array_equal(time_values, 3600 * np.arange(1, 8760 * 2 + 1, dtype=np.float32))
+    assert time_values.dtype == np.float32
+    assert hourly_time_values(2) is time_values
+    assert not time_values.flags.writeable
+    assert hourly_time_values(1, 1800.).size == 8760 * 2
+
+
+def test_load_time_grids_are_shared():
+    borefield_1 = Borefield()
+    borefield_2 = Borefield()
+    assert borefield_1.load.time_L3 is borefield_2.load.time_L3
+    assert borefield_1.load.time_L4 is borefield_2.load.time_L4
+    borefield_2.load.simulation_period = 10
+    assert borefield_1.load.time_L4.size == 2 * borefield_2.load.time_L4.size
+    borefield_2.load.all_months_equal = False
+    assert not np.array_equal(borefield_1.load.time_L3[:12], borefield_2.load.time_L3[:12])